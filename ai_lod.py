@@ -0,0 +1,76 @@
+"""Simulation level of detail for enemies away from the screen.
+
+World.update() already suspends entities far outside the camera.  The
+ones still running are banded by how far their rect lies outside the
+screen (AI_LOD_BANDS in data.py):
+
+  - on screen and just beyond it: updated every frame, as before,
+  - further out: updated every N frames with N frames' worth of movement
+    (timers are wall-clock based already, so AI states keep their pace),
+  - off-screen entities skip animation until they are visible again.
+
+Updates are staggered per entity so a band's work is spread across the
+frames.  Dying or hit-flashing entities always run at full rate, so death
+animations, kills, objectives and spawner counts behave exactly as
+without LOD.
+"""
+
+import weakref
+
+from data import AI_LOD_BANDS
+
+
+class AILodScheduler:
+    """Decides each frame how much simulation an entity gets."""
+
+    def __init__(self, bands=AI_LOD_BANDS):
+        self.bands = tuple(bands)
+        self.max_interval = max(interval for _, interval in self.bands)
+        self.frame = 0
+        self.view = None
+        self._last_tick = weakref.WeakKeyDictionary()
+
+    def begin_frame(self, view_rect):
+        """Start a new frame with the camera showing *view_rect*."""
+        self.frame += 1
+        self.view = view_rect
+
+    def interval_for(self, rect):
+        """Frames between updates for an entity occupying *rect*."""
+        if self.view is None:
+            return 1
+        dx = max(self.view.left - rect.right, rect.left - self.view.right, 0)
+        dy = max(self.view.top - rect.bottom, rect.top - self.view.bottom, 0)
+        dist = max(dx, dy)
+        for limit, interval in self.bands:
+            if limit is None or dist <= limit:
+                return interval
+        return self.bands[-1][1]
+
+    def tick(self, sprite):
+        """Return (steps, visible) for *sprite* this frame.
+
+        steps is 0 when the sprite should skip this frame, otherwise the
+        number of frames its movement should cover.
+        """
+        visible = self.view is None or self.view.colliderect(sprite.rect)
+        if sprite.state == sprite.DYING or sprite._hit_flash:
+            interval = 1
+        else:
+            interval = self.interval_for(sprite.rect)
+
+        last = self._last_tick.get(sprite)
+        if last is None:
+            last = self._last_tick[sprite] = self.frame - 1
+        if interval > 1 and (self.frame + (id(sprite) >> 4)) % interval:
+            return 0, visible
+        self._last_tick[sprite] = self.frame
+        return min(self.frame - last, self.max_interval), visible
+
+
+def lod_tick(sprite):
+    """(steps, visible) for an entity; full rate when it has no World."""
+    world = sprite.world
+    if world is None:
+        return 1, True
+    return world.ai_lod.tick(sprite)
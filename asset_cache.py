@@ -0,0 +1,403 @@
+"""Persistent on-disk cache for procedurally generated surfaces.
+
+Every generator (floors, tile variants, creature animations, weapon
+sprites, icons, the cave) draws with pygame.draw on each launch.  The
+AssetCache stores their pixels in a single packed file,
+``.cache/surfaces.pack``, so later launches map the file into memory and
+wrap each surface around it with ``pygame.image.frombuffer`` - no drawing
+and no pixel copies.
+
+Entries are keyed by generator name + parameters + seed, and tagged with a
+code version hash (the source of the generator's module and data.py).
+Editing a generator invalidates only that module's entries.  Generators
+that take an ``rng`` keyword draw from a private ``random.Random(seed)``
+passed in by the cache, so an entry always equals a fresh build and
+building never touches the global ``random`` state (the level preloader
+builds on a worker thread while gameplay draws from it).
+
+Pack layout:
+    b'DBSURF02'            magic
+    uint64, uint32 (le)    offset and length of the JSON index
+    padding to 64 bytes
+    pixel blobs            raw RGBA / RGBX rows, each 64-byte aligned
+    JSON index             {"version": .., "entries": {name: {...}}}
+
+The index sits after the blobs so save() only appends: new entries'
+blobs and a fresh index go after the old index, then the header is
+pointed at it.  Space left by replaced entries and old indexes is
+reclaimed by rewriting the pack once it outgrows the live data.
+
+Flags:
+    --rebuild-assets / DEMOBLADE_REBUILD_ASSETS=1   ignore the pack, regenerate
+    DEMOBLADE_NO_ASSET_CACHE=1                       disable caching entirely
+"""
+
+import os
+import sys
+import json
+import inspect
+import mmap
+import zlib
+import random
+import struct
+import hashlib
+import threading
+
+import pygame
+
+SURFACE_CACHE_VERSION = 1
+SURFACE_CACHE_PATH = os.path.join('.cache', 'surfaces.pack')
+
+_MAGIC = b'DBSURF02'
+_HEADER = '<QI'             # index offset, index length
+_ALIGN = 64
+_DATA_START = 64            # first blob, after magic + header
+
+
+def _align(n):
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+# ======================================================================
+# Value <-> (tree, surfaces) encoding
+# ======================================================================
+# Generators return a Surface, or lists / tuples / str-keyed dicts of them
+# (animation tables).  The structure is stored as a small JSON tree whose
+# leaves index into a flat list of surfaces.
+
+def _flatten(value, surfaces):
+    """Return a JSON tree for *value*, appending its surfaces to *surfaces*.
+
+    Returns None when the value holds something that can't be cached.
+    """
+    if isinstance(value, pygame.Surface):
+        surfaces.append(value)
+        return {'s': len(surfaces) - 1}
+    if isinstance(value, (list, tuple)):
+        items = [_flatten(v, surfaces) for v in value]
+        if any(i is None for i in items):
+            return None
+        return {'l': items, 't': isinstance(value, tuple)}
+    if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+        items = {k: _flatten(v, surfaces) for k, v in value.items()}
+        if any(i is None for i in items.values()):
+            return None
+        return {'d': items}
+    return None
+
+
+def _unflatten(tree, surfaces):
+    if 's' in tree:
+        return surfaces[tree['s']]
+    if 'l' in tree:
+        items = [_unflatten(t, surfaces) for t in tree['l']]
+        return tuple(items) if tree.get('t') else items
+    return {k: _unflatten(t, surfaces) for k, t in tree['d'].items()}
+
+
+def _surface_bytes(surf):
+    """Return (format, raw bytes, colorkey) for one surface."""
+    fmt = 'RGBA' if surf.get_flags() & pygame.SRCALPHA else 'RGBX'
+    key = surf.get_colorkey()
+    return fmt, pygame.image.tobytes(surf, fmt), list(key[:3]) if key else None
+
+
+def _surface_from(buffer, offset, meta):
+    w, h, fmt, key = meta['w'], meta['h'], meta['fmt'], meta.get('key')
+    view = memoryview(buffer)[offset:offset + w * h * 4]
+    surf = pygame.image.frombuffer(view, (w, h), fmt)
+    if key:
+        surf.set_colorkey(key)
+    return surf
+
+
+def _entry_size(entry):
+    """Pack bytes taken by an entry's blobs."""
+    return sum(_align(meta['w'] * meta['h'] * 4) for meta in entry['surfaces'])
+
+
+_rng_builders = {}
+
+
+def _takes_rng(builder):
+    """True if *builder* accepts an ``rng`` keyword."""
+    if builder not in _rng_builders:
+        try:
+            params = inspect.signature(builder).parameters
+        except (TypeError, ValueError):
+            params = {}
+        _rng_builders[builder] = 'rng' in params
+    return _rng_builders[builder]
+
+
+# ======================================================================
+# Code version
+# ======================================================================
+
+_module_hashes = {}
+
+
+def _module_hash(module_name):
+    """sha1 of a module's source file (cached per process)."""
+    if module_name not in _module_hashes:
+        h = hashlib.sha1()
+        module = sys.modules.get(module_name)
+        path = getattr(module, '__file__', None)
+        try:
+            with open(path, 'rb') as f:
+                h.update(f.read())
+        except (OSError, TypeError):
+            h.update(module_name.encode())
+        _module_hashes[module_name] = h.hexdigest()
+    return _module_hashes[module_name]
+
+
+def code_version(builder):
+    """Hash of everything that determines *builder*'s output pixels."""
+    h = hashlib.sha1(f"v{SURFACE_CACHE_VERSION}".encode())
+    h.update(_module_hash(builder.__module__).encode())
+    h.update(_module_hash('data').encode())
+    return h.hexdigest()[:16]
+
+
+# ======================================================================
+# Cache
+# ======================================================================
+
+class AssetCache:
+    """Packed, memory-mapped store of generated surfaces.
+
+    Use cached(builder, *args) in place of builder(*args).  Misses are
+    built and kept in memory until save() appends them to the pack and
+    remaps them from it; call it at a quiet moment (after a level is
+    built, on exit).  cached(..., persist=True) saves at once instead,
+    for streamed assets that would otherwise pile up in memory.
+    """
+
+    def __init__(self, path=SURFACE_CACHE_PATH, enabled=True, rebuild=False):
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.RLock()
+        self._entries = {}     # name -> entry dict (meta + 'buffer')
+        self._unsaved = set()  # names of entries not in the pack yet
+        self._end = None       # end of the pack's data (None: write a new pack)
+        self._live = 0         # bytes of the pack used by current entries
+        self.stats = {'hits': 0, 'misses': 0, 'uncacheable': 0}
+        if enabled:
+            if rebuild:
+                self.clear()
+            else:
+                self._load()
+
+    # -- pack I/O ------------------------------------------------------------
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            if mm[:len(_MAGIC)] != _MAGIC:
+                mm.close()
+                return
+            index_offset, index_len = struct.unpack_from(_HEADER, mm, len(_MAGIC))
+            index = json.loads(bytes(mm[index_offset:index_offset + index_len]).decode())
+            if index.get('version') != SURFACE_CACHE_VERSION:
+                mm.close()
+                return
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Surface cache unreadable, rebuilding: {e}")
+            return
+        self._end = index_offset + index_len
+        for name, entry in index['entries'].items():
+            entry['buffer'] = mm
+            entry['base'] = 0
+            self._entries[name] = entry
+            self._live += _entry_size(entry)
+
+    def save(self):
+        """Append the entries built since the last save to the pack."""
+        with self._lock:
+            if not (self.enabled and self._unsaved):
+                return
+            # Rewrite from scratch when there is no pack to extend or
+            # most of it is dead space
+            rewrite = self._end is None or self._end > 2 * (self._live + _DATA_START)
+            try:
+                if rewrite:
+                    self._write_pack()
+                else:
+                    self._append()
+            except OSError as e:
+                print(f"Surface cache write failed: {e}")
+                return
+            self._unsaved.clear()
+
+    def _write_blobs(self, f, names, offset):
+        """Write the blobs of *names* from *offset*; return their metas and the end."""
+        placed = {}
+        for name in names:
+            entry = self._entries[name]
+            src, base = entry['buffer'], entry['base']
+            metas = []
+            for meta in entry['surfaces']:
+                size = meta['w'] * meta['h'] * 4
+                start = base + meta['offset']
+                f.seek(offset)
+                f.write(src[start:start + size])
+                metas.append(dict(meta, offset=offset))
+                offset = _align(offset + size)
+            placed[name] = metas
+        return placed, offset
+
+    def _write_index(self, f, offset, placed):
+        """Write the index at *offset* listing every entry, with *placed* ones moved."""
+        index = {'version': SURFACE_CACHE_VERSION, 'entries': {}}
+        for name, entry in self._entries.items():
+            index['entries'][name] = {'key': entry['key'], 'tree': entry['tree'],
+                                      'surfaces': placed.get(name, entry['surfaces'])}
+        data = json.dumps(index, separators=(',', ':')).encode()
+        f.seek(offset)
+        f.write(data)
+        return len(data)
+
+    def _write_pack(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            placed, end = self._write_blobs(f, list(self._entries), _DATA_START)
+            index_len = self._write_index(f, end, placed)
+            f.seek(0)
+            f.write(_MAGIC + struct.pack(_HEADER, end, index_len))
+        os.replace(tmp, self.path)
+        self._end = end + index_len
+        self._live = end - _DATA_START
+        self._remap(placed)
+
+    def _append(self):
+        names = sorted(self._unsaved)
+        with open(self.path, 'r+b') as f:
+            # New blobs and index go after the current index, so the pack
+            # stays valid until the header is rewritten last
+            placed, end = self._write_blobs(f, names, _align(self._end))
+            index_len = self._write_index(f, end, placed)
+            f.flush()
+            f.seek(len(_MAGIC))
+            f.write(struct.pack(_HEADER, end, index_len))
+        self._end = end + index_len
+        self._live += sum(_entry_size(self._entries[name]) for name in names)
+        self._remap(placed)
+
+    def _remap(self, placed):
+        """Point every entry at the pack just written, as _load() does.
+
+        Build-time bytearrays of the *placed* entries are dropped, so the
+        cache holds no pixels of its own once they are on disk, and older
+        mappings are only kept alive by surfaces already handed out.
+        """
+        with open(self.path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        for name, entry in self._entries.items():
+            entry['buffer'] = mm
+            entry['base'] = 0
+            entry['surfaces'] = placed.get(name, entry['surfaces'])
+
+    # -- lookup --------------------------------------------------------------
+
+    def cached(self, builder, *args, seed=None, persist=False, **kwargs):
+        """Return builder(*args, **kwargs), restored from the pack when possible.
+
+        Builders taking an ``rng`` keyword get ``random.Random(seed)``
+        (*seed* defaults to one derived from the call), so a cached result
+        is the same one a fresh build would produce.  With *persist* a miss
+        is saved to the pack straight away.
+        """
+        name = self._name(builder, args, kwargs, seed)
+        if seed is None:
+            seed = zlib.crc32(name.encode())
+        if not self.enabled:
+            return self._build(builder, args, kwargs, seed)
+
+        key = code_version(builder)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry['key'] == key:
+                self.stats['hits'] += 1
+                return self._restore(entry)
+
+        # Build outside the lock so a background loader doesn't stall lookups
+        value = self._build(builder, args, kwargs, seed)
+        surfaces = []
+        tree = _flatten(value, surfaces)
+        with self._lock:
+            if tree is None:
+                self.stats['uncacheable'] += 1
+                return value
+            self.stats['misses'] += 1
+            self._store(name, key, tree, surfaces)
+            if persist:
+                self.save()
+            return self._restore(self._entries[name])
+
+    @staticmethod
+    def _name(builder, args, kwargs, seed):
+        params = ','.join([repr(a) for a in args]
+                          + [f"{k}={v!r}" for k, v in sorted(kwargs.items())])
+        return f"{builder.__module__}.{builder.__qualname__}({params})#{seed}"
+
+    @staticmethod
+    def _build(builder, args, kwargs, seed):
+        if _takes_rng(builder):
+            kwargs = dict(kwargs, rng=random.Random(seed))
+        return builder(*args, **kwargs)
+
+    def _store(self, name, key, tree, surfaces):
+        buf = bytearray()
+        metas = []
+        for surf in surfaces:
+            fmt, raw, colorkey = _surface_bytes(surf)
+            offset = len(buf)
+            buf += raw
+            buf += bytes(_align(len(buf)) - len(buf))
+            metas.append({'offset': offset, 'w': surf.get_width(),
+                          'h': surf.get_height(), 'fmt': fmt, 'key': colorkey})
+        entry = {'key': key, 'tree': tree, 'surfaces': metas,
+                 'buffer': buf, 'base': 0}
+        old = self._entries.get(name)
+        if old is not None and name not in self._unsaved:
+            self._live -= _entry_size(old)      # its pack space is now dead
+        self._entries[name] = entry
+        self._unsaved.add(name)
+        return entry
+
+    @staticmethod
+    def _restore(entry):
+        buffer, base = entry['buffer'], entry['base']
+        surfaces = [_surface_from(buffer, base + meta['offset'], meta)
+                    for meta in entry['surfaces']]
+        return _unflatten(entry['tree'], surfaces)
+
+    def clear(self):
+        """Forget every entry and delete the pack (--rebuild-assets)."""
+        with self._lock:
+            self._entries.clear()
+            self._unsaved.clear()
+            self._end = None
+            self._live = 0
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+# Shared instance used by the generators.
+asset_cache = AssetCache(
+    enabled=not os.environ.get('DEMOBLADE_NO_ASSET_CACHE'),
+    rebuild=('--rebuild-assets' in sys.argv
+             or bool(os.environ.get('DEMOBLADE_REBUILD_ASSETS'))),
+)
+
+
+def cached(builder, *args, **kwargs):
+    """Shorthand for asset_cache.cached()."""
+    return asset_cache.cached(builder, *args, **kwargs)
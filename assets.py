@@ -0,0 +1,185 @@
+"""Lazy handles and the central registry for procedurally generated assets.
+
+Module-level asset tables (weapon icons, spell icons) used to be built at
+import time, which pushed all of that drawing in front of the title screen.
+Wrapping the builder in a LazyAsset defers the work until something
+actually reads the value.
+
+Every generated surface goes through ``load_asset(category, builder, ...)``:
+the AssetRegistry restores it from the on-disk cache (asset_cache.py),
+converts it to the display's pixel format, applies RLE acceleration to
+static sprites and keeps per-category memory totals.
+"""
+
+import os
+import sys
+import threading
+import weakref
+
+import pygame
+
+from asset_cache import cached
+
+
+class LazyAsset:
+    """Deferred call of ``builder(*args, **kwargs)``, evaluated once."""
+
+    __slots__ = ('_builder', '_args', '_kwargs', '_value', '_built')
+
+    def __init__(self, builder, *args, **kwargs):
+        self._builder = builder
+        self._args = args
+        self._kwargs = kwargs
+        self._value = None
+        self._built = False
+
+    def get(self):
+        if not self._built:
+            self._value = self._builder(*self._args, **self._kwargs)
+            self._built = True
+            # Drop references so builder arguments can be collected
+            self._args = self._kwargs = None
+        return self._value
+
+    def __repr__(self):
+        name = getattr(self._builder, '__name__', repr(self._builder))
+        state = 'ready' if self._built else 'pending'
+        return f"<LazyAsset {name} ({state})>"
+
+
+class LazyEntry(dict):
+    """dict whose LazyAsset values are resolved transparently on access.
+
+    Lets data tables such as ``weapon_data['sword']['graphic']`` keep
+    their existing shape while the surface behind the key is only built
+    on first use.
+    """
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, LazyAsset):
+            return value.get()
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def values(self):
+        return [self[k] for k in self]
+
+    def items(self):
+        return [(k, self[k]) for k in self]
+
+    def preload(self):
+        """Force every lazy value in this entry to build now."""
+        for value in dict.values(self):
+            if isinstance(value, LazyAsset):
+                value.get()
+
+
+# ======================================================================
+# Asset registry
+# ======================================================================
+
+class AssetRegistry:
+    """Display-format conversion and bookkeeping for generated surfaces.
+
+    Each (builder, args) pair is built / restored and converted once; later
+    requests share the same surfaces, so callers must treat them as
+    read-only (per-surface set_alpha is fine, pixel writes are not).
+    Large one-off assets (level floors) pass keep=False so they are freed
+    with their level instead of being held by the registry; they are also
+    written to the surface pack as soon as they are built, so the cache
+    does not hold their pixels either.
+
+    Conversion rules:
+      - per-pixel alpha surfaces -> convert_alpha(), colorkey dropped
+        (it is redundant and forces a slower blit path),
+      - opaque surfaces -> convert(),
+      - static sprites (never modified after creation) also get RLEACCEL.
+    Before a display mode is set values are returned unconverted and not
+    remembered.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._assets = {}          # (builder, args, kwargs) -> converted value
+        self._categories = {}      # category -> WeakValueDictionary of live surfaces
+        self.report_enabled = ('--asset-report' in sys.argv
+                               or bool(os.environ.get('DEMOBLADE_ASSET_REPORT')))
+
+    def get(self, category, builder, *args, static=False, keep=True, **kwargs):
+        key = (builder, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            if key in self._assets:
+                return self._assets[key]
+        value = cached(builder, *args, persist=not keep, **kwargs)
+        if pygame.display.get_surface() is None:
+            return value
+        with self._lock:
+            if key in self._assets:
+                return self._assets[key]
+            bucket = self._categories.setdefault(category, weakref.WeakValueDictionary())
+            value = self._prepare(value, static, bucket)
+            if keep:
+                self._assets[key] = value
+            return value
+
+    def _prepare(self, value, static, bucket):
+        if isinstance(value, pygame.Surface):
+            surf = self.convert(value, static)
+            bucket[id(surf)] = surf
+            return surf
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._prepare(v, static, bucket) for v in value)
+        if isinstance(value, dict):
+            return {k: self._prepare(v, static, bucket) for k, v in value.items()}
+        return value
+
+    @staticmethod
+    def convert(surf, static=False):
+        """Return *surf* in the display's pixel format (see class docstring)."""
+        if surf.get_flags() & pygame.SRCALPHA:
+            out = surf.convert_alpha()
+            out.set_colorkey(None)
+            if static:
+                out.set_alpha(255, pygame.RLEACCEL)
+        else:
+            out = surf.convert()
+            colorkey = surf.get_colorkey()
+            if colorkey and static:
+                out.set_colorkey(colorkey, pygame.RLEACCEL)
+        return out
+
+    # -- reporting -----------------------------------------------------------
+
+    def memory_by_category(self):
+        """Return {category: (surface_count, bytes)} for registered surfaces."""
+        with self._lock:
+            usage = {}
+            for cat, surfs in self._categories.items():
+                live = list(surfs.values())
+                usage[cat] = (len(live),
+                              sum(s.get_width() * s.get_height() * s.get_bytesize()
+                                  for s in live))
+            return usage
+
+    def report(self):
+        usage = self.memory_by_category()
+        lines = ["Surface memory by category:"]
+        total = 0
+        for cat, (count, nbytes) in sorted(usage.items(), key=lambda kv: -kv[1][1]):
+            total += nbytes
+            lines.append(f"  {cat:<12}{count:>6} surfaces {nbytes / 1048576:>8.2f} MB")
+        lines.append(f"  {'total':<12}{'':>15} {total / 1048576:>8.2f} MB")
+        return '\n'.join(lines)
+
+
+registry = AssetRegistry()
+
+
+def load_asset(category, builder, *args, static=False, keep=True, **kwargs):
+    """Shorthand for registry.get()."""
+    return registry.get(category, builder, *args, static=static, keep=keep, **kwargs)
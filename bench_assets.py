@@ -0,0 +1,196 @@
+"""Microbenchmarks for DemoBlade's procedural asset generators.
+
+Times every surface and sound generator that runs at startup or level load,
+across themes and sizes, and reports ops/sec plus allocated bytes.
+
+Usage:
+    python bench_assets.py                  # run everything
+    python bench_assets.py -k floor -n 5    # only cases matching 'floor'
+    python bench_assets.py --out bench_output.txt
+
+Columns:
+    ops/s     - generator calls per second (wall clock, best of the runs)
+    ms/op     - milliseconds per call
+    py_alloc  - peak Python/NumPy heap allocated during one call (tracemalloc)
+    result    - bytes held by the returned surfaces / PCM buffers
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+# Headless by default so the suite runs on CI boxes without a display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+# ======================================================================
+# Result sizing
+# ======================================================================
+
+def _result_bytes(obj):
+    """Return the number of bytes held by a generator's return value."""
+    if isinstance(obj, pygame.Surface):
+        return obj.get_width() * obj.get_height() * obj.get_bytesize()
+    if isinstance(obj, pygame.mixer.Sound):
+        return obj.get_length() * pygame.mixer.get_init()[0] * 2
+    if isinstance(obj, dict):
+        return sum(_result_bytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(_result_bytes(v) for v in obj)
+    return 0
+
+
+def _fmt_bytes(n):
+    for unit in ('B', 'KB', 'MB'):
+        if n < 1024:
+            return f"{n:.0f}{unit}" if unit == 'B' else f"{n:.1f}{unit}"
+        n /= 1024.0
+    return f"{n:.1f}GB"
+
+
+# ======================================================================
+# Benchmark cases
+# ======================================================================
+
+def _collect_cases():
+    """Return a list of (name, callable) pairs covering every generator."""
+    import sounds
+    import tile_graphics
+    from tile_graphics import THEMES
+    from player_sprite import build_player_animations
+    from enemy import _build_animations
+    from enemy_bat import _build_bat_animations
+    from spawner import _cave_surface
+    from weapon_sprites import make_weapon_sprite, make_weapon_icon
+    from data import TILESIZE
+
+    cases = []
+
+    # -- tiles / floors -----------------------------------------------------
+    floor_sizes = [(10, 10), (20, 20), (40, 40)]
+    for theme in THEMES:
+        for cols, rows in floor_sizes:
+            w, h = cols * TILESIZE, rows * TILESIZE
+            cases.append((f"floor[{theme},{cols}x{rows}]",
+                          lambda t=theme, w=w, h=h: tile_graphics.make_floor_surface(t, w, h)))
+            # Per-detail pygame.draw reference implementation for comparison
+            cases.append((f"floor_draw[{theme},{cols}x{rows}]",
+                          lambda t=theme, w=w, h=h: tile_graphics.make_floor_surface_draw(t, w, h)))
+        cases.append((f"rock[{theme}]", lambda t=theme: tile_graphics.make_rock(t)))
+        cases.append((f"grass_tuft[{theme}]", lambda t=theme: tile_graphics.make_grass_tuft(t)))
+        cases.append((f"column[{theme}]", lambda t=theme: tile_graphics.make_column(t)))
+        cases.append((f"variant_pool[{theme}]",
+                      lambda t=theme: [tile_graphics.VariantPool(t).variants(k)
+                                       for k in ('rock', 'grass', 'column')]))
+    cases.append(("chainmail_stand", tile_graphics.make_chainmail_stand))
+
+    # -- on-disk surface cache (restore cost once the pack is warm) ---------
+    from asset_cache import cached
+    cases.append(("cached_floor[meadow,20x20]",
+                  lambda: cached(tile_graphics.make_floor_surface, 'meadow',
+                                 20 * TILESIZE, 20 * TILESIZE)))
+    cases.append(("cached_player_animations", lambda: cached(build_player_animations)))
+
+    # -- creatures ----------------------------------------------------------
+    cases.append(("player_animations", build_player_animations))
+    cases.append(("demon_animations", _build_animations))
+    cases.append(("bat_animations", _build_bat_animations))
+    cases.append(("cave_surface", _cave_surface))
+
+    # -- weapons ------------------------------------------------------------
+    for wtype in ('sword', 'spear'):
+        for d in ('up', 'down', 'left', 'right'):
+            cases.append((f"weapon_sprite[{wtype},{d}]",
+                          lambda w=wtype, d=d: make_weapon_sprite(w, d)))
+        cases.append((f"weapon_icon[{wtype}]", lambda w=wtype: make_weapon_icon(w)))
+
+    # -- sounds -------------------------------------------------------------
+    for name in sorted(dir(sounds)):
+        fn = getattr(sounds, name)
+        if name.startswith('make_') and callable(fn):
+            cases.append((f"sound.{name[5:]}", fn))
+
+    return cases
+
+
+# ======================================================================
+# Runner
+# ======================================================================
+
+def _time_case(fn, repeat, min_time):
+    """Return the best observed seconds-per-call for *fn*."""
+    fn()  # warm-up (imports, font loading, caches)
+    best = float('inf')
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def _alloc_case(fn):
+    """Return (peak traced bytes, bytes held by the result) for one call."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, _result_bytes(result)
+
+
+def run(pattern=None, repeat=3, min_time=0.05, out=None):
+    pygame.mixer.pre_init(frequency=22050, size=-16, channels=1, buffer=512)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    rows = []
+    header = f"{'generator':<34}{'ops/s':>10}{'ms/op':>10}{'py_alloc':>11}{'result':>11}"
+    lines = [header, '-' * len(header)]
+    print(header)
+    print('-' * len(header))
+
+    for name, fn in _collect_cases():
+        if pattern and pattern not in name:
+            continue
+        per_call = _time_case(fn, repeat, min_time)
+        peak, held = _alloc_case(fn)
+        rows.append((name, per_call, peak, held))
+        line = (f"{name:<34}{1.0 / per_call:>10.1f}{per_call * 1000:>10.3f}"
+                f"{_fmt_bytes(peak):>11}{_fmt_bytes(held):>11}")
+        lines.append(line)
+        print(line)
+
+    if out:
+        with open(out, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    pygame.quit()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='pattern', default=None,
+                        help='only run generators whose name contains PATTERN')
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='timing rounds per generator (best is reported)')
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='minimum seconds per timing round')
+    parser.add_argument('--out', default=None,
+                        help='also write the table to this file')
+    args = parser.parse_args(argv)
+    run(args.pattern, args.repeat, args.min_time, args.out)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
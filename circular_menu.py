@@ -2,6 +2,48 @@ import pygame
 import math
 
 
+class MenuRenderCache:
+    """Pre-rendered pieces of the ring menus.
+
+    While a ring is open every frame used to allocate and draw its
+    backdrop, the glow of the selected box and the label pills from
+    scratch.  Each piece is now rendered once per key and blitted after:
+
+        'backdrop'  by radius, in RADIUS_STEP px buckets
+        'box'       by (icon, name, box size in px, selected)
+        'label'     by (text, 'item') for item names, (text, 'ring') for
+                    DualRingMenu's ring names (each style has fixed colours)
+
+    The open/close animation only visits a few dozen radii and box sizes,
+    so after the first opening it is blits only.  A DualRingMenu shares
+    one cache between its rings.
+    """
+
+    RADIUS_STEP = 4
+
+    def __init__(self):
+        self._stores = {'backdrop': {}, 'box': {}, 'label': {}}
+
+    def get(self, kind, key, build):
+        """Cached surface for *key*, rendered by ``build()`` on first use."""
+        store = self._stores[kind]
+        surf = store.get(key)
+        if surf is None:
+            surf = store[key] = build()
+        return surf
+
+
+def render_label(font, text, color, fill, border, pad):
+    """Text on a rounded, translucent pill, *pad* = (x, y) px added around it."""
+    text_surf = font.render(text, True, color)
+    bg_rect = text_surf.get_rect().inflate(*pad)
+    bg = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
+    pygame.draw.rect(bg, fill, bg.get_rect(), border_radius=4)
+    pygame.draw.rect(bg, border, bg.get_rect(), 1, border_radius=4)
+    bg.blit(text_surf, text_surf.get_rect(center=bg.get_rect().center))
+    return bg
+
+
 class CircularMenu:
     """Secret of Mana inspired ring menu.
 
@@ -20,11 +62,12 @@ class CircularMenu:
     OPEN = 2
     CLOSING = 3
 
-    def __init__(self, items, radius=80, max_items=8):
+    def __init__(self, items, radius=80, max_items=8, cache=None):
         """
         items: list of dicts with 'name' (str) and 'icon' (pygame.Surface)
         radius: ring radius in pixels
         max_items: max number of items the ring can hold
+        cache: MenuRenderCache to share with other rings (own one if None)
         """
         self.items = list(items)
         self.max_items = max_items
@@ -55,8 +98,9 @@ class CircularMenu:
         # Selection result
         self.last_selected = None
 
-        # Cached font
+        # Cached font and pre-rendered pieces
         self._font = None
+        self._cache = cache if cache is not None else MenuRenderCache()
 
     # ------------------------------------------------------------------
     # Properties
@@ -149,6 +193,15 @@ class CircularMenu:
         self.ring_angle = self.target_ring_angle  # snap to avoid wild spin
         print(f"Removed: {removed['name']}")
 
+    def select_matching(self, field, value):
+        """Point the ring at the first item whose *field* is *value* (no-op if none)."""
+        for i, item in enumerate(self.items):
+            if isinstance(item, dict) and item.get(field) == value:
+                self.selected_index = i
+                self._sync_target_angle()
+                self.ring_angle = self.target_ring_angle
+                return
+
     # ------------------------------------------------------------------
     # Update (call every frame)
     # ------------------------------------------------------------------
@@ -245,13 +298,19 @@ class CircularMenu:
 
     def _draw_backdrop(self, surface, cx, cy, radius):
         """Dark semi-transparent circle behind the ring."""
-        r = int(radius + 36)
-        d = r * 2
-        backdrop = pygame.Surface((d, d), pygame.SRCALPHA)
-        alpha = int(100 * min(1.0, self.anim_t))
-        pygame.draw.circle(backdrop, (10, 8, 6, alpha), (r, r), r)
+        step = MenuRenderCache.RADIUS_STEP
+        r = max(step, int(round((radius + 36) / step)) * step)
+        backdrop = self._cache.get('backdrop', r, lambda: self._render_backdrop(r))
+        # Fade in with the opening animation
+        backdrop.set_alpha(int(255 * min(1.0, self.anim_t)))
         surface.blit(backdrop, (cx - r, cy - r))
 
+    @staticmethod
+    def _render_backdrop(r):
+        backdrop = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+        pygame.draw.circle(backdrop, (10, 8, 6, 100), (r, r), r)
+        return backdrop
+
     def _draw_ring_dots(self, surface, cx, cy, radius):
         """Animated dotted golden ring."""
         tick = pygame.time.get_ticks()
@@ -268,45 +327,42 @@ class CircularMenu:
             pygame.draw.circle(surface, color, (int(px), int(py)), 1)
 
     def _draw_icon_box(self, surface, x, y, item, scale, selected):
-        """Render a single icon box with decorations."""
-        base_box = 48
-        base_icon = 36
-        box_size = int(base_box * scale)
-        icon_size = int(base_icon * scale)
+        """Blit a single icon box with decorations, centred on (x, y)."""
+        # Pulse for selected item
+        if selected and scale > 0.9:
+            scale *= 1.0 + 0.04 * math.sin(pygame.time.get_ticks() * 0.006)
+        box_size = int(48 * scale)
         if box_size < 6:
             return
 
-        x, y = int(x), int(y)
+        icon_surf = item.get('icon') if isinstance(item, dict) else item
+        name = item.get('name') if isinstance(item, dict) else None
+        box = self._cache.get('box', (icon_surf, name, box_size, selected),
+                              lambda: self._render_icon_box(icon_surf, box_size, selected))
+        surface.blit(box, box.get_rect(center=(int(x), int(y))))
+
+    def _render_icon_box(self, icon_surf, box_size, selected):
+        """Icon box of *box_size* px (48 at full scale) on a transparent surface."""
+        scale = box_size / 48
+        icon_size = box_size * 3 // 4
+        glow_r = int(box_size * 0.7) if selected and scale > 0.5 else 0
+        size = max(2 * glow_r, box_size + 8)
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        c = size // 2
         half = box_size // 2
-        rect = pygame.Rect(x - half, y - half, box_size, box_size)
-
-        # Pulse for selected item
-        pulse = 1.0
-        if selected and scale > 0.9:
-            pulse = 1.0 + 0.04 * math.sin(pygame.time.get_ticks() * 0.006)
-            pbox = int(base_box * scale * pulse)
-            phalf = pbox // 2
-            rect = pygame.Rect(x - phalf, y - phalf, pbox, pbox)
-            icon_size = int(base_icon * scale * pulse)
+        rect = pygame.Rect(c - half, c - half, box_size, box_size)
 
         # Glow behind selected
-        if selected and scale > 0.5:
-            glow_r = int(box_size * 0.7 * pulse)
-            glow_d = glow_r * 2
-            glow = pygame.Surface((glow_d, glow_d), pygame.SRCALPHA)
-            for r in range(glow_r, 0, -2):
-                a = int(25 * (r / glow_r))
-                pygame.draw.circle(glow, (255, 200, 50, a), (glow_r, glow_r), r)
-            surface.blit(glow, (x - glow_r, y - glow_r))
+        for r in range(glow_r, 0, -2):
+            a = int(25 * (r / glow_r))
+            pygame.draw.circle(surf, (255, 200, 50, a), (c, c), r)
 
         # Shadow
-        shadow_rect = rect.move(2, 2)
-        pygame.draw.rect(surface, (0, 0, 0, 60) if hasattr(pygame, 'SRCALPHA') else (15, 12, 8),
-                         shadow_rect, border_radius=4)
+        pygame.draw.rect(surf, (0, 0, 0), rect.move(2, 2), border_radius=4)
 
         # Box background
         bg = (70, 55, 30) if selected else (45, 38, 28)
-        pygame.draw.rect(surface, bg, rect, border_radius=4)
+        pygame.draw.rect(surf, bg, rect, border_radius=4)
 
         # Border
         if selected:
@@ -315,26 +371,26 @@ class CircularMenu:
         else:
             border_color = (155, 135, 85)
             border_w = 2
-        pygame.draw.rect(surface, border_color, rect, border_w, border_radius=4)
+        pygame.draw.rect(surf, border_color, rect, border_w, border_radius=4)
 
         # Inner frame
         if box_size > 22:
             inner = rect.inflate(-8, -8)
             inner_c = (175, 145, 55) if selected else (95, 80, 48)
-            pygame.draw.rect(surface, inner_c, inner, 1, border_radius=2)
+            pygame.draw.rect(surf, inner_c, inner, 1, border_radius=2)
 
         # Icon
-        icon_surf = item.get('icon') if isinstance(item, dict) else item
         if icon_surf and icon_size > 4:
             try:
                 scaled = pygame.transform.smoothscale(icon_surf, (icon_size, icon_size))
             except Exception:
                 scaled = pygame.transform.scale(icon_surf, (icon_size, icon_size))
-            surface.blit(scaled, scaled.get_rect(center=(x, y)))
+            surf.blit(scaled, scaled.get_rect(center=(c, c)))
 
         # Corner brackets on selected
         if selected and scale > 0.8:
-            self._draw_corner_brackets(surface, rect)
+            self._draw_corner_brackets(surf, rect)
+        return surf
 
     def _draw_corner_brackets(self, surface, rect):
         """Golden corner brackets around the selected box."""
@@ -382,16 +438,9 @@ class CircularMenu:
         if self._font is None:
             self._font = pygame.font.Font(None, 22)
 
-        text = self._font.render(name, True, (255, 230, 155))
-        text_rect = text.get_rect(center=(cx, int(label_y)))
-
-        # Background pill
-        bg_rect = text_rect.inflate(14, 8)
-        bg = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(bg, (25, 20, 15, 210), bg.get_rect(), border_radius=4)
-        pygame.draw.rect(bg, (140, 120, 70, 200), bg.get_rect(), 1, border_radius=4)
-        surface.blit(bg, bg_rect.topleft)
-        surface.blit(text, text_rect)
+        label = self._cache.get('label', (name, 'item'), lambda: render_label(
+            self._font, name, (255, 230, 155), (25, 20, 15, 210), (140, 120, 70, 200), (14, 8)))
+        surface.blit(label, label.get_rect(center=(cx, int(label_y))))
 
     # ------------------------------------------------------------------
     # Easing
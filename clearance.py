@@ -0,0 +1,124 @@
+"""Distance-to-obstacle field for placing things on a level.
+
+Built once per level from the tile collision grid (World.solid).  For
+every free cell it holds the Chebyshev distance, in cells, to the
+nearest blocked cell (outside the map counts as blocked), so a square
+body of half size r centred on a cell is clear when
+
+    (steps - 0.5) * TILESIZE >= r
+
+Square bodies and the Chebyshev metric agree exactly, and AABB hitboxes
+are what every placement check tests.
+
+    is_clear(pos, radius)    True if the square of half size *radius* at *pos* is free
+    nearest_clear(pos, r)    *pos* itself if clear, else the centre of the nearest
+                             cell with room for r (None if the map has none)
+
+nearest_clear() is an O(1) table lookup: the first query for a given
+number of cells of room propagates, to every cell, the nearest cell
+with that much room, and the table is kept for the level's lifetime.
+Pickups, cave spawns and the exit portal all ask for a few tiles of
+room at most, so only one or two tables are ever built.
+"""
+
+import numpy as np
+
+from data import TILESIZE
+
+_MAX_STEPS = 8       # clearance beyond this many cells is reported as this many
+_NEIGHBOURS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def _shifted(a, dr, dc, fill):
+    """b[r, c] = a[r + dr, c + dc], *fill* where that falls outside *a*."""
+    pad = [(1, 1), (1, 1)] + [(0, 0)] * (a.ndim - 2)
+    padded = np.pad(a, pad, constant_values=fill)
+    rows, cols = a.shape[:2]
+    return padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+
+
+class ClearanceField:
+    """Per-cell room around obstacles (see module docstring)."""
+
+    def __init__(self, solid, max_steps=_MAX_STEPS):
+        self.solid = solid
+        self.max_steps = max_steps
+        self._nearest = {}          # steps -> (rows, cols, 2) nearest cell with that room
+
+        # Erode the free area one ring at a time: a cell survives pass k
+        # when every neighbour survived pass k - 1
+        free = ~solid
+        self.steps = free.astype(np.int16)
+        for _ in range(max_steps - 1):
+            eroded = free.copy()
+            for dr, dc in _NEIGHBOURS:
+                eroded &= _shifted(free, dr, dc, False)
+            if not eroded.any():
+                break
+            self.steps += eroded
+            free = eroded
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _cell(self, pos):
+        rows, cols = self.solid.shape
+        return (min(rows - 1, max(0, int(pos[1]) // TILESIZE)),
+                min(cols - 1, max(0, int(pos[0]) // TILESIZE)))
+
+    def is_clear(self, pos, radius):
+        """True if the square of half size *radius* centred on *pos* is free."""
+        rows, cols = self.solid.shape
+        x, y = int(pos[0]), int(pos[1])
+        r0, r1 = (y - radius) // TILESIZE, (y + radius - 1) // TILESIZE
+        c0, c1 = (x - radius) // TILESIZE, (x + radius - 1) // TILESIZE
+        if r0 < 0 or c0 < 0 or r1 >= rows or c1 >= cols:
+            return False
+        return not self.solid[r0:r1 + 1, c0:c1 + 1].any()
+
+    def nearest_clear(self, pos, radius):
+        """*pos* if a body of half size *radius* fits there, else the nearest spot that fits."""
+        if self.is_clear(pos, radius):
+            return pos
+        need = min(self.max_steps, max(1, int(np.ceil(radius / TILESIZE + 0.5))))
+        table = self._nearest.get(need)
+        if table is None:
+            table = self._nearest[need] = self._build_nearest(need)
+        row, col = table[self._cell(pos)]
+        if row < 0:
+            return None
+        return ((int(col) + 0.5) * TILESIZE, (int(row) + 0.5) * TILESIZE)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def _build_nearest(self, need):
+        """For every cell, the (row, col) of the nearest cell with *need* steps of room.
+
+        Each cell repeatedly adopts whichever neighbour's source is closer
+        to it, until nothing changes (rows of -1 where no cell qualifies).
+        """
+        rows, cols = self.solid.shape
+        rr, cc = np.indices((rows, cols))
+        source = np.full((rows, cols, 2), -1, dtype=np.intp)
+        ok = self.steps >= need
+        source[ok] = np.stack([rr[ok], cc[ok]], axis=1)
+        if not ok.any():
+            return source
+
+        dist2 = np.where(ok, 0, np.iinfo(np.intp).max)
+        while True:
+            changed = False
+            for dr, dc in _NEIGHBOURS:
+                cand = _shifted(source, dr, dc, -1)
+                valid = cand[..., 0] >= 0
+                d2 = (cand[..., 0] - rr) ** 2 + (cand[..., 1] - cc) ** 2
+                better = valid & (d2 < dist2)
+                if better.any():
+                    source[better] = cand[better]
+                    dist2 = np.where(better, d2, dist2)
+                    changed = True
+            if not changed:
+                return source
@@ -6,6 +6,12 @@ TILESIZE = 64
 CAPTION = "DemoBlade"
 PLAYER_SPEED = 12
 COLORKEY = (255,0,255) # (255,0,255) is a color that will be transparent in the image, famous magenta
+TILE_VARIANTS = 4 # procedural variants generated per tile type per theme (rock, grass, column, ...)
+CHUNK_TILES = 8 # world chunk edge in tiles; terrain, art and collision stream in per chunk
+CHUNK_LOAD_MARGIN = 2 # chunks kept loaded beyond the screen edge (entities run 1 chunk less)
+FLOW_FIELD_RADIUS = 16 # tiles around the player covered by the pursuit flow field
+AI_LOD_BANDS = ((2 * TILESIZE, 1), (6 * TILESIZE, 2), (None, 4)) # (px outside the screen, update every N frames)
+PRECISE_WEAPON_HITS = False # True: melee hits also test the weapon's hit mask against enemy pixels (smaller sword area)
 
 WORLD_MAP = [
 ['X','X','X','X','X','X','X','X','X','X','X','X','X','X','X','X','X','X','X','X'],
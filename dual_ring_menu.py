@@ -1,6 +1,6 @@
 import pygame
 import math
-from circular_menu import CircularMenu
+from circular_menu import CircularMenu, MenuRenderCache, render_label
 
 
 class DualRingMenu:
@@ -18,8 +18,10 @@ class DualRingMenu:
     MAGIC_RING = 1
 
     def __init__(self, weapon_items, magic_items=None, radius=80):
-        self.weapon_ring = CircularMenu(items=weapon_items, radius=radius)
-        self.magic_ring = CircularMenu(items=magic_items or [], radius=radius)
+        # Both rings draw from one set of pre-rendered pieces
+        self._cache = MenuRenderCache()
+        self.weapon_ring = CircularMenu(items=weapon_items, radius=radius, cache=self._cache)
+        self.magic_ring = CircularMenu(items=magic_items or [], radius=radius, cache=self._cache)
         self.active_ring_index = self.WEAPON_RING
         self._switch_cd = 0  # cooldown timer for ring switch
 
@@ -137,6 +139,11 @@ class DualRingMenu:
     def add_magic(self, item):
         self.magic_ring.items.append(item)
 
+    def sync_selection(self, weapon_key, magic_key):
+        """Highlight the equipped weapon and spell (after restoring progress)."""
+        self.weapon_ring.select_matching('weapon_key', weapon_key)
+        self.magic_ring.select_matching('magic_key', magic_key)
+
     # ------------------------------------------------------------------
     # Update & Draw
     # ------------------------------------------------------------------
@@ -166,16 +173,9 @@ class DualRingMenu:
         ring_name = "WEAPONS" if self.active_ring_index == self.WEAPON_RING else "MAGIC"
         color = (255, 210, 100) if self.active_ring_index == self.WEAPON_RING else (140, 160, 255)
 
-        text = self._label_font.render(ring_name, True, color)
-        text_rect = text.get_rect(center=(cx, label_y))
-
-        # Background pill
-        bg_rect = text_rect.inflate(20, 8)
-        bg = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(bg, (15, 12, 10, 200), bg.get_rect(), border_radius=4)
-        pygame.draw.rect(bg, color + (120,), bg.get_rect(), 1, border_radius=4)
-        surface.blit(bg, bg_rect.topleft)
-        surface.blit(text, text_rect)
+        label = self._cache.get('label', (ring_name, 'ring'), lambda: render_label(
+            self._label_font, ring_name, color, (15, 12, 10, 200), color + (120,), (20, 8)))
+        surface.blit(label, label.get_rect(center=(cx, int(label_y))))
 
         # UP/DOWN arrows if magic is available
         if self.has_magic():
@@ -2,6 +2,10 @@ import pygame
 import math
 import random
 from data import *
+from assets import load_asset
+from world import world_bounds
+from ai_lod import lod_tick
+from events import emit_from, ENEMY_SPAWNED, ENEMY_DIED
 
 
 class Enemy(pygame.sprite.Sprite):
@@ -27,11 +31,12 @@ class Enemy(pygame.sprite.Sprite):
     CONTACT_DAMAGE = 8
     XP_VALUE = 5
 
-    def __init__(self, pos, groups, obstacle_sprites, player):
+    def __init__(self, pos, groups, obstacle_sprites, player, world=None):
         super().__init__(groups)
+        self.world = world
 
         # Sprite animations (generated procedurally)
-        self.animations = _build_animations()
+        self.animations = load_asset('creatures', _build_animations)
         self.status = 'down_idle'
         self.frame_index = 0
         self.animation_speed = 0.12
@@ -65,6 +70,7 @@ class Enemy(pygame.sprite.Sprite):
 
         # Charge
         self.charge_direction = pygame.math.Vector2(0, 0)
+        self._charge_tile = None
         self.charge_duration = 1200   # ms
 
         # Rest
@@ -80,6 +86,8 @@ class Enemy(pygame.sprite.Sprite):
         # Notice indicator
         self._excl_font = pygame.font.Font(None, 28)
 
+        emit_from(self, ENEMY_SPAWNED, enemy=self)
+
     # ------------------------------------------------------------------
     # AI helpers
     # ------------------------------------------------------------------
@@ -97,12 +105,21 @@ class Enemy(pygame.sprite.Sprite):
     def _state_elapsed(self):
         return pygame.time.get_ticks() - self.state_start
 
+    def _tile(self):
+        return (self.hitbox.centerx // TILESIZE, self.hitbox.centery // TILESIZE)
+
     def _dist_to_player(self):
         return pygame.math.Vector2(
             self.rect.centerx - self.player.rect.centerx,
             self.rect.centery - self.player.rect.centery,
         ).length()
 
+    def _sees_player(self):
+        """True unless a blocking tile lies between us and the player (World.sight)."""
+        if self.world is None:
+            return True
+        return self.world.sight.visible(self.hitbox.center, self.player.rect.center)
+
     def _dir_to_player(self):
         d = pygame.math.Vector2(
             self.player.rect.centerx - self.rect.centerx,
@@ -110,6 +127,15 @@ class Enemy(pygame.sprite.Sprite):
         )
         return d.normalize() if d.length() > 0 else pygame.math.Vector2(1, 0)
 
+    def _pursuit_dir(self):
+        """Heading toward the player around obstacles (World flow field)."""
+        if self.world is not None:
+            d = self.world.flow.direction(self.hitbox.center, self.player.hitbox.center,
+                                          clearance=max(self.hitbox.size) // 2)
+            if d is not None:
+                return d
+        return self._dir_to_player()
+
     # ------------------------------------------------------------------
     # AI update
     # ------------------------------------------------------------------
@@ -121,20 +147,27 @@ class Enemy(pygame.sprite.Sprite):
             if now - self.last_wander_change > self.wander_change_ms:
                 self._pick_wander_direction()
                 self.last_wander_change = now
-            if self._dist_to_player() < self.detection_radius:
+            if self._dist_to_player() < self.detection_radius and self._sees_player():
                 self._enter_state(self.NOTICE)
                 self.direction = pygame.math.Vector2(0, 0)
 
         elif self.state == self.NOTICE:
             self.direction = pygame.math.Vector2(0, 0)
-            if self._dist_to_player() > self.detection_radius * 1.5:
+            if (self._dist_to_player() > self.detection_radius * 1.5
+                    or not self._sees_player()):
                 self._enter_state(self.WANDER)
                 return
             if self._state_elapsed() > self.notice_duration:
-                self.charge_direction = self._dir_to_player()
+                self.charge_direction = self._pursuit_dir()
+                self._charge_tile = self._tile()
                 self._enter_state(self.CHARGE)
 
         elif self.state == self.CHARGE:
+            # Re-aim on every new tile so the charge flows around obstacles
+            tile = self._tile()
+            if tile != self._charge_tile:
+                self._charge_tile = tile
+                self.charge_direction = self._pursuit_dir()
             self.direction = self.charge_direction
             if self._state_elapsed() > self.charge_duration:
                 self.direction = pygame.math.Vector2(0, 0)
@@ -165,6 +198,7 @@ class Enemy(pygame.sprite.Sprite):
             self._enter_state(self.DYING)
             self.death_timer = 0
             self.player.gain_xp(self.XP_VALUE, self.ENEMY_TYPE)
+            emit_from(self, ENEMY_DIED, enemy=self)
         else:
             # Flash white briefly (handled in _animate)
             self._hit_flash = 6  # frames of flash
@@ -195,8 +229,7 @@ class Enemy(pygame.sprite.Sprite):
         self._collision('vertical')
         # Safety clamp to world boundaries
         margin = TILESIZE
-        self.hitbox.clamp_ip(pygame.Rect(margin, margin, 20 * TILESIZE - 2 * margin,
-                                          19 * TILESIZE - 2 * margin))
+        self.hitbox.clamp_ip(world_bounds(self.world, margin, bottom_inset=TILESIZE))
         self.rect.center = self.hitbox.center
 
     def _collision(self, axis):
@@ -254,7 +287,6 @@ class Enemy(pygame.sprite.Sprite):
 
         # Hit flash: tint white briefly when damaged but not dead
         if self._hit_flash > 0:
-            self._hit_flash -= 1
             flash_surf = self.image.copy()
             flash_surf.fill((255, 255, 255, 120), special_flags=pygame.BLEND_RGBA_ADD)
             self.image = flash_surf
@@ -282,11 +314,19 @@ class Enemy(pygame.sprite.Sprite):
     # ------------------------------------------------------------------
 
     def update(self):
+        steps, visible = lod_tick(self)
+        if not steps:
+            return
         self._update_ai()
         spd = self.charge_speed if self.state == self.CHARGE else self.speed
-        self.move(spd)
+        self.move(spd * steps)
         self.check_player_collision()
-        self._animate()
+        if visible:
+            self._animate()
+        # Count down even off-screen so the flash (and the full AI rate
+        # ai_lod keeps during it) ends on time
+        if self._hit_flash > 0:
+            self._hit_flash -= 1
 
 
 # ======================================================================
@@ -2,6 +2,10 @@ import pygame
 import math
 import random
 from data import *
+from assets import load_asset
+from world import world_bounds
+from ai_lod import lod_tick
+from events import emit_from, ENEMY_SPAWNED, ENEMY_DIED
 
 
 class Bat(pygame.sprite.Sprite):
@@ -25,10 +29,11 @@ class Bat(pygame.sprite.Sprite):
     CONTACT_DAMAGE = 5
     XP_VALUE = 3
 
-    def __init__(self, pos, groups, obstacle_sprites, player):
+    def __init__(self, pos, groups, obstacle_sprites, player, world=None):
         super().__init__(groups)
+        self.world = world
 
-        self.animations = _build_bat_animations()
+        self.animations = load_asset('creatures', _build_bat_animations)
         self.status = 'down'
         self.frame_index = 0
         self.animation_speed = 0.2
@@ -66,6 +71,8 @@ class Bat(pygame.sprite.Sprite):
         self.death_duration = 20
         self._hit_flash = 0
 
+        emit_from(self, ENEMY_SPAWNED, enemy=self)
+
     def _enter_state(self, state):
         self.state = state
         self.state_start = pygame.time.get_ticks()
@@ -79,6 +86,12 @@ class Bat(pygame.sprite.Sprite):
             self.rect.centery - self.player.rect.centery,
         ).length()
 
+    def _sees_player(self):
+        """True unless a blocking tile lies between us and the player (World.sight)."""
+        if self.world is None:
+            return True
+        return self.world.sight.visible(self.rect.center, self.player.rect.center)
+
     def _dir_to_player(self):
         d = pygame.math.Vector2(
             self.player.rect.centerx - self.rect.centerx,
@@ -90,16 +103,16 @@ class Bat(pygame.sprite.Sprite):
     # AI
     # ------------------------------------------------------------------
 
-    def _update_ai(self):
+    def _update_ai(self, steps=1):
         if self.state == self.IDLE:
             # Flutter in place with slight oscillation
-            self._flutter_phase += 0.05
+            self._flutter_phase += 0.05 * steps
             ox = math.sin(self._flutter_phase * 1.3) * 0.8
             oy = math.cos(self._flutter_phase) * 0.6
             self.direction = pygame.math.Vector2(ox, oy)
 
             # Detect player and swoop
-            if self._dist_to_player() < self.detection_radius:
+            if self._dist_to_player() < self.detection_radius and self._sees_player():
                 if self._state_elapsed() > self._idle_duration:
                     self.swoop_target = self._dir_to_player()
                     self._enter_state(self.SWOOP)
@@ -141,6 +154,7 @@ class Bat(pygame.sprite.Sprite):
             self._enter_state(self.DYING)
             self.death_timer = 0
             self.player.gain_xp(self.XP_VALUE, self.ENEMY_TYPE)
+            emit_from(self, ENEMY_DIED, enemy=self)
         else:
             self._hit_flash = 6
 
@@ -169,12 +183,12 @@ class Bat(pygame.sprite.Sprite):
 
         # Clamp to world boundaries (1 tile inset)
         margin = TILESIZE
-        self.hitbox.clamp_ip(pygame.Rect(margin, margin, 20 * TILESIZE - 2 * margin,
-                                          19 * TILESIZE - 2 * margin))
+        bounds = world_bounds(self.world, margin, bottom_inset=TILESIZE)
+        self.hitbox.clamp_ip(bounds)
         # Reverse direction if hitting boundary
-        if self.hitbox.left <= margin or self.hitbox.right >= 20 * TILESIZE - margin:
+        if self.hitbox.left <= bounds.left or self.hitbox.right >= bounds.right:
             self.direction.x = -self.direction.x
-        if self.hitbox.top <= margin or self.hitbox.bottom >= 19 * TILESIZE - margin:
+        if self.hitbox.top <= bounds.top or self.hitbox.bottom >= bounds.bottom:
             self.direction.y = -self.direction.y
 
         self.rect.center = self.hitbox.center
@@ -209,7 +223,6 @@ class Bat(pygame.sprite.Sprite):
             self.image.set_alpha(alpha)
 
         if self._hit_flash > 0:
-            self._hit_flash -= 1
             flash_surf = self.image.copy()
             flash_surf.fill((255, 255, 255, 120), special_flags=pygame.BLEND_RGBA_ADD)
             self.image = flash_surf
@@ -224,11 +237,17 @@ class Bat(pygame.sprite.Sprite):
     # ------------------------------------------------------------------
 
     def update(self):
-        self._update_ai()
+        steps, visible = lod_tick(self)
+        if not steps:
+            return
+        self._update_ai(steps)
         spd = self.swoop_speed if self.state == self.SWOOP else self.speed
-        self.move(spd)
+        self.move(spd * steps)
         self.check_player_collision()
-        self._animate()
+        if visible:
+            self._animate()
+        if self._hit_flash > 0:
+            self._hit_flash -= 1
 
 
 # ======================================================================
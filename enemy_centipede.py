@@ -2,6 +2,9 @@ import pygame
 import math
 import random
 from data import *
+from world import world_bounds
+from ai_lod import lod_tick
+from events import emit_from, ENEMY_SPAWNED, ENEMY_DIED
 
 
 # ── Centipede colour palette ──────────────────────────────────────
@@ -38,8 +41,9 @@ class Centipede(pygame.sprite.Sprite):
 
     SEG_SIZE = 16  # pixels per segment
 
-    def __init__(self, pos, groups, obstacle_sprites, player, num_segments=7):
+    def __init__(self, pos, groups, obstacle_sprites, player, num_segments=7, world=None):
         super().__init__(groups)
+        self.world = world
 
         self.num_segments = num_segments
         self.max_segments = num_segments
@@ -77,6 +81,8 @@ class Centipede(pygame.sprite.Sprite):
         self.death_duration = 30
         self._hit_flash = 0
 
+        emit_from(self, ENEMY_SPAWNED, enemy=self)
+
         # Animation
         self.frame_index = 0
         self.animation_speed = 0.15
@@ -94,6 +100,12 @@ class Centipede(pygame.sprite.Sprite):
             self.pos.y - self.player.rect.centery,
         ).length()
 
+    def _sees_player(self):
+        """True unless a blocking tile lies between us and the player (World.sight)."""
+        if self.world is None:
+            return True
+        return self.world.sight.visible(self.pos, self.player.rect.center)
+
     def _dir_to_player(self):
         d = pygame.math.Vector2(
             self.player.rect.centerx - self.pos.x,
@@ -101,11 +113,20 @@ class Centipede(pygame.sprite.Sprite):
         )
         return d.normalize() if d.length() > 0 else pygame.math.Vector2(1, 0)
 
+    def _pursuit_dir(self):
+        """Heading toward the player around obstacles (World flow field)."""
+        if self.world is not None:
+            d = self.world.flow.direction(self.pos, self.player.hitbox.center,
+                                          clearance=max(self.hitbox.size) // 2)
+            if d is not None:
+                return d
+        return self._dir_to_player()
+
     # ------------------------------------------------------------------
     # AI
     # ------------------------------------------------------------------
 
-    def _update_ai(self):
+    def _update_ai(self, steps=1):
         now = pygame.time.get_ticks()
 
         if self.state == self.SLITHER:
@@ -113,12 +134,12 @@ class Centipede(pygame.sprite.Sprite):
                 angle = random.uniform(0, 2 * math.pi)
                 self.direction = pygame.math.Vector2(math.cos(angle), math.sin(angle))
                 self.last_direction_change = now
-            if self._dist_to_player() < self.detection_radius:
+            if self._dist_to_player() < self.detection_radius and self._sees_player():
                 self._enter_state(self.PURSUE)
 
         elif self.state == self.PURSUE:
-            to_player = self._dir_to_player()
-            self.direction += (to_player - self.direction) * 0.05
+            to_player = self._pursuit_dir()
+            self.direction += (to_player - self.direction) * min(1.0, 0.05 * steps)
             if self.direction.length() > 0:
                 self.direction = self.direction.normalize()
             if self._dist_to_player() > self.detection_radius * 2:
@@ -145,6 +166,7 @@ class Centipede(pygame.sprite.Sprite):
             self._enter_state(self.DYING)
             self.death_timer = 0
             self.player.gain_xp(self.XP_VALUE, self.ENEMY_TYPE)
+            emit_from(self, ENEMY_DIED, enemy=self)
         else:
             self._rebuild_image()
 
@@ -164,13 +186,13 @@ class Centipede(pygame.sprite.Sprite):
     # Movement
     # ------------------------------------------------------------------
 
-    def move(self, speed):
+    def move(self, speed, steps=1):
         if self.direction.magnitude() != 0:
             self.direction = self.direction.normalize()
 
-        self.wave_phase += self.wave_freq
+        self.wave_phase += self.wave_freq * steps
         perp = pygame.math.Vector2(-self.direction.y, self.direction.x)
-        wave_offset = perp * math.sin(self.wave_phase) * self.wave_amp
+        wave_offset = perp * math.sin(self.wave_phase) * self.wave_amp * steps
 
         self.pos += self.direction * speed + wave_offset
 
@@ -188,8 +210,7 @@ class Centipede(pygame.sprite.Sprite):
                 break
 
         margin = TILESIZE
-        world_rect = pygame.Rect(margin, margin, 20 * TILESIZE - 2 * margin,
-                                  19 * TILESIZE - 2 * margin)
+        world_rect = world_bounds(self.world, margin, bottom_inset=TILESIZE)
         self.hitbox.clamp_ip(world_rect)
         self.pos.x = self.hitbox.centerx
         self.pos.y = self.hitbox.centery
@@ -330,7 +351,6 @@ class Centipede(pygame.sprite.Sprite):
 
         # Hit flash
         if self._hit_flash > 0:
-            self._hit_flash -= 1
             flash = surf.copy()
             flash.fill((255, 255, 255, 120), special_flags=pygame.BLEND_RGBA_ADD)
             surf = flash
@@ -346,8 +366,14 @@ class Centipede(pygame.sprite.Sprite):
     # ------------------------------------------------------------------
 
     def update(self):
-        self._update_ai()
+        steps, visible = lod_tick(self)
+        if not steps:
+            return
+        self._update_ai(steps)
         spd = self.pursue_speed if self.state == self.PURSUE else self.speed
-        self.move(spd)
+        self.move(spd * steps, steps)
         self.check_player_collision()
-        self._animate()
+        if visible:
+            self._animate()
+        if self._hit_flash > 0:
+            self._hit_flash -= 1
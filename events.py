@@ -0,0 +1,48 @@
+"""Lightweight game event bus.
+
+Each Level owns one EventBus (reachable from entities as
+``world.events``).  Gameplay code emits events when something happens
+and the bookkeeping that cares subscribes to them - objective counters,
+spawner slots, HUD invalidation and sound triggers - instead of
+rescanning every entity each frame.
+
+Handlers are called synchronously, in subscription order, with the
+event's keyword arguments:
+
+    bus.subscribe(ENEMY_DIED, on_enemy_died)     # on_enemy_died(enemy=...)
+    bus.emit(ENEMY_DIED, enemy=self)
+"""
+
+# Event names and their keyword arguments
+ENEMY_SPAWNED = 'enemy_spawned'         # enemy
+ENEMY_DIED = 'enemy_died'               # enemy (entered its DYING state)
+PICKUP_COLLECTED = 'pickup_collected'   # pickup, player
+RUNE_COLLECTED = 'rune_collected'       # rune_type, player
+LEVEL_UP = 'level_up'                   # player, level
+
+
+class EventBus:
+    """Synchronous publish / subscribe dispatcher."""
+
+    def __init__(self):
+        self._handlers = {}
+
+    def subscribe(self, event, handler):
+        self._handlers.setdefault(event, []).append(handler)
+
+    def unsubscribe(self, event, handler):
+        handlers = self._handlers.get(event)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def emit(self, event, **data):
+        # Copy so handlers may (un)subscribe while being dispatched
+        for handler in tuple(self._handlers.get(event, ())):
+            handler(**data)
+
+
+def emit_from(entity, event, **data):
+    """Emit *event* on the bus of the World *entity* lives in, if it has one."""
+    world = getattr(entity, 'world', None)
+    if world is not None:
+        world.events.emit(event, **data)
@@ -0,0 +1,203 @@
+"""Shared flow field for enemies pursuing the player.
+
+Rather than each chaser searching its own path, one field is computed
+over the tile collision grid (World.solid) from the player's tile: the
+octile distance of every free cell within FLOW_FIELD_RADIUS tiles, and
+for each cell the neighbouring cell one step closer.  Diagonal steps
+may not cut the corner of a blocked tile, and cells touching a blocked
+tile cost a little more, so paths keep off walls where there is room
+(wide bodies like the centipede snag on corners otherwise).  The field is only recomputed
+when the player moves to another tile, with whole-array relaxation
+passes, so its cost does not depend on the number of chasers.
+
+Chasers then sample it in O(1):
+
+    direction(pos)       heading from *pos* toward the player, steering
+                         at the farthest waypoint (a few cells ahead)
+                         that is in a straight, unblocked line
+    next_waypoints(pts)  vectorised next-cell centres (DemonHorde)
+
+Both return None / NaN outside the field, in the player's own tile or
+where the player can't be reached; callers fall back to a straight line.
+"""
+
+import math
+
+import numpy as np
+import pygame
+
+from data import TILESIZE, FLOW_FIELD_RADIUS
+
+_SQRT2 = math.sqrt(2)
+# (row step, col step, cost)
+_NEIGHBOURS = ((-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+               (-1, -1, _SQRT2), (-1, 1, _SQRT2), (1, -1, _SQRT2), (1, 1, _SQRT2))
+_LOOKAHEAD = 4          # cells followed when steering at a farther waypoint
+_WALL_COST = 0.5        # extra cost of entering a cell that touches a blocked tile
+
+
+def _shift(a, dr, dc, fill):
+    """b[r, c] = a[r + dr, c + dc], *fill* where that falls outside *a*."""
+    b = np.full_like(a, fill)
+    rows, cols = a.shape
+    b[max(0, -dr):rows - max(0, dr), max(0, -dc):cols - max(0, dc)] = \
+        a[max(0, dr):rows - max(0, -dr), max(0, dc):cols - max(0, -dc)]
+    return b
+
+
+class FlowField:
+    """Distance / next-step field toward the player's tile (see module docstring)."""
+
+    def __init__(self, solid, radius=FLOW_FIELD_RADIUS):
+        self.solid = solid
+        self.radius = radius
+        self.goal = None            # (row, col) the field leads to
+        self.origin = (0, 0)        # (row, col) of the window's top-left cell
+        self.dist = None
+        self.next_r = None          # absolute row of the next cell, -1 = none
+        self.next_c = None
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def _tile(self, pos):
+        rows, cols = self.solid.shape
+        return (min(rows - 1, max(0, int(pos[1]) // TILESIZE)),
+                min(cols - 1, max(0, int(pos[0]) // TILESIZE)))
+
+    def update(self, target_pos):
+        """Recompute if *target_pos* is on another tile; True when rebuilt."""
+        goal = self._tile(target_pos)
+        if goal == self.goal:
+            return False
+        self.goal = goal
+        self._compute()
+        return True
+
+    def _compute(self):
+        rows, cols = self.solid.shape
+        gr, gc = self.goal
+        r0, c0 = max(0, gr - self.radius), max(0, gc - self.radius)
+        r1, c1 = min(rows, gr + self.radius + 1), min(cols, gc + self.radius + 1)
+        self.origin = (r0, c0)
+
+        free = ~self.solid[r0:r1, c0:c1]
+        free[gr - r0, gc - c0] = True       # the player's tile is always a goal
+
+        # Moves allowed out of each cell, per neighbour (no corner cutting)
+        allowed = []
+        for dr, dc, _ in _NEIGHBOURS:
+            ok = free & _shift(free, dr, dc, False)
+            if dr and dc:
+                ok &= _shift(free, dr, 0, False) & _shift(free, 0, dc, False)
+            allowed.append(ok)
+
+        # Entering a cell next to a wall costs extra
+        near_wall = np.zeros(free.shape, dtype=bool)
+        for dr, dc, _ in _NEIGHBOURS:
+            near_wall |= ~_shift(free, dr, dc, True)
+        penalty = np.where(near_wall, _WALL_COST, 0.0)
+
+        dist = np.full(free.shape, np.inf)
+        dist[gr - r0, gc - c0] = 0.0
+        while True:
+            cand = [np.where(ok, _shift(dist + penalty, dr, dc, np.inf) + cost, np.inf)
+                    for (dr, dc, cost), ok in zip(_NEIGHBOURS, allowed)]
+            relaxed = np.minimum(dist, np.minimum.reduce(cand))
+            if np.array_equal(relaxed, dist):
+                break
+            dist = relaxed
+        self.dist = dist
+
+        best = np.argmin(np.stack(cand), axis=0)
+        reachable = np.isfinite(dist) & (dist > 0)
+        steps = np.array([(dr, dc) for dr, dc, _ in _NEIGHBOURS])
+        rr, cc = np.indices(dist.shape)
+        self.next_r = np.where(reachable, rr + r0 + steps[best, 0], -1)
+        self.next_c = np.where(reachable, cc + c0 + steps[best, 1], -1)
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def _next_cell(self, row, col):
+        if self.next_r is None:
+            return None
+        r, c = row - self.origin[0], col - self.origin[1]
+        if not (0 <= r < self.next_r.shape[0] and 0 <= c < self.next_r.shape[1]):
+            return None
+        nr = int(self.next_r[r, c])
+        if nr < 0:
+            return None
+        return nr, int(self.next_c[r, c])
+
+    def _line_clear(self, a, b, clearance=0):
+        """True if a body *clearance* px wide can slide from a to b unblocked.
+
+        Samples the centre line and the two lines offset by *clearance*
+        at quarter-tile steps.
+        """
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        length = math.hypot(dx, dy)
+        if length == 0:
+            return True
+        steps = max(1, int(length / (TILESIZE / 4)))
+        px, py = -dy / length * clearance, dx / length * clearance
+        rows, cols = self.solid.shape
+        for ox, oy in ((0, 0), (px, py), (-px, -py)) if clearance else ((0, 0),):
+            for i in range(1, steps + 1):
+                t = i / steps
+                col = int(a[0] + ox + dx * t) // TILESIZE
+                row = int(a[1] + oy + dy * t) // TILESIZE
+                if 0 <= row < rows and 0 <= col < cols and self.solid[row, col]:
+                    return False
+        return True
+
+    def direction(self, pos, target=None, clearance=0):
+        """Unit Vector2 from *pos* toward the goal along the field, or None.
+
+        *target* (the player's exact position) is steered at directly once
+        the walk reaches the goal tile in a clear line.  *clearance* is the
+        mover's half width, kept off obstacles when looking ahead.
+        """
+        row, col = self._tile(pos)
+        cell = self._next_cell(row, col)
+        if cell is None:
+            return None
+        aim = ((cell[1] + 0.5) * TILESIZE, (cell[0] + 0.5) * TILESIZE)
+        for _ in range(_LOOKAHEAD):
+            if cell == self.goal:
+                if target is not None and self._line_clear(pos, target, clearance):
+                    aim = target
+                break
+            cell = self._next_cell(*cell)
+            if cell is None:
+                break
+            ahead = ((cell[1] + 0.5) * TILESIZE, (cell[0] + 0.5) * TILESIZE)
+            if not self._line_clear(pos, ahead, clearance):
+                break
+            aim = ahead
+        d = pygame.math.Vector2(aim[0] - pos[0], aim[1] - pos[1])
+        return d.normalize() if d.length_squared() > 0 else None
+
+    def next_waypoints(self, positions):
+        """Centres of the next cell toward the goal for (k, 2) *positions*.
+
+        Rows are NaN where the field gives no step.
+        """
+        out = np.full((len(positions), 2), np.nan)
+        if self.next_r is None or not len(positions):
+            return out
+        r = (positions[:, 1] // TILESIZE).astype(np.intp) - self.origin[0]
+        c = (positions[:, 0] // TILESIZE).astype(np.intp) - self.origin[1]
+        h, w = self.next_r.shape
+        inside = (r >= 0) & (r < h) & (c >= 0) & (c < w)
+        nr = np.full(len(positions), -1)
+        nc = np.full(len(positions), -1)
+        nr[inside] = self.next_r[r[inside], c[inside]]
+        nc[inside] = self.next_c[r[inside], c[inside]]
+        ok = nr >= 0
+        out[ok, 0] = (nc[ok] + 0.5) * TILESIZE
+        out[ok, 1] = (nr[ok] + 0.5) * TILESIZE
+        return out
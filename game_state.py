@@ -1,9 +1,11 @@
 import pygame
 import math
 from data import WIDTH, HEIGHT, FPS
-from level import Level
+from level import Level, LevelPreloader
 from level_data import LEVELS
 from sounds import SoundManager
+from asset_cache import asset_cache
+from assets import registry
 
 
 class GameState:
@@ -27,10 +29,16 @@ class GameState:
         self._subtitle_font = pygame.font.Font(None, 28)
         self._prompt_font = pygame.font.Font(None, 24)
 
-        # Transition timer
+        # Transition timer.  The fade lasts _transition_duration and is only
+        # held longer if the next level's background preload isn't done yet.
         self._transition_start = 0
-        self._transition_duration = 2000  # ms
+        self._transition_duration = 1000  # ms
         self._next_level_index = 0
+        self._preloader = LevelPreloader()
+
+        # Initial-state snapshots for instant restarts: level 0 (new game)
+        # and the current level (retry from the game-over screen)
+        self._snapshots = {}
 
         # Prevent input bounce
         self._last_key_time = 0
@@ -46,14 +54,35 @@ class GameState:
             self._joystick = pygame.joystick.Joystick(0)
             self._joystick.init()
 
-    def _start_level(self, level_index):
-        """Initialize a level from LEVELS data."""
+    def _start_level(self, level_index, retry=False):
+        """Initialize a level from LEVELS data.
+
+        With retry=True the level is rebuilt from its snapshot with a new
+        player carrying the progress they entered the level with.
+        """
         self.current_level_index = level_index
         cfg = LEVELS[level_index]
-        self.level = Level(cfg, player=self.player)
+        snapshot = self._snapshots.get(level_index)
+        if retry or self.player is None:
+            self.player = None
+        else:
+            snapshot = None  # carried player: only reuse the built assets
+        assets = self._preloader.take(level_index)
+        if assets is None and level_index in self._snapshots:
+            assets = self._snapshots[level_index].assets
+        self.level = Level(cfg, player=self.player, assets=assets, snapshot=snapshot)
         self.player = self.level.player
+        if level_index not in self._snapshots:
+            self._snapshots[level_index] = self.level.snapshot()
+        for idx in list(self._snapshots):
+            if idx not in (0, level_index):
+                del self._snapshots[idx]
         self.state = self.GAMEPLAY
-        SoundManager.get().start_bgm()
+        SoundManager.get().start_bgm(cfg.get('theme'))
+        # Persist any surfaces generated for this level
+        asset_cache.save()
+        if registry.report_enabled:
+            print(registry.report())
 
     def update(self):
         """Call once per frame. Returns False to quit."""
@@ -150,10 +179,17 @@ class GameState:
     def _update_gameplay(self):
         signal = self.level.run()
 
+        # Start building the next level as soon as the portal appears
+        if self.level.objective_complete:
+            next_idx = self.level.config.get('next_level')
+            if next_idx is not None and next_idx < len(LEVELS):
+                self._preloader.start(next_idx, LEVELS[next_idx])
+
         if signal == 'next_level':
             next_idx = self.level.config.get('next_level')
             if next_idx is not None and next_idx < len(LEVELS):
                 self._next_level_index = next_idx
+                self._preloader.start(next_idx, LEVELS[next_idx])
                 self._transition_start = pygame.time.get_ticks()
                 self.state = self.LEVEL_TRANSITION
             else:
@@ -193,7 +229,7 @@ class GameState:
             self.display_surface.blit(text,
                 text.get_rect(center=(WIDTH // 2, HEIGHT // 2)))
 
-        if elapsed >= self._transition_duration:
+        if elapsed >= self._transition_duration and self._preloader.ready:
             self._start_level(self._next_level_index)
 
         return True
@@ -227,10 +263,15 @@ class GameState:
             prompt = self._prompt_font.render("Press SPACE to try again", True, (200, 180, 160))
             self.display_surface.blit(prompt,
                 prompt.get_rect(center=(WIDTH // 2, HEIGHT * 3 // 4)))
+        retry = self._prompt_font.render("Press R to retry this level", True, (170, 150, 140))
+        self.display_surface.blit(retry,
+            retry.get_rect(center=(WIDTH // 2, HEIGHT * 3 // 4 + 30)))
 
         self._draw_border((120, 30, 30))
 
-        if self._confirm_pressed():
+        if self._retry_pressed():
+            self._start_level(self.current_level_index, retry=True)
+        elif self._confirm_pressed():
             self.player = None
             self._title_enter_tick = 0
             self._crawl = None
@@ -303,6 +344,20 @@ class GameState:
             return True
         return False
 
+    def _retry_pressed(self):
+        """Check if R (keyboard) or button 1 (gamepad) is pressed, with debounce."""
+        now = pygame.time.get_ticks()
+        if now - self._last_key_time < 300:
+            return False
+        keys = pygame.key.get_pressed()
+        gp_btn = False
+        if self._joystick and self._joystick.get_numbuttons() > 1:
+            gp_btn = self._joystick.get_button(1)  # B button
+        if keys[pygame.K_r] or gp_btn:
+            self._last_key_time = now
+            return True
+        return False
+
     def _draw_border(self, color, alpha=255):
         """Decorative border around the screen."""
         if alpha < 255:
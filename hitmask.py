@@ -0,0 +1,42 @@
+"""Pixel-accurate melee hit tests with cached masks.
+
+Optional, off by default: when PRECISE_WEAPON_HITS is on (data.py),
+the weapon and enemy rects are only the broadphase and an enemy whose
+hitbox overlaps the weapon's rect is only hit if the weapon's hit shape
+overlaps the enemy's visible pixels.  This changes gameplay - the
+sword only reaches what its arc covers instead of its whole rect.
+
+Masks are never built per swing:
+  - weapon hit shapes are built once per (weapon_type, direction) by
+    weapon.Weapon and shared by every later swing,
+  - enemy masks come from frame_mask(), cached per animation frame
+    surface.  Frames are shared by every enemy of a type (load_asset),
+    so a crowd costs one mask per frame it shows.  The cache holds the
+    surfaces weakly, so one-off images (death shrink, hit flash) are
+    dropped with their surface.
+"""
+
+import weakref
+
+import pygame
+
+_frame_masks = weakref.WeakKeyDictionary()
+
+
+def frame_mask(surface):
+    """Cached mask of the opaque pixels of *surface*."""
+    mask = _frame_masks.get(surface)
+    if mask is None:
+        mask = _frame_masks[surface] = pygame.mask.from_surface(surface)
+    return mask
+
+
+def masks_overlap(rect, mask, other_rect, other_mask):
+    """True if *mask* placed at *rect* overlaps *other_mask* placed at *other_rect*."""
+    offset = (other_rect.x - rect.x, other_rect.y - rect.y)
+    return mask.overlap(other_mask, offset) is not None
+
+
+def sprite_hit(rect, mask, sprite):
+    """Mask test of a hit shape at *rect* against *sprite*'s current image."""
+    return masks_overlap(rect, mask, sprite.rect, frame_mask(sprite.image))
@@ -0,0 +1,584 @@
+"""Structure-of-arrays engine for large demon hordes.
+
+A Sprite per demon caps a level at a few hundred enemies: every frame
+pays for Vector2 allocations and method calls per instance.  A
+DemonHorde keeps one enemy type in NumPy arrays instead - positions,
+directions, AI state, timers, HP, animation frame - and runs the
+Enemy state machine (WANDER / NOTICE / CHARGE / REST / DYING), movement
+and tile collision as whole-array operations.
+
+The storage, combat and drawing parts live in ArrayHorde so other enemy
+types can be simulated the same way (BatSwarm in swarm.py).  A horde is
+not a sprite group.  The level feeds it to:
+  - YSortCameraGroup, which merges render_items() of on-screen members
+    into its y-sorted draw,
+  - the weapon and magic hit checks, through hits() / mask_hits() / sweep() /
+    damage().
+Kills award XP and emit enemy_died like single enemies, so objectives
+count horde demons too.
+
+Enable per level with a 'hordes' entry in level_data:
+
+    'hordes': [{'count': 1500, 'area': (col, row, cols, rows)}],
+
+('area' is optional and defaults to the whole map.)
+"""
+
+import abc
+import math
+
+import numpy as np
+import pygame
+
+from data import TILESIZE
+from enemy import Enemy, _build_animations
+from assets import load_asset
+from world import world_bounds
+from events import ENEMY_SPAWNED, ENEMY_DIED
+from sweep import sweep_boxes
+from hitmask import frame_mask, masks_overlap
+
+_FACINGS = ('down', 'up', 'left', 'right')
+_DOWN, _UP, _LEFT, _RIGHT = range(4)
+
+
+def _wander_dirs(count):
+    """Random unit directions, a quarter of them standing still (Enemy rules)."""
+    angle = np.random.uniform(0, 2 * math.pi, count)
+    dirs = np.stack([np.cos(angle), np.sin(angle)], axis=1)
+    dirs[np.random.random(count) < 0.25] = 0
+    return dirs
+
+
+def _normalize(vecs):
+    """Unit vectors; zero-length rows become (1, 0) like Enemy._dir_to_player."""
+    length = np.hypot(vecs[:, 0], vecs[:, 1])
+    out = np.zeros_like(vecs)
+    out[:, 0] = 1
+    moving = length > 0
+    out[moving] = vecs[moving] / length[moving, None]
+    return out
+
+
+def _facings(d):
+    """Facing index for each heading in *d* (dominant axis, as the sprites do)."""
+    horiz = np.abs(d[:, 0]) > np.abs(d[:, 1])
+    return np.where(horiz, np.where(d[:, 0] > 0, _RIGHT, _LEFT),
+                    np.where(d[:, 1] > 0, _DOWN, _UP))
+
+
+class HordeMember:
+    """Lightweight handle on one horde member (event payloads, targeting)."""
+
+    __slots__ = ('horde', 'uid')
+
+    def __init__(self, horde, uid):
+        self.horde = horde
+        self.uid = uid
+
+    @property
+    def ENEMY_TYPE(self):
+        return self.horde.ENEMY_TYPE
+
+    @property
+    def DYING(self):
+        return self.horde.DYING
+
+    @property
+    def state(self):
+        """The member's AI state; DYING once it has been removed."""
+        i = self._index()
+        return self.horde.DYING if i is None else int(self.horde.state[i])
+
+    def _index(self):
+        return self.horde.index_of(self.uid)
+
+    def alive(self):
+        return self._index() is not None
+
+    @property
+    def hitbox(self):
+        i = self._index()
+        if i is None:
+            return None
+        return self.horde.hitbox_at(i)
+
+
+class ArrayHorde(abc.ABC):
+    """Shared storage, combat and drawing for array-simulated enemies.
+
+    Subclasses set the stats below, extend FIELDS with their own
+    per-member arrays and implement _load_frames(), _init_members()
+    and update().
+    """
+
+    # name -> (dtype, columns)
+    FIELDS = {
+        'pos':         (np.float64, 2),   # hitbox centre
+        'dir':         (np.float64, 2),
+        'state':       (np.int8, 1),
+        'state_start': (np.int64, 1),     # ms
+        'hp':          (np.int32, 1),
+        'death_timer': (np.int16, 1),     # frames
+        'hit_flash':   (np.int16, 1),     # frames
+        'frame':       (np.float32, 1),
+        'facing':      (np.int8, 1),
+        'uid':         (np.int64, 1),
+    }
+
+    DYING = None
+    ENEMY_TYPE = None
+    MAX_HP = 1
+    CONTACT_DAMAGE = 0
+    XP_VALUE = 0
+    DEATH_DURATION = 25
+    DEATH_MIN_SCALE = 0.15     # death animation: smallest scale ...
+    DEATH_SHRINK = 0.6         # ... and how much it shrinks over the animation
+    HITBOX_SIZE = (32, 32)
+
+    def __init__(self, player, world, capacity=256):
+        self.player = player
+        self.world = world
+        self.n = 0
+        self._next_uid = 0
+        self._capacity = 0
+        self._grow(capacity)
+
+        self._frames, self._idle = self._load_frames()
+        self._flash_frames = None
+
+    @abc.abstractmethod
+    def _load_frames(self):
+        """([walk frames per facing], [idle image per facing] or None)."""
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _grow(self, capacity):
+        for name, (dtype, cols) in self.FIELDS.items():
+            shape = (capacity, cols) if cols > 1 else (capacity,)
+            arr = np.zeros(shape, dtype=dtype)
+            if self._capacity:
+                arr[:self.n] = getattr(self, name)[:self.n]
+            setattr(self, name, arr)
+        self._capacity = capacity
+
+    def _compact(self, keep):
+        """Drop members where *keep* is False, preserving order (uids stay sorted)."""
+        count = int(keep.sum())
+        for name in self.FIELDS:
+            arr = getattr(self, name)
+            arr[:count] = arr[:self.n][keep]
+        self.n = count
+
+    def __len__(self):
+        return self.n
+
+    def index_of(self, uid):
+        """Current array index of *uid*, or None once it has been removed."""
+        uids = self.uid[:self.n]
+        i = int(np.searchsorted(uids, uid))
+        return i if i < self.n and uids[i] == uid else None
+
+    def hitbox_at(self, i):
+        rect = pygame.Rect((0, 0), self.HITBOX_SIZE)
+        rect.center = (int(self.pos[i, 0]), int(self.pos[i, 1]))
+        return rect
+
+    # ------------------------------------------------------------------
+    # Spawning
+    # ------------------------------------------------------------------
+
+    def spawn(self, centers):
+        """Add members whose hitboxes are centred on *centers* ((k, 2) array)."""
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        k = len(centers)
+        if self.n + k > self._capacity:
+            self._grow(max(self.n + k, self._capacity * 2))
+        now = pygame.time.get_ticks()
+        s = slice(self.n, self.n + k)
+        self.pos[s] = centers
+        self.state_start[s] = now
+        self.hp[s] = self.MAX_HP
+        self.death_timer[s] = 0
+        self.hit_flash[s] = 0
+        self.frame[s] = 0
+        self.facing[s] = _DOWN
+        self._init_members(s, now)
+        self.uid[s] = np.arange(self._next_uid, self._next_uid + k)
+        self._next_uid += k
+        self.n += k
+        for uid in self.uid[s].tolist():
+            self.world.events.emit(ENEMY_SPAWNED, enemy=HordeMember(self, uid))
+
+    @abc.abstractmethod
+    def _init_members(self, s, now):
+        """Set the initial state, heading and subclass fields of slice *s*."""
+
+    def spawn_in(self, count, area=None):
+        """Spawn *count* members on random free tiles of *area* (col, row, cols, rows)."""
+        solid = self.world.solid
+        rows, cols = solid.shape
+        c0, r0, w, h = area if area is not None else (0, 0, cols, rows)
+        window = solid[r0:r0 + h, c0:c0 + w]
+        free_r, free_c = np.nonzero(~window)
+        if not len(free_r) or count <= 0:
+            return
+        pick = np.random.randint(0, len(free_r), count)
+        slack = np.maximum(0, TILESIZE - np.array(self.HITBOX_SIZE)) / 2
+        jitter = np.random.uniform(-1, 1, (count, 2)) * slack
+        centers = np.stack([(free_c[pick] + c0 + 0.5) * TILESIZE,
+                            (free_r[pick] + r0 + 0.5) * TILESIZE], axis=1) + jitter
+        self.spawn(centers)
+
+    # ------------------------------------------------------------------
+    # Simulation helpers
+    # ------------------------------------------------------------------
+
+    @abc.abstractmethod
+    def update(self):
+        """Advance every member by one frame (called once per frame by Level)."""
+
+    def _enter(self, mask, state, now):
+        self.state[:self.n][mask] = state
+        self.state_start[:self.n][mask] = now
+
+    def _clamp(self):
+        """Keep hitboxes inside the world; returns the (x, y) edge masks."""
+        bounds = world_bounds(self.world, TILESIZE, bottom_inset=TILESIZE)
+        hw, hh = self.HITBOX_SIZE[0] / 2, self.HITBOX_SIZE[1] / 2
+        pos = self.pos[:self.n]
+        np.clip(pos[:, 0], bounds.left + hw, bounds.right - hw, out=pos[:, 0])
+        np.clip(pos[:, 1], bounds.top + hh, bounds.bottom - hh, out=pos[:, 1])
+        return ((pos[:, 0] <= bounds.left + hw) | (pos[:, 0] >= bounds.right - hw),
+                (pos[:, 1] <= bounds.top + hh) | (pos[:, 1] >= bounds.bottom - hh))
+
+    def _check_player_collision(self):
+        """Bump and damage the player on contact (first touching member)."""
+        player = self.player
+        ph = player.hitbox
+        n = self.n
+        pos = self.pos[:n]
+        hw, hh = self.HITBOX_SIZE[0] / 2, self.HITBOX_SIZE[1] / 2
+        touching = ((np.abs(pos[:, 0] - ph.centerx) < hw + ph.width / 2)
+                    & (np.abs(pos[:, 1] - ph.centery) < hh + ph.height / 2)
+                    & (self.state[:n] != self.DYING))
+        hit = np.flatnonzero(touching)
+        if not len(hit):
+            return
+        bump = _normalize(np.array(player.rect.center, dtype=np.float64)[None] - pos[hit[:1]])[0]
+        player.take_damage(self.CONTACT_DAMAGE)
+        player.apply_knockback(pygame.math.Vector2(float(bump[0]), float(bump[1])))
+
+    def _finish_dying(self):
+        """Remove members whose death animation has played out."""
+        n = self.n
+        finished = (self.state[:n] == self.DYING) & (self.death_timer[:n] >= self.DEATH_DURATION)
+        if finished.any():
+            self._compact(~finished)
+
+    # ------------------------------------------------------------------
+    # Combat
+    # ------------------------------------------------------------------
+
+    def hits(self, rect):
+        """Indices of living members whose hitbox overlaps *rect*."""
+        n = self.n
+        if not n:
+            return np.empty(0, dtype=np.intp)
+        pos = self.pos[:n]
+        hw, hh = self.HITBOX_SIZE[0] / 2, self.HITBOX_SIZE[1] / 2
+        overlap = ((pos[:, 0] + hw > rect.left) & (pos[:, 0] - hw < rect.right)
+                   & (pos[:, 1] + hh > rect.top) & (pos[:, 1] - hh < rect.bottom)
+                   & (self.state[:n] != self.DYING))
+        return np.flatnonzero(overlap)
+
+    def mask_hits(self, rect, mask):
+        """hits(rect) narrowed to members whose pixels overlap *mask* at *rect*."""
+        idx = self.hits(rect)
+        keep = []
+        for i in idx.tolist():
+            image, image_rect = self.image_rect_at(i)
+            if masks_overlap(rect, mask, image_rect, frame_mask(image)):
+                keep.append(i)
+        return np.array(keep, dtype=np.intp)
+
+    def sweep(self, rect, delta):
+        """Living members *rect* hits moving by *delta*: (indices, times), by time."""
+        n = self.n
+        if not n:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        pos = self.pos[:n]
+        hw, hh = self.HITBOX_SIZE[0] / 2, self.HITBOX_SIZE[1] / 2
+        boxes = np.stack([pos[:, 0] - hw, pos[:, 1] - hh, pos[:, 0] + hw, pos[:, 1] + hh], axis=1)
+        times = sweep_boxes(rect, delta, boxes)
+        idx = np.flatnonzero(np.isfinite(times) & (self.state[:n] != self.DYING))
+        idx = idx[np.argsort(times[idx], kind='stable')]
+        return idx, times[idx]
+
+    def damage(self, idx, amount):
+        """Apply *amount* to members *idx*; returns how many of them died."""
+        if not len(idx):
+            return 0
+        hp = self.hp
+        hp[idx] -= amount
+        killed = idx[hp[idx] <= 0]
+        self.hit_flash[idx[hp[idx] > 0]] = 6
+        if len(killed):
+            now = pygame.time.get_ticks()
+            self.state[killed] = self.DYING
+            self.state_start[killed] = now
+            self.death_timer[killed] = 0
+            for uid in self.uid[killed].tolist():
+                self.player.gain_xp(self.XP_VALUE, self.ENEMY_TYPE)
+                self.world.events.emit(ENEMY_DIED, enemy=HordeMember(self, uid))
+        return len(killed)
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def _visible(self, view_rect, pad=TILESIZE):
+        pos = self.pos[:self.n]
+        return np.flatnonzero((pos[:, 0] > view_rect.left - pad)
+                              & (pos[:, 0] < view_rect.right + pad)
+                              & (pos[:, 1] > view_rect.top - pad)
+                              & (pos[:, 1] < view_rect.bottom + pad))
+
+    def _flash_set(self):
+        if self._flash_frames is None:
+            def flashed(img):
+                surf = img.copy()
+                surf.fill((255, 255, 255, 120), special_flags=pygame.BLEND_RGBA_ADD)
+                return surf
+            idle = [flashed(f) for f in self._idle] if self._idle is not None else None
+            self._flash_frames = ([[flashed(f) for f in frames] for frames in self._frames], idle)
+        return self._flash_frames
+
+    def _pick_image(self, facing, frame, walking, flash):
+        frames, idle = (self._flash_set() if flash else (self._frames, self._idle))
+        if walking or idle is None:
+            return frames[facing][frame]
+        return idle[facing]
+
+    def image_rect_at(self, i):
+        """(image, world rect) member *i* is drawn with (death animation aside)."""
+        d = self.dir[i]
+        image = self._pick_image(int(self.facing[i]), int(self.frame[i]),
+                                 d[0] ** 2 + d[1] ** 2 >= 0.01, self.hit_flash[i])
+        return image, image.get_rect(center=(int(self.pos[i, 0]), int(self.pos[i, 1])))
+
+    def render_items(self, view_rect):
+        """(sort_y, image, world_topleft) for every member near *view_rect*."""
+        items = []
+        idx = self._visible(view_rect)
+        if not len(idx):
+            return items
+        pos = self.pos[idx]
+        facing = self.facing[idx].tolist()
+        frame = self.frame[idx].astype(np.intp).tolist()
+        d = self.dir[idx]
+        walking = ((d[:, 0] ** 2 + d[:, 1] ** 2) >= 0.01).tolist()
+        state = self.state[idx].tolist()
+        flash = self.hit_flash[idx].tolist()
+        timer = self.death_timer[idx].tolist()
+        for k, (x, y) in enumerate(pos.tolist()):
+            image = self._pick_image(facing[k], frame[k], walking[k], flash[k])
+            if state[k] == self.DYING:
+                t = timer[k] / max(1, self.DEATH_DURATION)
+                scale = max(self.DEATH_MIN_SCALE, 1.0 - t * self.DEATH_SHRINK)
+                size = (max(1, int(image.get_width() * scale)),
+                        max(1, int(image.get_height() * scale)))
+                image = pygame.transform.scale(image, size)
+                image.set_alpha(max(0, int(255 * (1 - t))))
+            w, h = image.get_size()
+            items.append((y, image, (x - w // 2, y - h // 2)))
+        return items
+
+    def draw_notice_indicators(self, surface, offset, view_rect):
+        """Draw nothing: only subclasses with a NOTICE state show a '!'."""
+
+
+class DemonHorde(ArrayHorde):
+    """Many Enemy demons simulated as NumPy arrays (see module docstring)."""
+
+    FIELDS = dict(ArrayHorde.FIELDS, last_wander=(np.int64, 1))   # ms
+
+    WANDER = Enemy.WANDER
+    NOTICE = Enemy.NOTICE
+    CHARGE = Enemy.CHARGE
+    REST = Enemy.REST
+    DYING = Enemy.DYING
+
+    ENEMY_TYPE = Enemy.ENEMY_TYPE
+    MAX_HP = Enemy.MAX_HP
+    CONTACT_DAMAGE = Enemy.CONTACT_DAMAGE
+    XP_VALUE = Enemy.XP_VALUE
+
+    # Same tuning as Enemy
+    SPEED = 2.5
+    CHARGE_SPEED = 7
+    DETECTION_RADIUS = 200
+    WANDER_CHANGE_MS = 2500
+    NOTICE_DURATION = 2000
+    CHARGE_DURATION = 1200
+    REST_DURATION = 3000
+    DEATH_DURATION = 25
+    HITBOX_SIZE = (36, 34)     # Enemy: 48x52 frame inflated by (-12, -18)
+
+    def __init__(self, player, world, capacity=256):
+        super().__init__(player, world, capacity)
+        self._excl_font = pygame.font.Font(None, 28)
+
+    def _load_frames(self):
+        anims = load_asset('creatures', _build_animations)
+        return ([anims[d] for d in _FACINGS],
+                [anims[f'{d}_idle'][0] for d in _FACINGS])
+
+    def _init_members(self, s, now):
+        k = s.stop - s.start
+        self.dir[s] = _wander_dirs(k)
+        self.state[s] = self.WANDER
+        self.last_wander[s] = now
+
+    # ------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------
+
+    def update(self):
+        n = self.n
+        if not n:
+            return
+        now = pygame.time.get_ticks()
+        pos = self.pos[:n]
+        d = self.dir[:n]
+        state = self.state[:n]
+
+        elapsed = now - self.state_start[:n]
+        to_player = np.array(self.player.rect.center, dtype=np.float64) - pos
+        dist = np.hypot(to_player[:, 0], to_player[:, 1])
+        radius = self.DETECTION_RADIUS
+
+        # States as of the start of the frame (one transition per frame)
+        wander = state == self.WANDER
+        notice = state == self.NOTICE
+        charge = state == self.CHARGE
+        rest = state == self.REST
+        dying = state == self.DYING
+
+        # WANDER: new heading every few seconds, notice the player nearby and in sight
+        redirect = wander & (now - self.last_wander[:n] > self.WANDER_CHANGE_MS)
+        if redirect.any():
+            d[redirect] = _wander_dirs(int(redirect.sum()))
+            self.last_wander[:n][redirect] = now
+        spotted = wander & (dist < radius)
+        if spotted.any():
+            spotted[spotted] = self.world.sight.visible_from(pos[spotted], self.player.rect.center)
+        self._enter(spotted, self.NOTICE, now)
+        d[spotted] = 0
+
+        # NOTICE: hold still, give up if the player left or broke sight, else charge
+        d[notice] = 0
+        lost = notice & (dist > radius * 1.5)
+        watching = notice & ~lost
+        if watching.any():
+            lost[watching] = ~self.world.sight.visible_from(pos[watching], self.player.rect.center)
+        self._enter(lost, self.WANDER, now)
+        go = notice & ~lost & (elapsed > self.NOTICE_DURATION)
+        if go.any():
+            # Charge at the next flow-field cell, straight at the player
+            # where the field gives no step
+            aim = self.world.flow.next_waypoints(pos[go])
+            direct = np.isnan(aim[:, 0])
+            aim[direct] = pos[go][direct] + to_player[go][direct]
+            d[go] = _normalize(aim - pos[go])
+            self._enter(go, self.CHARGE, now)
+
+        # CHARGE: keep the heading until the charge runs out
+        done = charge & (elapsed > self.CHARGE_DURATION)
+        d[done] = 0
+        self._enter(done, self.REST, now)
+
+        # REST: stand, then wander again
+        d[rest] = 0
+        woke = rest & (elapsed > self.REST_DURATION)
+        if woke.any():
+            self._enter(woke, self.WANDER, now)
+            d[woke] = _wander_dirs(int(woke.sum()))
+
+        # DYING: count down the death animation
+        d[dying] = 0
+        self.death_timer[:n][dying] += 1
+
+        # Movement with axis-separated tile collision
+        speed = np.where(self.state[:n] == self.CHARGE, self.CHARGE_SPEED, self.SPEED)
+        length = np.hypot(d[:, 0], d[:, 1])
+        moving = length > 0
+        d[moving] /= length[moving, None]
+        for axis in (0, 1):
+            self._move_axis(axis, d[:, axis] * speed)
+        self._clamp()
+
+        self._check_player_collision()
+        self._animate(moving)
+        self._finish_dying()
+
+    def _blocked(self, centers):
+        """True for hitboxes centred on *centers* that overlap a solid tile."""
+        solid = self.world.solid
+        rows, cols = solid.shape
+        hw, hh = self.HITBOX_SIZE[0] / 2, self.HITBOX_SIZE[1] / 2
+        x0 = np.clip(((centers[:, 0] - hw) // TILESIZE).astype(np.intp), 0, cols - 1)
+        x1 = np.clip(((centers[:, 0] + hw - 1) // TILESIZE).astype(np.intp), 0, cols - 1)
+        y0 = np.clip(((centers[:, 1] - hh) // TILESIZE).astype(np.intp), 0, rows - 1)
+        y1 = np.clip(((centers[:, 1] + hh - 1) // TILESIZE).astype(np.intp), 0, rows - 1)
+        return solid[y0, x0] | solid[y0, x1] | solid[y1, x0] | solid[y1, x1]
+
+    def _move_axis(self, axis, delta):
+        pos = self.pos[:self.n]
+        stepping = delta != 0
+        if not stepping.any():
+            return
+        target = pos[stepping].copy()
+        target[:, axis] += delta[stepping]
+        free = ~self._blocked(target)
+        idx = np.flatnonzero(stepping)[free]
+        pos[idx, axis] = target[free, axis]
+
+    def _animate(self, moving):
+        n = self.n
+        d = self.dir[:n]
+        flash = self.hit_flash[:n]
+        flash[flash > 0] -= 1
+
+        # Facing follows the heading while moving (Enemy._update_status_string)
+        walking = moving & ((d[:, 0] ** 2 + d[:, 1] ** 2) >= 0.01)
+        self.facing[:n][walking] = _facings(d)[walking]
+
+        speed = np.where(self.state[:n] == self.CHARGE, 0.25, 0.12).astype(np.float32)
+        frame = self.frame[:n]
+        frame[:] = np.where(walking, frame + speed, 0)
+        frame[frame >= len(self._frames[0])] = 0
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def draw_notice_indicators(self, surface, offset, view_rect):
+        """'!' above on-screen members in NOTICE (as Enemy.draw_notice_indicator)."""
+        idx = self._visible(view_rect, pad=0)
+        idx = idx[self.state[idx] == self.NOTICE]
+        if not len(idx):
+            return
+        now = pygame.time.get_ticks()
+        bob = int(3 * math.sin(now * 0.008))
+        _, frame_h = self._idle[0].get_size()
+        for i in idx.tolist():
+            progress = min(1.0, (now - int(self.state_start[i])) / self.NOTICE_DURATION)
+            intensity = int(155 + 100 * progress)
+            color = (intensity, max(0, intensity - 180), 0)
+            txt = self._excl_font.render('!', True, color)
+            sx = self.pos[i, 0] - offset.x
+            sy = self.pos[i, 1] - frame_h // 2 - 10 - offset.y
+            surface.blit(txt, txt.get_rect(center=(int(sx), int(sy) + bob)))
@@ -14,11 +14,22 @@ class HUD:
         self.font_big = pygame.font.Font(None, 26)
         self._portrait = None  # lazy-built player portrait
 
+        # Everything except the bars only changes on game events
+        # (level up, kill, pickup, rune) or an equipment switch, so it is
+        # drawn once into a cached panel and rebuilt when invalidated.
+        self._panel = None
+        self._panel_key = None
+
+    def invalidate(self, **_):
+        """Mark the cached panel stale (subscribed to the level's events)."""
+        self._panel = None
+
     def _get_portrait(self):
         """Build a small portrait card once on first use."""
         if self._portrait is None:
             from player_sprite import build_player_icon
-            raw = build_player_icon()
+            from assets import load_asset
+            raw = load_asset('icons', build_player_icon)
             # Scale to fit inside a 42x42 area
             self._portrait = pygame.transform.smoothscale(raw, (42, 42))
         return self._portrait
@@ -26,30 +37,11 @@ class HUD:
     def draw(self, player):
         bar_y = HEIGHT - self.BAR_HEIGHT
 
-        # Background bar
-        bg = pygame.Surface((WIDTH, self.BAR_HEIGHT), pygame.SRCALPHA)
-        bg.fill((12, 10, 8, 210))
-        pygame.draw.line(bg, (100, 85, 55), (0, 0), (WIDTH, 0), 2)
-        self.display_surface.blit(bg, (0, bar_y))
-
-        # --- Hero portrait card (left edge) ---
-        portrait = self._get_portrait()
-        card_x, card_y = 6, bar_y + 4
-        card_w, card_h = 48, 46
-        # Golden border
-        pygame.draw.rect(self.display_surface, (180, 150, 60),
-                         (card_x, card_y, card_w, card_h), border_radius=4)
-        pygame.draw.rect(self.display_surface, (220, 190, 80),
-                         (card_x, card_y, card_w, card_h), 2, border_radius=4)
-        # Inner dark background
-        inner = pygame.Rect(card_x + 3, card_y + 3, card_w - 6, card_h - 6)
-        pygame.draw.rect(self.display_surface, (20, 18, 15), inner)
-        # Portrait
-        self.display_surface.blit(portrait, portrait.get_rect(center=inner.center))
-
-        # --- Level indicator (right of portrait) ---
-        lvl_text = self.font_big.render(f"Lv {player.level}", True, (255, 230, 140))
-        self.display_surface.blit(lvl_text, (60, bar_y + 6))
+        key = (player.weapon, player.magic)
+        if self._panel is None or key != self._panel_key:
+            self._panel = self._build_panel(player)
+            self._panel_key = key
+        self.display_surface.blit(self._panel, (0, bar_y))
 
         # --- HP bar ---
         hp_x = 110
@@ -68,9 +60,37 @@ class HUD:
                        player.xp, player.xp_to_next,
                        (180, 160, 40), (50, 45, 15), "XP")
 
+    def _build_panel(self, player):
+        """Draw the static part of the bar (everything but HP/MP/XP)."""
+        panel = pygame.Surface((WIDTH, self.BAR_HEIGHT), pygame.SRCALPHA)
+        bar_y = 0
+
+        # Background bar
+        panel.fill((12, 10, 8, 210))
+        pygame.draw.line(panel, (100, 85, 55), (0, 0), (WIDTH, 0), 2)
+
+        # --- Hero portrait card (left edge) ---
+        portrait = self._get_portrait()
+        card_x, card_y = 6, bar_y + 4
+        card_w, card_h = 48, 46
+        # Golden border
+        pygame.draw.rect(panel, (180, 150, 60),
+                         (card_x, card_y, card_w, card_h), border_radius=4)
+        pygame.draw.rect(panel, (220, 190, 80),
+                         (card_x, card_y, card_w, card_h), 2, border_radius=4)
+        # Inner dark background
+        inner = pygame.Rect(card_x + 3, card_y + 3, card_w - 6, card_h - 6)
+        pygame.draw.rect(panel, (20, 18, 15), inner)
+        # Portrait
+        panel.blit(portrait, portrait.get_rect(center=inner.center))
+
+        # --- Level indicator (right of portrait) ---
+        lvl_text = self.font_big.render(f"Lv {player.level}", True, (255, 230, 140))
+        panel.blit(lvl_text, (60, bar_y + 6))
+
         # --- Kill count ---
         kill_text = self.font.render(f"Kills: {player.kills}", True, (200, 190, 160))
-        self.display_surface.blit(kill_text, (400, bar_y + 8))
+        panel.blit(kill_text, (400, bar_y + 8))
 
         # --- Equipped weapon icon (center area) ---
         from player import weapon_data
@@ -78,10 +98,10 @@ class HUD:
         equip_x = WIDTH // 2 - 60
         if weap:
             label = self.font.render("WPN", True, (160, 150, 120))
-            self.display_surface.blit(label, (equip_x, bar_y + 4))
+            panel.blit(label, (equip_x, bar_y + 4))
             icon = weap['graphic']
             scaled = pygame.transform.scale(icon, (28, 28))
-            self.display_surface.blit(scaled, (equip_x + 36, bar_y + 2))
+            panel.blit(scaled, (equip_x + 36, bar_y + 2))
 
         # --- Equipped spell icon (center area, right of weapon) ---
         from magic import magic_data
@@ -89,11 +109,11 @@ class HUD:
         spell_x = WIDTH // 2 + 20
         if spell and player.magic in player.collected_runes:
             label = self.font.render("MAG", True, (120, 130, 180))
-            self.display_surface.blit(label, (spell_x, bar_y + 4))
+            panel.blit(label, (spell_x, bar_y + 4))
             icon = spell.get('icon')
             if icon:
                 scaled = pygame.transform.scale(icon, (28, 28))
-                self.display_surface.blit(scaled, (spell_x + 36, bar_y + 2))
+                panel.blit(scaled, (spell_x + 36, bar_y + 2))
 
         # --- Armour indicator (right side) ---
         if player.armour > 0:
@@ -106,16 +126,17 @@ class HUD:
                 (ar_x + 14, bar_y + 26),
                 (ar_x + 6, bar_y + 16),
             ]
-            pygame.draw.polygon(self.display_surface, (140, 150, 170), shield_pts)
-            pygame.draw.polygon(self.display_surface, (180, 190, 210), shield_pts, 2)
+            pygame.draw.polygon(panel, (140, 150, 170), shield_pts)
+            pygame.draw.polygon(panel, (180, 190, 210), shield_pts, 2)
             # Cross on shield
-            pygame.draw.line(self.display_surface, (210, 215, 225),
+            pygame.draw.line(panel, (210, 215, 225),
                              (ar_x + 14, bar_y + 8), (ar_x + 14, bar_y + 22), 2)
-            pygame.draw.line(self.display_surface, (210, 215, 225),
+            pygame.draw.line(panel, (210, 215, 225),
                              (ar_x + 9, bar_y + 14), (ar_x + 19, bar_y + 14), 2)
             # Text
             ar_text = self.font.render(f"AR {player.armour}", True, (180, 190, 210))
-            self.display_surface.blit(ar_text, (ar_x + 26, bar_y + 10))
+            panel.blit(ar_text, (ar_x + 26, bar_y + 10))
+        return panel
 
     def _draw_bar(self, x, y, w, h, current, maximum, fill_color, bg_color, label):
         """Draw a labeled resource bar."""
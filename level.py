@@ -1,22 +1,33 @@
 import pygame
 import os
 import random
+import threading
+import numpy as np
 from data import *
-from tile import Tile
 from player import Player
 from support import *
+from level_compiler import load_level, EMPTY_CELL
 from weapon import Weapon
 from player import weapon_data
-from enemy import Enemy
-from enemy_bat import Bat
+from enemy import Enemy, _build_animations
+from enemy_bat import Bat, _build_bat_animations
 from enemy_centipede import Centipede
 from magic import FireCone, IceBall, ShadowBlade, magic_data
 from spawner import CaveSpawner
+from horde import DemonHorde
+from swarm import BatSwarm
 from hud import HUD
 from pickup import RunePickup, HealthPickup, ArmourPickup
 from portal import Portal
 from sounds import SoundManager
-from tile_graphics import make_floor_surface, make_rock, make_grass_tuft, make_column, make_chainmail_stand
+from events import (EventBus, ENEMY_SPAWNED, ENEMY_DIED, PICKUP_COLLECTED,
+                    RUNE_COLLECTED, LEVEL_UP)
+from tile_graphics import variant_pool
+from world import World, prefetch_floor_chunks
+from sweep import sweep_rects
+from hitmask import sprite_hit
+from targeting import EnemyIndex
+from assets import load_asset
 
 # Map enemy type string to class
 _ENEMY_CLASSES = {
@@ -33,35 +44,171 @@ _RUNE_MAP = {
     'rune_shadow':  ('shadow_blade', lambda: magic_data['shadow_blade']['icon']),
 }
 
+# Shared animation tables to warm per enemy type (centipedes draw live)
+_ENEMY_ANIMATIONS = {
+    'demon': _build_animations,
+    'bat': _build_bat_animations,
+}
+
+
+# ======================================================================
+# Level assets & background preloading
+# ======================================================================
+
+class LevelAssets:
+    """Everything a level needs that doesn't depend on the player.
+
+    Compiled tile layers, the floor surface and the tile / creature art.  It
+    holds no sprites or groups, so it is safe to build on a worker thread
+    while the current level is still being played.
+    """
+
+    def __init__(self, level_config):
+        self.config = level_config
+        self.theme = level_config.get('theme', 'meadow')
+        self.compiled = load_level(level_config)
+        self.layers = self.compiled.layers
+
+        # Authored floor image, or the procedural floor chunks around the
+        # player start (the World streams in the rest)
+        floor_path = level_config.get('floor')
+        if floor_path:
+            self.floor = pygame.image.load(floor_path).convert()
+            self.floor_chunks = {}
+        else:
+            self.floor = None
+            self.floor_chunks = prefetch_floor_chunks(self.compiled, self.theme,
+                                                      level_config['player_pos'])
+
+        self.pool = variant_pool(self.theme)
+        for kind in self._tile_kinds():
+            self.pool.variants(kind)
+
+        enemy_types = {etype for etype, _ in level_config.get('enemies', [])}
+        if level_config.get('spawners'):
+            enemy_types.add('demon')
+        for etype in enemy_types:
+            if etype in _ENEMY_ANIMATIONS:
+                load_asset('creatures', _ENEMY_ANIMATIONS[etype])
+
+    def _tile_kinds(self):
+        kinds = set()
+        if (self.layers['rocks'] != EMPTY_CELL).any():
+            kinds.add('rock')
+        if (self.layers['grass'] != EMPTY_CELL).any():
+            kinds.add('grass')
+        objects = self.layers['object'][self.layers['object'] != EMPTY_CELL]
+        if (objects == 1).any():
+            kinds.add('column')
+        if (objects != 1).any():
+            kinds.add('stand')
+        return kinds
+
+
+class LevelSnapshot:
+    """Fully constructed initial state of a level, captured on first build.
+
+    Holds the LevelAssets (layers, floor, art), the resolved tile layout
+    (which also defines the collision layer) and the player's progress on
+    entry.  Enemies, pickups and spawners are rebuilt from the level config,
+    which is cheap once their art is in the asset registry.
+    """
+
+    def __init__(self, level):
+        self.config = level.config
+        self.assets = level.assets
+        self.tiles = level.tile_specs
+        self.player_progress = level.player.progress()
+
+
+class LevelPreloader:
+    """Builds LevelAssets for the next level on a daemon thread."""
+
+    def __init__(self):
+        self.level_index = None
+        self._assets = None
+        self._error = None
+        self._thread = None
+
+    def start(self, level_index, level_config):
+        """Begin building *level_config* (no-op if already started for it)."""
+        if self.level_index == level_index:
+            return
+        self.level_index = level_index
+        self._assets = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(level_config,),
+                                        name='level-preload', daemon=True)
+        self._thread.start()
+
+    def _run(self, level_config):
+        try:
+            self._assets = LevelAssets(level_config)
+        except Exception as e:  # fall back to a synchronous build
+            self._error = e
+
+    @property
+    def ready(self):
+        return self._thread is not None and not self._thread.is_alive()
+
+    def take(self, level_index):
+        """Return the finished LevelAssets for *level_index*, or None.
+
+        Waits for a build that is still running; returns None (the caller
+        builds synchronously) if nothing was started or the build failed.
+        """
+        if self.level_index != level_index or self._thread is None:
+            return None
+        self._thread.join()
+        assets = self._assets
+        if self._error is not None:
+            print(f"Level preload failed, building synchronously: {self._error}")
+        self.level_index = None
+        self._assets = None
+        self._thread = None
+        return assets
+
 
 class Level:
-    def __init__(self, level_config, player=None):
+    def __init__(self, level_config, player=None, assets=None, snapshot=None):
         """
         level_config: dict from level_data.LEVELS
         player: existing Player to carry between levels (None for first level)
+        assets: prebuilt LevelAssets for this config (None = build now)
+        snapshot: LevelSnapshot of this level's first build; reuses its assets
+                  and tile layout, and restores its player progress when no
+                  player is passed in (level retry)
         """
         self.display_surface = pygame.display.get_surface()
         self.config = level_config
         self.theme = level_config.get('theme', 'meadow')
+        self._snapshot = snapshot
+        if snapshot is not None:
+            assets = snapshot.assets
+        self.assets = assets or LevelAssets(level_config)
 
         # Sprite groups
-        self.visible_sprites = YSortCameraGroup(
-            floor_path=level_config.get('floor'),
-            theme=self.theme,
-        )
+        self.visible_sprites = YSortCameraGroup()
         self.obstacle_sprites = pygame.sprite.Group()
         self.enemy_sprites = pygame.sprite.Group()
+        self.spawner_sprites = pygame.sprite.Group()
         self.magic_sprites = pygame.sprite.Group()
         self.pickup_sprites = pygame.sprite.Group()
+        self.hordes = []            # DemonHorde / BatSwarm instances (array-simulated enemies)
+        self.enemy_index = EnemyIndex(self.enemy_sprites, self.hordes)   # nearest-enemy queries
 
         self.current_attack = None
         self.hud = HUD()
 
-        # Objective tracking
+        # Objective tracking (running counters fed by the event bus)
         self.level_kills = 0
+        self.enemies_alive = 0
         self.objective_complete = False
         self.portal = None
 
+        self.events = EventBus()
+        self._subscribe_events()
+
         # Font for level name / objective
         self._obj_font = pygame.font.Font(None, 22)
         self._title_font = pygame.font.Font(None, 36)
@@ -90,54 +237,32 @@ class Level:
         elif key == 'ice_ball':
             IceBall(self.player, groups)
         elif key == 'shadow_blade':
-            ShadowBlade(self.player, groups, self.enemy_sprites)
+            ShadowBlade(self.player, groups, self.enemy_index)
 
     def create_map(self):
         cfg = self.config
-        csv_paths = cfg['map_csv']
-        theme = self.theme
-
-        layout = {
-            'boundary': import_csv_layout(csv_paths['boundary']),
-            'rocks':    import_csv_layout(csv_paths['rocks']),
-            'grass':    import_csv_layout(csv_paths['grass']),
-            'object':   import_csv_layout(csv_paths['object']),
-        }
-
-        for style, layer in layout.items():
-            for row_index, row in enumerate(layer):
-                for col_index, col in enumerate(row):
-                    if col != '-1':
-                        x = col_index * TILESIZE
-                        y = row_index * TILESIZE
-                        if style == 'boundary':
-                            Tile((x, y), [self.obstacle_sprites], 'invisible')
-                        if style == 'rocks':
-                            rock_img = make_rock(theme)
-                            Tile((x, y), [self.visible_sprites], 'rocks', rock_img)
-                        if style == 'grass':
-                            grass_img = make_grass_tuft(theme)
-                            Tile((x, y), [self.visible_sprites, self.obstacle_sprites],
-                                 'grass', grass_img)
-                        if style == 'object':
-                            col_val = int(col)
-                            if col_val == 1:
-                                col_img = make_column(theme)
-                                Tile((x, y),
-                                     [self.visible_sprites, self.obstacle_sprites],
-                                     'sceneryObject', col_img)
-                            else:
-                                stand_img = make_chainmail_stand()
-                                Tile((x, y), [self.visible_sprites],
-                                     'object', stand_img)
+        if self._snapshot is not None:
+            self.tile_specs = self._snapshot.tiles
+        else:
+            self.tile_specs = self._build_tile_specs()
+
+        # Static tiles are streamed in per chunk by the World
+        self.world = World(self.assets, self.tile_specs,
+                           self.visible_sprites, self.obstacle_sprites,
+                           entity_groups=[self.enemy_sprites, self.spawner_sprites],
+                           events=self.events)
+        self.visible_sprites.world = self.world
 
         # --- Player ---
         if self._existing_player:
             self.player = self._existing_player
             self.player.rect.topleft = cfg['player_pos']
             self.player.hitbox.center = self.player.rect.center
+            # Leave the previous level's groups so they (and its floor) can be freed
+            self.player.kill()
             self.player.add(self.visible_sprites)
             self.player.obstacle_sprites = self.obstacle_sprites
+            self.player.world = self.world
             self.player.create_attack = self.create_attack
             self.player.destroy_weapon = self.destroy_weapon
             self.player.create_magic = self.create_magic
@@ -150,6 +275,9 @@ class Level:
                 self.destroy_weapon,
                 self.create_magic,
             )
+            self.player.world = self.world
+            if self._snapshot is not None and self._snapshot.player_progress:
+                self.player.restore_progress(self._snapshot.player_progress)
 
         # --- Enemies ---
         enemy_groups = [self.visible_sprites, self.enemy_sprites]
@@ -157,9 +285,10 @@ class Level:
             cls = _ENEMY_CLASSES.get(etype, Enemy)
             if cls == Centipede:
                 cls(pos, enemy_groups, self.obstacle_sprites, self.player,
-                    num_segments=7)
+                    num_segments=7, world=self.world)
             else:
-                cls(pos, enemy_groups, self.obstacle_sprites, self.player)
+                cls(pos, enemy_groups, self.obstacle_sprites, self.player,
+                    world=self.world)
 
         # --- Pickups ---
         pickup_groups = [self.visible_sprites, self.pickup_sprites]
@@ -169,13 +298,13 @@ class Level:
                 rune_info = _RUNE_MAP.get(ptype)
                 if rune_info:
                     rune_type, icon_fn = rune_info
-                    if self._existing_player and rune_type in self._existing_player.collected_runes:
+                    if rune_type in self.player.collected_runes:
                         continue
                     RunePickup(clear_pos, pickup_groups, rune_type, icon=icon_fn())
             elif ptype == 'health':
                 HealthPickup(clear_pos, pickup_groups, heal_amount=20)
             elif ptype == 'chainmail':
-                if self._existing_player and self._existing_player.has_chainmail:
+                if self.player.has_chainmail:
                     continue
                 ArmourPickup(clear_pos, pickup_groups)
 
@@ -183,27 +312,98 @@ class Level:
         for sp_cfg in cfg.get('spawners', []):
             CaveSpawner(
                 pos=(sp_cfg['pos_col'] * TILESIZE, sp_cfg['pos_row'] * TILESIZE),
-                groups=[self.visible_sprites],
+                groups=[self.visible_sprites, self.spawner_sprites],
                 obstacle_sprites=self.obstacle_sprites,
                 enemy_groups=[self.visible_sprites, self.enemy_sprites],
                 player=self.player,
                 spawn_interval=sp_cfg.get('interval', 4000),
                 max_alive=sp_cfg.get('max', 5),
+                world=self.world,
             )
 
-    def _find_clear_pos(self, pos, margin=20):
-        """Return pos or nearest clear position that doesn't overlap obstacles."""
-        test = pygame.Rect(0, 0, 32, 32)
-        test.center = pos
-        if not any(test.colliderect(s.hitbox) for s in self.obstacle_sprites):
-            return pos
-        for dist in range(TILESIZE, TILESIZE * 5, TILESIZE // 2):
-            for dx, dy in [(dist, 0), (-dist, 0), (0, dist), (0, -dist),
-                           (dist, dist), (-dist, dist), (dist, -dist), (-dist, -dist)]:
-                test.center = (pos[0] + dx, pos[1] + dy)
-                if not any(test.colliderect(s.hitbox) for s in self.obstacle_sprites):
-                    return (pos[0] + dx, pos[1] + dy)
-        return pos
+        # --- Hordes and bat swarms (see horde.py, swarm.py) ---
+        for horde_cfg in cfg.get('hordes', []):
+            horde = DemonHorde(self.player, self.world)
+            horde.spawn_in(horde_cfg.get('count', 0), horde_cfg.get('area'))
+            self.hordes.append(horde)
+        for swarm_cfg in cfg.get('swarms', []):
+            swarm = BatSwarm(self.player, self.world)
+            swarm.spawn_in(swarm_cfg.get('count', 0), swarm_cfg.get('area'))
+            self.hordes.append(swarm)
+        self.visible_sprites.hordes = self.hordes
+
+        # Load the chunks around the player and suspend far-away entities
+        self.world.update(self.visible_sprites.camera_rect(self.player))
+
+    def _build_tile_specs(self):
+        """Return (pos, sprite_type, image, visible, obstacle) for every map tile."""
+        layers = self.assets.layers
+        pool = self.assets.pool
+        specs = []
+        for style in ('boundary', 'rocks', 'grass', 'object'):
+            layer = layers[style]
+            rows, cols = np.nonzero(layer != EMPTY_CELL)
+            positions = list(zip((cols * TILESIZE).tolist(), (rows * TILESIZE).tolist()))
+            if style == 'boundary':
+                specs += [(pos, 'invisible', None, False, True) for pos in positions]
+            elif style == 'rocks':
+                images = pool.pick('rock', cols, rows)
+                specs += [(pos, 'rocks', img, True, False)
+                          for pos, img in zip(positions, images)]
+            elif style == 'grass':
+                images = pool.pick('grass', cols, rows)
+                specs += [(pos, 'grass', img, True, True)
+                          for pos, img in zip(positions, images)]
+            else:
+                # Columns (value 1) block movement; anything else is a stand
+                is_column = (layer[rows, cols] == 1)
+                images = [None] * len(positions)
+                for kind, mask in (('column', is_column), ('stand', ~is_column)):
+                    if mask.any():
+                        picked = pool.pick(kind, cols[mask], rows[mask])
+                        for i, img in zip(np.flatnonzero(mask).tolist(), picked):
+                            images[i] = img
+                for pos, img, column in zip(positions, images, is_column.tolist()):
+                    if column:
+                        specs.append((pos, 'sceneryObject', img, True, True))
+                    else:
+                        specs.append((pos, 'object', img, True, False))
+        return specs
+
+    def snapshot(self):
+        """Capture this level's initial state for an instant retry."""
+        return LevelSnapshot(self)
+
+    def _find_clear_pos(self, pos, radius=16):
+        """Return pos or the nearest position with *radius* px of room around it."""
+        return self.world.clearance.nearest_clear(pos, radius) or pos
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def _subscribe_events(self):
+        events = self.events
+        events.subscribe(ENEMY_SPAWNED, self._on_enemy_spawned)
+        events.subscribe(ENEMY_DIED, self._on_enemy_died)
+
+        # Sound triggers
+        for event, sound in ((ENEMY_DIED, 'enemy_death'),
+                             (PICKUP_COLLECTED, 'pickup'),
+                             (LEVEL_UP, 'level_up')):
+            events.subscribe(event, lambda sound=sound, **_: SoundManager.get().play(sound))
+
+        # HUD panel shows level, kills, armour and spells
+        for event in (ENEMY_DIED, PICKUP_COLLECTED, RUNE_COLLECTED, LEVEL_UP):
+            events.subscribe(event, self.hud.invalidate)
+
+    def _on_enemy_spawned(self, enemy):
+        self.enemies_alive += 1
+
+    def _on_enemy_died(self, enemy):
+        self.enemies_alive -= 1
+        self.level_kills += 1
+        self._check_objective()
 
     # ------------------------------------------------------------------
     # Objective checking
@@ -216,8 +416,7 @@ class Level:
         otype = obj.get('type', 'kill_all')
 
         if otype == 'kill_all':
-            alive = sum(1 for e in self.enemy_sprites if e.state != e.DYING)
-            if alive == 0 and self.level_kills > 0:
+            if self.enemies_alive == 0 and self.level_kills > 0:
                 self._complete_objective()
 
         elif otype == 'kill_count':
@@ -227,7 +426,7 @@ class Level:
     def _complete_objective(self):
         self.objective_complete = True
         SoundManager.get().play('portal')
-        portal_pos = self.config.get('portal_pos', (640, 360))
+        portal_pos = self._find_clear_pos(self.config.get('portal_pos', (640, 360)), radius=28)
         self.portal = Portal(portal_pos, [self.visible_sprites])
 
     def _check_portal(self):
@@ -243,48 +442,78 @@ class Level:
         if not self.current_attack:
             return
         snd = SoundManager.get()
+        attack = self.current_attack
+        # Rect overlap is the broadphase; the weapon's hit mask decides
+        precise = PRECISE_WEAPON_HITS
         for enemy in list(self.enemy_sprites):
             if enemy.state == enemy.DYING:
                 continue
-            if self.current_attack.rect.colliderect(enemy.hitbox):
+            if attack.rect.colliderect(enemy.hitbox):
+                if precise and not sprite_hit(attack.rect, attack.hit_mask, enemy):
+                    continue
+                weapon_dmg = weapon_data.get(self.player.weapon, {}).get('damage', 10)
+                enemy.take_hit(weapon_dmg)      # a kill emits enemy_died
+                if enemy.state != enemy.DYING:
+                    snd.play('enemy_hit')
+        for horde in self.hordes:
+            if precise:
+                hit = horde.mask_hits(attack.rect, attack.hit_mask)
+            else:
+                hit = horde.hits(attack.rect)
+            if len(hit):
                 weapon_dmg = weapon_data.get(self.player.weapon, {}).get('damage', 10)
-                old_hp = enemy.hp
-                enemy.take_hit(weapon_dmg)
-                if enemy.hp <= 0 and old_hp > 0:
-                    self.level_kills += 1
-                    snd.play('enemy_death')
-                else:
+                if horde.damage(hit, weapon_dmg) < len(hit):
                     snd.play('enemy_hit')
 
     def _check_magic_hits(self):
         snd = SoundManager.get()
         for spell in list(self.magic_sprites):
-            for enemy in list(self.enemy_sprites):
-                if enemy.state == enemy.DYING:
-                    continue
-                if id(enemy) in spell.hit_enemies:
+            # Sweep the hitbox over the spell's move this frame, so fast
+            # projectiles can't skip past an enemy between two frames
+            last = getattr(spell, 'last_center', spell.hitbox.center)
+            delta = (spell.hitbox.centerx - last[0], spell.hitbox.centery - last[1])
+            start = spell.hitbox.move(-delta[0], -delta[1])
+
+            hits = []       # (time of impact, enemy sprite or horde, horde index)
+            targets = [enemy for enemy in self.enemy_sprites
+                       if enemy.state != enemy.DYING and id(enemy) not in spell.hit_enemies]
+            for t, i, _ in sweep_rects(start, delta, [enemy.hitbox for enemy in targets]):
+                hits.append((t, targets[i], None))
+            for horde in self.hordes:
+                idx, times = horde.sweep(start, delta)
+                for i, t in zip(idx.tolist(), times.tolist()):
+                    if ('horde', id(horde), int(horde.uid[i])) not in spell.hit_enemies:
+                        hits.append((t, horde, i))
+            if not hits:
+                continue
+            hits.sort(key=lambda hit: hit[0])
+            if not spell.piercing:
+                hits = hits[:1]     # the first enemy along the path
+
+            spell_key = getattr(spell, 'spell_key', None)
+            dmg = magic_data.get(spell_key, {}).get('damage', 15) if spell_key else 15
+            horde_hits = {}
+            for _, target, i in hits:
+                if i is not None:
+                    horde_hits.setdefault(target, []).append(i)
                     continue
-                if spell.hitbox.colliderect(enemy.hitbox):
-                    spell_key = getattr(spell, 'spell_key', None)
-                    dmg = magic_data.get(spell_key, {}).get('damage', 15) if spell_key else 15
-                    old_hp = enemy.hp
-                    enemy.take_hit(dmg)
-                    if enemy.hp <= 0 and old_hp > 0:
-                        self.level_kills += 1
-                        snd.play('enemy_death')
-                    else:
-                        snd.play('enemy_hit')
-                    spell.hit_enemies.add(id(enemy))
-                    if not spell.piercing:
-                        spell.kill()
-                        break
+                target.take_hit(dmg)
+                if target.state != target.DYING:
+                    snd.play('enemy_hit')
+                spell.hit_enemies.add(id(target))
+            for horde, hit in horde_hits.items():
+                spell.hit_enemies.update(('horde', id(horde), int(horde.uid[i])) for i in hit)
+                if horde.damage(np.array(hit), dmg) < len(hit):
+                    snd.play('enemy_hit')
+            if not spell.piercing:
+                spell.kill()
 
     def _check_pickup_collisions(self):
         for pickup in list(self.pickup_sprites):
             if pickup.hitbox.colliderect(self.player.hitbox):
                 result = pickup.collect(self.player)
                 if result is not False:
-                    SoundManager.get().play('pickup')
+                    self.events.emit(PICKUP_COLLECTED, pickup=pickup, player=self.player)
 
     # ------------------------------------------------------------------
     # Run
@@ -292,12 +521,16 @@ class Level:
 
     def run(self):
         """Returns a string signal or None."""
+        self.world.update(self.visible_sprites.camera_rect(self.player))
         self.visible_sprites.custom_draw(self.player)
+        self.world.flow.update(self.player.hitbox.center)
+        self.enemy_index.invalidate()
         self.visible_sprites.update()
+        for horde in self.hordes:
+            horde.update()
         self._check_weapon_hits()
         self._check_magic_hits()
         self._check_pickup_collisions()
-        self._check_objective()
 
         if self._check_portal():
             return 'next_level'
@@ -309,6 +542,9 @@ class Level:
         offset = self.visible_sprites.offset
         for enemy in self.enemy_sprites:
             enemy.draw_notice_indicator(self.display_surface, offset)
+        for horde in self.hordes:
+            horde.draw_notice_indicators(self.display_surface, offset,
+                                         self.visible_sprites.view_rect)
 
         menu = self.player.circular_menu
         if menu.active:
@@ -369,28 +605,41 @@ class Level:
 
 
 class YSortCameraGroup(pygame.sprite.Group):
-    def __init__(self, floor_path=None, theme='meadow'):
+    def __init__(self):
         super().__init__()
         self.display_surface = pygame.display.get_surface()
         self.half_height = self.display_surface.get_height() // 2
         self.half_width = self.display_surface.get_width() // 2
         self.offset = pygame.math.Vector2(0, 0)
+        self.world = None  # set by Level once the World exists
+        self.hordes = []   # array hordes drawn y-sorted with the sprites
+        self.view_rect = pygame.Rect((0, 0), self.display_surface.get_size())
 
-        if floor_path:
-            self.floor_surf = pygame.image.load(floor_path).convert()
-        else:
-            self.floor_surf = make_floor_surface(theme, 20 * TILESIZE, 20 * TILESIZE)
-        self.floor_rect = self.floor_surf.get_rect(topleft=(0, 0))
-
-    def custom_draw(self, player):
-        self.offset.x = min(self.floor_rect.width,
+    def camera_rect(self, player):
+        """Update the camera offset for *player* and return the view rect."""
+        self.offset.x = min(self.world.width,
                             max(0, player.rect.centerx - self.half_width))
-        self.offset.y = min(self.floor_rect.height,
+        self.offset.y = min(self.world.height,
                             max(0, player.rect.centery - self.half_height))
+        self.view_rect = pygame.Rect((int(self.offset.x), int(self.offset.y)),
+                                     self.display_surface.get_size())
+        return self.view_rect
 
-        floor_offset = self.floor_rect.topleft - self.offset
-        self.display_surface.blit(self.floor_surf, floor_offset)
+    def custom_draw(self, player):
+        view = self.camera_rect(player)
+        self.world.draw_floor(self.display_surface, self.offset)
+
+        if not self.hordes:
+            for sprite in sorted(self.sprites(), key=lambda s: s.rect.centery):
+                offset_pos = sprite.rect.topleft - self.offset
+                self.display_surface.blit(sprite.image, offset_pos)
+            return
 
-        for sprite in sorted(self.sprites(), key=lambda s: s.rect.centery):
-            offset_pos = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_pos)
+        # Merge horde members into the y-sort
+        items = [(s.rect.centery, s.image, s.rect.topleft) for s in self.sprites()]
+        for horde in self.hordes:
+            items += horde.render_items(view)
+        items.sort(key=lambda item: item[0])
+        ox, oy = self.offset.x, self.offset.y
+        self.display_surface.blits([(image, (x - ox, y - oy)) for _, image, (x, y) in items],
+                                   doreturn=False)
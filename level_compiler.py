@@ -0,0 +1,171 @@
+"""Compile DemoBlade levels into a binary format loaded via memory map.
+
+A compiled level is one file holding the level_data entry and every tile
+layer as a typed int16 NumPy array, so loading a map needs no CSV text
+parsing.  Layers that point at the same CSV (``rocks`` reuses the
+``boundary`` sheet) are stored once.
+
+File layout (little endian):
+    b'DBLEVEL1'          magic
+    uint32               length of the JSON header
+    JSON header          {"version", "sources", "config",
+                          "layers": {name: {"offset", "shape"}}}
+    padding to 64 bytes
+    int16 layer data     row-major, each array 64-byte aligned
+
+Compiled files live in ``.cache/levels`` and are rebuilt automatically
+when a source CSV or the level_data entry changes.  Compile everything
+up front with ``python level_compiler.py``.
+"""
+
+import os
+import re
+import sys
+import json
+import struct
+
+import numpy as np
+
+from support import import_csv_layout
+
+LEVEL_FORMAT_VERSION = 1
+COMPILED_LEVEL_DIR = os.path.join('.cache', 'levels')
+EMPTY_CELL = -1
+
+_MAGIC = b'DBLEVEL1'
+_ALIGN = 64
+_LAYERS = ('boundary', 'rocks', 'grass', 'object')
+
+
+def _align(n):
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _compiled_path(level_config):
+    slug = re.sub(r'[^a-z0-9]+', '_', level_config.get('name', 'level').lower()).strip('_')
+    return os.path.join(COMPILED_LEVEL_DIR, f"{slug or 'level'}.dbl")
+
+
+def _config_json(level_config):
+    """The level_data entry as JSON (tuples become lists)."""
+    return json.loads(json.dumps(level_config))
+
+
+def _source_stamps(level_config):
+    """{csv_path: [size, mtime_ns]} for every source sheet."""
+    stamps = {}
+    for path in level_config['map_csv'].values():
+        st = os.stat(path)
+        stamps[path] = [st.st_size, st.st_mtime_ns]
+    return stamps
+
+
+# ======================================================================
+# Compiler
+# ======================================================================
+
+def _csv_to_array(path):
+    rows = import_csv_layout(path)
+    return np.array([[int(v) for v in row] for row in rows if row], dtype=np.int16)
+
+
+def compile_level(level_config, path=None):
+    """Compile one level_data entry; returns the output path."""
+    path = path or _compiled_path(level_config)
+    csv_paths = level_config['map_csv']
+
+    arrays = {}      # csv path -> array (shared sheets stored once)
+    for name in _LAYERS:
+        src = csv_paths[name]
+        if src not in arrays:
+            arrays[src] = _csv_to_array(src)
+
+    blob_offsets = {}
+    offset = 0
+    for src, arr in arrays.items():
+        blob_offsets[src] = offset
+        offset = _align(offset + arr.nbytes)
+
+    header = {
+        'version': LEVEL_FORMAT_VERSION,
+        'sources': _source_stamps(level_config),
+        'config': _config_json(level_config),
+        'layers': {name: {'offset': blob_offsets[csv_paths[name]],
+                          'shape': list(arrays[csv_paths[name]].shape)}
+                   for name in _LAYERS},
+    }
+    header_bytes = json.dumps(header, separators=(',', ':')).encode()
+    base = _align(len(_MAGIC) + 4 + len(header_bytes))
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes)
+        for src, arr in arrays.items():
+            f.seek(base + blob_offsets[src])
+            f.write(arr.astype('<i2').tobytes())
+        f.truncate(base + offset)
+    os.replace(tmp, path)
+    return path
+
+
+# ======================================================================
+# Loader
+# ======================================================================
+
+class CompiledLevel:
+    """Memory-mapped tile layers plus the level_data entry they came from.
+
+    layers : {name: read-only int16 array of shape (rows, cols)}
+    config : the level_data entry as stored at compile time (JSON types)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path}: not a compiled level")
+            (header_len,) = struct.unpack('<I', f.read(4))
+            self.header = json.loads(f.read(header_len).decode())
+        base = _align(len(_MAGIC) + 4 + header_len)
+        self.config = self.header['config']
+        self.layers = {}
+        for name, info in self.header['layers'].items():
+            self.layers[name] = np.memmap(path, dtype='<i2', mode='r',
+                                          offset=base + info['offset'],
+                                          shape=tuple(info['shape']))
+
+    @property
+    def shape(self):
+        """(rows, cols) of the map - the largest layer."""
+        return tuple(max(arr.shape[i] for arr in self.layers.values()) for i in (0, 1))
+
+    def is_stale(self, level_config):
+        return (self.header.get('version') != LEVEL_FORMAT_VERSION
+                or self.header.get('sources') != _source_stamps(level_config)
+                or self.config != _config_json(level_config))
+
+
+def load_level(level_config):
+    """Return the CompiledLevel for a level_data entry, (re)compiling if stale."""
+    path = _compiled_path(level_config)
+    if os.path.exists(path):
+        try:
+            level = CompiledLevel(path)
+            if not level.is_stale(level_config):
+                return level
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"Recompiling {path}: {e}")
+    compile_level(level_config, path)
+    return CompiledLevel(path)
+
+
+def main(argv=None):
+    from level_data import LEVELS
+    for cfg in LEVELS:
+        path = compile_level(cfg)
+        print(f"{cfg.get('name', '?'):<20} -> {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
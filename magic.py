@@ -1,15 +1,16 @@
 import pygame
 import math
 import random
+from assets import LazyAsset, LazyEntry, load_asset
 
 
 # ======================================================================
 # Spell data  (cooldown = how long the player is locked after casting)
 # ======================================================================
 magic_data = {
-    'fire_cone':    {'cooldown': 400, 'damage': 15, 'mp_cost': 2},
-    'ice_ball':     {'cooldown': 300, 'damage': 20, 'mp_cost': 4},
-    'shadow_blade': {'cooldown': 350, 'damage': 25, 'mp_cost': 5},
+    'fire_cone':    LazyEntry(cooldown=400, damage=15, mp_cost=2),
+    'ice_ball':     LazyEntry(cooldown=300, damage=20, mp_cost=4),
+    'shadow_blade': LazyEntry(cooldown=350, damage=25, mp_cost=5),
 }
 
 
@@ -134,12 +135,14 @@ class IceBall(pygame.sprite.Sprite):
         self.rect = self.image.get_rect(center=origin)
         self.hitbox = pygame.Rect(0, 0, 16, 16)
         self.hitbox.center = self.rect.center
+        self.last_center = self.hitbox.center   # swept hit checks (Level)
 
     def update(self):
         self.age += 1
         if self.age >= self.lifetime:
             self.kill()
             return
+        self.last_center = self.hitbox.center
 
         self.pos += self.velocity * self.speed
         self.rect.center = (int(self.pos.x), int(self.pos.y))
@@ -161,15 +164,16 @@ class ShadowBlade(pygame.sprite.Sprite):
     the blade oscillates perpendicular to its travel vector, creating a
     serpentine flight path."""
 
-    def __init__(self, player, groups, enemy_sprites):
+    def __init__(self, player, groups, enemies):
         super().__init__(groups)
         self.spell_key = 'shadow_blade'
-        self.enemy_sprites = enemy_sprites
+        self.enemies = enemies      # targeting.EnemyIndex
         dstr = player.status.split('_')[0]
         self.velocity = pygame.math.Vector2(_DIR_VEC.get(dstr, (0, 1)))
         self.speed = 8
         self.homing = 0.12
         self.detect_range = 250
+        self.retarget_every = 8     # frames between nearest-enemy queries
         self.lifetime = 75          # 1.25 s at 60 fps
         self.age = 0
         self.hit_enemies = set()
@@ -197,41 +201,36 @@ class ShadowBlade(pygame.sprite.Sprite):
         self.rect = self.image.get_rect(center=origin)
         self.hitbox = pygame.Rect(0, 0, 20, 20)
         self.hitbox.center = self.rect.center
+        self.last_center = self.hitbox.center   # swept hit checks (Level)
 
     def _closest_enemy(self, origin):
-        best, best_d = None, self.detect_range
-        for e in self.enemy_sprites:
-            if hasattr(e, 'state') and e.state == 4:   # DYING
-                continue
-            d = pygame.math.Vector2(
-                e.rect.centerx - origin[0],
-                e.rect.centery - origin[1],
-            ).length()
-            if d < best_d:
-                best_d = d
-                best = e
-        return best
+        found = self.enemies.nearest(origin, 1, self.detect_range)
+        return found[0] if found else None
 
     def update(self):
         self.age += 1
         if self.age >= self.lifetime:
             self.kill()
             return
+        self.last_center = self.hitbox.center
+
+        # --- (re)acquire the nearest living enemy every few frames ---
+        if self.target is not None and (not self.target.alive()
+                                        or self.target.state == self.target.DYING):
+            self.target = None
+        if self.age % self.retarget_every == 0:
+            self.target = self._closest_enemy(self.base_pos)
 
         # --- homing steering ---
-        if self.target and self.target.alive():
-            if hasattr(self.target, 'state') and self.target.state == 4:
-                self.target = None
-            else:
-                to = pygame.math.Vector2(
-                    self.target.rect.centerx - self.base_pos.x,
-                    self.target.rect.centery - self.base_pos.y,
-                )
-                if to.length() > 0:
-                    desired = to.normalize()
-                    self.velocity += (desired - self.velocity) * self.homing
-                    if self.velocity.length() > 0:
-                        self.velocity = self.velocity.normalize()
+        if self.target is not None:
+            center = self.target.hitbox.center
+            to = pygame.math.Vector2(center[0] - self.base_pos.x,
+                                     center[1] - self.base_pos.y)
+            if to.length() > 0:
+                desired = to.normalize()
+                self.velocity += (desired - self.velocity) * self.homing
+                if self.velocity.length() > 0:
+                    self.velocity = self.velocity.normalize()
 
         # --- advance along homing path ---
         self.base_pos += self.velocity * self.speed
@@ -339,7 +338,8 @@ def _make_shadow_icon(s=32):
     return surf
 
 
-# Attach icons to magic_data so player.py can reference them
-magic_data['fire_cone']['icon']    = _make_fire_icon()
-magic_data['ice_ball']['icon']     = _make_ice_icon()
-magic_data['shadow_blade']['icon'] = _make_shadow_icon()
+# Attach icons to magic_data so player.py can reference them.
+# They are built on first access rather than at import time.
+magic_data['fire_cone']['icon']    = LazyAsset(load_asset, 'icons', _make_fire_icon, static=True)
+magic_data['ice_ball']['icon']     = LazyAsset(load_asset, 'icons', _make_ice_icon, static=True)
+magic_data['shadow_blade']['icon'] = LazyAsset(load_asset, 'icons', _make_shadow_icon, static=True)
@@ -1,7 +1,11 @@
+from profiling import timeline
 import pygame, sys
 from data import *
 from game_state import GameState
 from sounds import SoundManager
+from asset_cache import asset_cache
+
+timeline.mark('imports')
 
 class Game:
     def __init__(self):
@@ -9,9 +13,12 @@ class Game:
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption(CAPTION)
         self.clock = pygame.time.Clock()
+        timeline.mark('display')
 
-        # Initialize sounds
+        # Initialize sounds (effects are synthesised on a background thread;
+        # play() skips any that aren't ready yet)
         SoundManager.get().init()
+        timeline.mark('sounds')
 
         self.game_state = GameState()
 
@@ -19,12 +26,16 @@ class Game:
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    asset_cache.save()
                     pygame.quit()
                     sys.exit()
 
             self.screen.fill('dark green')
             self.game_state.update()
+            SoundManager.get().update()
             pygame.display.update()
+            if not timeline.finished:
+                timeline.finish('first_frame')
             self.clock.tick(FPS)
 
 if __name__ == '__main__':
@@ -0,0 +1,307 @@
+"""Streaming chiptune music engine for DemoBlade.
+
+Songs are note sequences for three NES-style voices (square melody,
+triangle bass, noise percussion).  A ChiptuneStream renders a song in
+small chunks on demand with continuous phase across chunk boundaries, and
+MusicPlayer feeds those chunks to a reserved mixer channel through
+Channel.queue().  Memory use is a couple of chunks regardless of track
+length, so every level theme can have its own song at no startup cost.
+"""
+
+import pygame
+import numpy as np
+from collections import deque
+
+
+# ======================================================================
+# Notes & songs
+# ======================================================================
+
+_SEMITONES = {'C': -9, 'D': -7, 'E': -5, 'F': -4, 'G': -2, 'A': 0, 'B': 2}
+
+
+def note(name):
+    """Return the frequency of a note name like 'A4', 'F#3' or 'Bb2' ('-' = rest)."""
+    if name == '-':
+        return 0.0
+    semis = _SEMITONES[name[0]]
+    rest = name[1:]
+    if rest[0] == '#':
+        semis += 1
+        rest = rest[1:]
+    elif rest[0] == 'b':
+        semis -= 1
+        rest = rest[1:]
+    octave = int(rest)
+    return 440.0 * 2.0 ** ((semis + (octave - 4) * 12) / 12.0)
+
+
+def _seq(pairs):
+    """Convert [('G4', 1), ...] into [(freq, beats), ...]."""
+    return [(note(n), beats) for n, beats in pairs]
+
+
+class Song:
+    """A looping three-voice chiptune arrangement.
+
+    melody / bass : lists of (frequency_hz, beats); 0 Hz is a rest.
+    perc_every    : beats between noise hits (0 disables percussion).
+    """
+
+    def __init__(self, name, bpm, melody, bass, perc_every=1.0,
+                 melody_volume=0.15, bass_volume=0.12, perc_volume=0.08,
+                 duty=0.5):
+        self.name = name
+        self.bpm = bpm
+        self.melody = melody
+        self.bass = bass
+        self.perc_every = perc_every
+        self.melody_volume = melody_volume
+        self.bass_volume = bass_volume
+        self.perc_volume = perc_volume
+        self.duty = duty
+
+    @property
+    def loop_beats(self):
+        """Length of one full loop (longest voice) in beats."""
+        return max(sum(b for _, b in self.melody), sum(b for _, b in self.bass))
+
+
+OVERWORLD = Song(
+    'overworld', bpm=120,
+    melody=_seq([
+        ('G4', 1), ('A4', 1), ('B4', 1), ('C5', 1),
+        ('B4', 1), ('A4', 0.5), ('G4', 0.5), ('A4', 2),
+        ('C5', 1), ('D5', 1), ('C5', 1), ('B4', 1),
+        ('A4', 1), ('G4', 0.5), ('F4', 0.5), ('G4', 2),
+    ]),
+    bass=_seq([
+        ('G3', 2), ('A3', 2), ('B3', 2), ('A3', 2),
+        ('C4', 2), ('D4', 2), ('A3', 2), ('G3', 2),
+    ]),
+)
+
+DARK_WOODS = Song(
+    'darkwoods', bpm=96, duty=0.25,
+    melody=_seq([
+        ('E4', 1.5), ('G4', 0.5), ('A4', 1), ('B4', 1),
+        ('A4', 1), ('G4', 1), ('E4', 2),
+        ('D4', 1), ('E4', 1), ('G4', 1), ('F#4', 1),
+        ('E4', 1), ('-', 1), ('B3', 2),
+        ('E4', 1.5), ('G4', 0.5), ('B4', 1), ('C5', 1),
+        ('B4', 1), ('A4', 1), ('G4', 2),
+        ('A4', 1), ('G4', 1), ('F#4', 1), ('D4', 1),
+        ('E4', 4),
+    ]),
+    bass=_seq([
+        ('E2', 4), ('C3', 4), ('D3', 4), ('B2', 4),
+        ('E2', 4), ('C3', 4), ('D3', 4), ('E2', 4),
+    ]),
+    perc_every=2.0, melody_volume=0.13,
+)
+
+SWARM = Song(
+    'swarm', bpm=150, duty=0.125,
+    melody=_seq([
+        ('A4', 0.5), ('C5', 0.5), ('E5', 0.5), ('C5', 0.5),
+        ('D5', 0.5), ('F5', 0.5), ('E5', 1),
+        ('A4', 0.5), ('C5', 0.5), ('E5', 0.5), ('G5', 0.5),
+        ('F5', 0.5), ('E5', 0.5), ('D5', 1),
+        ('C5', 0.5), ('D5', 0.5), ('E5', 0.5), ('A5', 0.5),
+        ('G5', 0.5), ('E5', 0.5), ('C5', 1),
+        ('B4', 0.5), ('C5', 0.5), ('D5', 0.5), ('B4', 0.5),
+        ('A4', 2),
+    ]),
+    bass=_seq([
+        ('A2', 0.5), ('A3', 0.5), ('A2', 0.5), ('A3', 0.5),
+        ('F2', 0.5), ('F3', 0.5), ('F2', 0.5), ('F3', 0.5),
+        ('C3', 0.5), ('C4', 0.5), ('C3', 0.5), ('C4', 0.5),
+        ('G2', 0.5), ('G3', 0.5), ('G2', 0.5), ('G3', 0.5),
+    ]),
+    perc_every=0.5, perc_volume=0.07,
+)
+
+DEMONS_GATE = Song(
+    'demonsgate', bpm=138,
+    melody=_seq([
+        ('D4', 1), ('-', 0.5), ('D4', 0.5), ('F4', 1), ('G#4', 1),
+        ('A4', 2), ('G4', 1), ('F4', 1),
+        ('D4', 1), ('-', 0.5), ('D4', 0.5), ('F4', 1), ('A4', 1),
+        ('C5', 1), ('Bb4', 1), ('A4', 2),
+        ('D5', 1), ('C5', 1), ('Bb4', 1), ('A4', 1),
+        ('G4', 1), ('F4', 1), ('E4', 2),
+        ('D4', 1), ('F4', 1), ('E4', 1), ('C#4', 1),
+        ('D4', 4),
+    ]),
+    bass=_seq([
+        ('D2', 1), ('D2', 1), ('D3', 1), ('D2', 1),
+        ('Bb1', 1), ('Bb1', 1), ('Bb2', 1), ('Bb1', 1),
+        ('C2', 1), ('C2', 1), ('C3', 1), ('C2', 1),
+        ('A1', 1), ('A1', 1), ('A2', 1), ('C#2', 1),
+    ]),
+    perc_every=1.0, perc_volume=0.1,
+)
+
+# Theme -> song.  Unknown themes fall back to the overworld tune.
+SONGS = {
+    'overworld': OVERWORLD,
+    'meadow': OVERWORLD,
+    'darkwoods': DARK_WOODS,
+    'swarm': SWARM,
+    'demonsgate': DEMONS_GATE,
+}
+
+
+def song_for_theme(theme):
+    return SONGS.get(theme, OVERWORLD)
+
+
+# ======================================================================
+# Chunked synthesis
+# ======================================================================
+
+class _Voice:
+    """One looping note sequence with its own phase and position."""
+
+    def __init__(self, notes, kind, volume, samples_per_beat, sample_rate,
+                 attack, release, duty=0.5, gate=None):
+        self.kind = kind
+        self.volume = volume
+        self.duty = duty
+        self.sample_rate = sample_rate
+        self.attack_n = max(1, int(attack * sample_rate))
+        self.release_n = max(1, int(release * sample_rate))
+        self.gate_n = int(gate * sample_rate) if gate else None
+        # Pre-compute note lengths in samples so loops stay sample-exact
+        self.notes = [(freq, max(1, int(round(beats * samples_per_beat))))
+                      for freq, beats in notes]
+        self.index = 0
+        self.pos = 0          # samples already played of the current note
+        self.phase = 0.0      # oscillator phase in cycles (0..1)
+
+    def render_into(self, out, rng):
+        n = len(out)
+        i = 0
+        while i < n:
+            freq, note_len = self.notes[self.index]
+            take = min(n - i, note_len - self.pos)
+
+            # Gated voices (percussion) only sound for the start of each note
+            sounding = note_len if self.gate_n is None else min(note_len, self.gate_n)
+            audible = min(take, max(0, sounding - self.pos))
+            if audible and (freq > 0 or self.kind == 'noise'):
+                k = np.arange(self.pos, self.pos + audible)
+                wave = self._oscillate(freq, audible, rng)
+                env = np.minimum(1.0, (k + 1) / self.attack_n)
+                env = np.minimum(env, np.clip((sounding - k) / self.release_n, 0.0, 1.0))
+                out[i:i + audible] += wave * env * self.volume
+
+            self.pos += take
+            i += take
+            if self.pos >= note_len:
+                self.pos = 0
+                self.index = (self.index + 1) % len(self.notes)
+                if self.kind == 'square':
+                    self.phase = 0.0  # restart each note like the old renderer
+
+    def _oscillate(self, freq, count, rng):
+        if self.kind == 'noise':
+            return rng.uniform(-1.0, 1.0, count)
+        step = freq / self.sample_rate
+        phase = (self.phase + step * np.arange(count)) % 1.0
+        self.phase = (self.phase + step * count) % 1.0
+        if self.kind == 'square':
+            return np.where(phase < self.duty, 1.0, -1.0)
+        # triangle
+        return 2.0 * np.abs(2.0 * phase - 1.0) - 1.0
+
+
+class ChiptuneStream:
+    """Renders a Song as an endless stream of int16 chunks."""
+
+    def __init__(self, song, sample_rate=22050, chunk_seconds=0.5, seed=None):
+        self.song = song
+        self.sample_rate = sample_rate
+        self.chunk_samples = int(sample_rate * chunk_seconds)
+        self._rng = np.random.default_rng(seed)
+
+        spb = 60.0 / song.bpm * sample_rate
+        self._voices = [
+            _Voice(song.melody, 'square', song.melody_volume, spb, sample_rate,
+                   attack=0.01, release=0.03, duty=song.duty),
+            _Voice(song.bass, 'triangle', song.bass_volume, spb, sample_rate,
+                   attack=0.02, release=0.05),
+        ]
+        if song.perc_every:
+            self._voices.append(
+                _Voice([(0.0, song.perc_every)], 'noise', song.perc_volume, spb,
+                       sample_rate, attack=0.002, release=0.015, gate=0.04))
+        self._mix = np.zeros(self.chunk_samples, dtype=np.float64)
+
+    def render(self, count=None):
+        """Return the next *count* samples (default: one chunk) as int16."""
+        if count is None or count == self.chunk_samples:
+            mix = self._mix
+            mix.fill(0.0)
+        else:
+            mix = np.zeros(count, dtype=np.float64)
+        for voice in self._voices:
+            voice.render_into(mix, self._rng)
+        np.clip(mix, -1.0, 1.0, out=mix)
+        return (mix * 32767).astype(np.int16)
+
+    def next_sound(self):
+        return pygame.mixer.Sound(buffer=self.render())
+
+
+# ======================================================================
+# Mixer channel feeder
+# ======================================================================
+
+class MusicPlayer:
+    """Keeps a reserved mixer channel fed with freshly rendered chunks.
+
+    Call pump() once per frame.  At most two chunks (the playing one and
+    the queued one) are alive at any time.
+    """
+
+    def __init__(self, channel, sample_rate=22050, chunk_seconds=0.5, volume=1.0):
+        self.channel = channel
+        self.sample_rate = sample_rate
+        self.chunk_seconds = chunk_seconds
+        self.channel.set_volume(volume)
+        self.stream = None
+        self.song = None
+        self._live = deque(maxlen=3)   # keep chunk Sounds referenced while queued
+
+    @property
+    def playing(self):
+        return self.stream is not None
+
+    def play(self, song):
+        """Start *song* from the top (no-op if it is already playing)."""
+        if self.song is song and self.playing:
+            return
+        self.stop()
+        self.song = song
+        self.stream = ChiptuneStream(song, self.sample_rate, self.chunk_seconds)
+        self.pump()
+
+    def stop(self):
+        self.stream = None
+        self.song = None
+        self.channel.stop()
+        self._live.clear()
+
+    def pump(self):
+        if self.stream is None:
+            return
+        if not self.channel.get_busy():
+            self._feed(self.channel.play)
+        if self.channel.get_queue() is None:
+            self._feed(self.channel.queue)
+
+    def _feed(self, submit):
+        sound = self.stream.next_sound()
+        self._live.append(sound)
+        submit(sound)
@@ -5,12 +5,17 @@ from support import *
 from dual_ring_menu import DualRingMenu
 from magic import magic_data
 from sounds import SoundManager
+from events import emit_from, RUNE_COLLECTED, LEVEL_UP
 from player_sprite import build_player_animations, build_player_icon
 from weapon_sprites import make_weapon_icon
+from assets import LazyAsset, LazyEntry, load_asset
+from world import world_bounds
+from sweep import slide
 
+# Icons are built on first access (see assets.LazyEntry)
 weapon_data = {
-    'sword': { 'cooldown':100, 'damage':10, 'graphic': make_weapon_icon('sword') },
-    'spear': { 'cooldown':120, 'damage':10, 'graphic': make_weapon_icon('spear') },
+    'sword': LazyEntry(cooldown=100, damage=10, graphic=LazyAsset(load_asset, 'icons', make_weapon_icon, 'sword', static=True)),
+    'spear': LazyEntry(cooldown=120, damage=10, graphic=LazyAsset(load_asset, 'icons', make_weapon_icon, 'spear', static=True)),
 }
 
 
@@ -33,7 +38,7 @@ class Player(pygame.sprite.Sprite):
     def __init__(self, pos, groups, obstacle_sprites,
                  create_attack, destroy_weapon, create_magic):
         super().__init__(groups)
-        self.image = build_player_icon()
+        self.image = load_asset('icons', build_player_icon)
         self.rect = self.image.get_rect(topleft=pos)
         self.hitbox = self.rect.inflate(0,-14) # allow 8px overlap on vertical
 
@@ -51,6 +56,7 @@ class Player(pygame.sprite.Sprite):
         self.attack_time = None
 
         self.obstacle_sprites = obstacle_sprites
+        self.world = None  # World of the current level (bounds); set by Level
 
         self.create_attack = create_attack
         self.destroy_weapon = destroy_weapon
@@ -119,7 +125,7 @@ class Player(pygame.sprite.Sprite):
             print(f"Gamepad detected: {self.joystick.get_name()}")
 
     def import_player_assets(self):
-        self.animations = build_player_animations()
+        self.animations = load_asset('creatures', build_player_animations)
 
     def get_status(self):
 
@@ -388,10 +394,34 @@ class Player(pygame.sprite.Sprite):
             ):
                 self.magic = rune_type
         print(f"Collected rune: {rune_type}!")
+        emit_from(self, RUNE_COLLECTED, rune_type=rune_type, player=self)
+
+    # ------------------------------------------------------------------
+    # Progress snapshot (level retry)
+    # ------------------------------------------------------------------
+
+    _PROGRESS_FIELDS = ('level', 'xp', 'xp_to_next', 'max_hp', 'hp', 'max_mp', 'mp',
+                        'kills', 'armour', 'has_chainmail', 'weapon', 'weapon_index',
+                        'magic')
+
+    def progress(self):
+        """Return a plain-data copy of everything carried between levels."""
+        state = {name: getattr(self, name) for name in self._PROGRESS_FIELDS}
+        state['kill_counts'] = dict(self.kill_counts)
+        state['collected_runes'] = sorted(self.collected_runes)
+        return state
+
+    def restore_progress(self, state):
+        """Apply a progress() snapshot to a freshly created player."""
+        for rune_type in state['collected_runes']:
+            self.collect_rune(rune_type)
+        for name in self._PROGRESS_FIELDS:
+            setattr(self, name, state[name])
+        self.kill_counts = dict(state['kill_counts'])
+        self.circular_menu.sync_selection(self.weapon, self.magic)
 
     def _level_up(self):
         """Increase level, boost max HP and MP."""
-        SoundManager.get().play('level_up')
         self.xp -= self.xp_to_next
         self.level += 1
         self.xp_to_next = int(self.xp_to_next * 1.5)
@@ -403,6 +433,7 @@ class Player(pygame.sprite.Sprite):
         self.max_mp += mp_gain
         self.mp = self.max_mp  # full MP restore on level up
         print(f"LEVEL UP! Now level {self.level} (HP:{self.max_hp} MP:{self.max_mp})")
+        emit_from(self, LEVEL_UP, player=self, level=self.level)
 
     def _regen_mp(self, dt):
         """Regenerate MP over time."""
@@ -425,14 +456,14 @@ class Player(pygame.sprite.Sprite):
         """Apply knockback movement and tick invulnerability."""
         if self.knockback_timer > 0:
             self.knockback_timer -= 1
-            # Move in small steps to prevent clipping through walls
-            steps = max(1, int(self.knockback_speed / 4))
-            step_size = self.knockback_speed / steps
-            for _ in range(steps):
-                self.hitbox.x += self.knockback_dir.x * step_size
-                self.collision('horizontal')
-                self.hitbox.y += self.knockback_dir.y * step_size
-                self.collision('vertical')
+            # One swept move per frame: stops at the first wall it would
+            # reach (no tunnelling) and slides along it
+            delta = self.knockback_dir * self.knockback_speed
+            if self.world is not None:
+                self.hitbox = self.world.slide(self.hitbox, delta)
+            else:
+                self.hitbox = slide(self.hitbox, delta,
+                                    [sprite.hitbox for sprite in self.obstacle_sprites])
             self.rect.center = self.hitbox.center
         if self.knockback_invuln > 0:
             self.knockback_invuln -= 1
@@ -440,9 +471,7 @@ class Player(pygame.sprite.Sprite):
     def _clamp_to_world(self):
         """Ensure player is always within the playable area. Runs every frame."""
         margin = TILESIZE + 4
-        world = pygame.Rect(margin, margin,
-                            20 * TILESIZE - 2 * margin,
-                            20 * TILESIZE - 2 * margin)
+        world = world_bounds(self.world, margin)
         clamped = False
         if self.hitbox.left < world.left:
             self.hitbox.left = world.left
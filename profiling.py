@@ -0,0 +1,49 @@
+"""Startup timeline for DemoBlade.
+
+Records wall-clock marks from process start through the first rendered
+frame so regressions in time-to-title are easy to spot.  Enable the
+printed report with ``python main.py --profile-startup`` or by setting
+``DEMOBLADE_PROFILE_STARTUP=1``.
+"""
+
+import os
+import sys
+import time
+
+
+class StartupTimeline:
+    """Ordered list of (label, seconds since origin) marks."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.marks = []
+        self.enabled = ('--profile-startup' in sys.argv
+                        or bool(os.environ.get('DEMOBLADE_PROFILE_STARTUP')))
+        self.finished = False
+
+    def mark(self, label):
+        """Record *label* at the current time (first mark per label wins)."""
+        if any(lbl == label for lbl, _ in self.marks):
+            return
+        self.marks.append((label, time.perf_counter() - self.origin))
+
+    def report(self):
+        """Return the timeline as a printable table."""
+        lines = ["Startup timeline:"]
+        prev = 0.0
+        for label, t in self.marks:
+            lines.append(f"  {label:<14} {t * 1000:8.1f} ms  (+{(t - prev) * 1000:7.1f} ms)")
+            prev = t
+        return '\n'.join(lines)
+
+    def finish(self, label='first_frame'):
+        """Mark the final stage and print the report once, if enabled."""
+        self.mark(label)
+        if not self.finished:
+            self.finished = True
+            if self.enabled:
+                print(self.report())
+
+
+# Shared instance – import this first so the origin is close to process start
+timeline = StartupTimeline()
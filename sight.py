@@ -0,0 +1,130 @@
+"""Line of sight over the tile collision grid.
+
+Enemies only notice the player when no blocked tile (World.solid: walls,
+bushes, columns) lies on the line between their tiles.  A line is the
+DDA walk from one tile centre to the other: one cell per step along the
+major axis, the rounded cell on the minor one, and both cells where the
+line passes exactly between two, so a line and its reverse always cover
+the same cells.  The two end tiles themselves never block.
+
+Answers are cheap in two ways:
+
+  - on small maps (at most SIGHT_TABLE_CELLS tiles) a table of every
+    tile's view of the tiles within SIGHT_TABLE_RADIUS is built up
+    front, one whole-array pass per offset, and looked up in O(1),
+  - any other pair is traced once per frame and memoised by
+    (tile, tile), so a pack of enemies sharing a tile or two costs a
+    couple of traces however many ask.
+
+    visible(a, b)              True if the tiles of *a* and *b* see each other
+    visible_from(points, b)    the same for a (k, 2) array of points, vectorised
+
+World.update() starts each frame's memo via begin_frame().
+"""
+
+import functools
+import math
+
+import numpy as np
+
+from data import TILESIZE
+
+SIGHT_TABLE_RADIUS = 6       # tiles; beyond every detection range (<= 360 px)
+SIGHT_TABLE_CELLS = 128 * 128
+
+
+@functools.lru_cache(maxsize=None)
+def _line_offsets(dr, dc):
+    """(row, col) offsets of the tiles strictly between (0, 0) and (dr, dc)."""
+    steps = max(abs(dr), abs(dc))
+    cells = set()
+    for s in range(1, steps):
+        r, c = dr * s / steps, dc * s / steps
+        for row in {math.floor(r + 0.5), math.ceil(r - 0.5)}:
+            for col in {math.floor(c + 0.5), math.ceil(c - 0.5)}:
+                cells.add((row, col))
+    cells.discard((0, 0))
+    cells.discard((dr, dc))
+    return tuple(sorted(cells))
+
+
+class LineOfSight:
+    """Tile-grid visibility queries (see module docstring)."""
+
+    def __init__(self, solid, radius=SIGHT_TABLE_RADIUS, table_cells=SIGHT_TABLE_CELLS):
+        self.solid = solid
+        self.radius = radius
+        self._memo = {}
+        self.table = None           # (rows, cols, 2r + 1, 2r + 1) on small maps
+        if solid.size <= table_cells:
+            self._build_table()
+
+    def _build_table(self):
+        rows, cols = self.solid.shape
+        r = self.radius
+        # Out-of-map cells block, so the padded grid covers every offset
+        padded = np.pad(self.solid, r, constant_values=True)
+        self.table = np.ones((rows, cols, 2 * r + 1, 2 * r + 1), dtype=bool)
+        for dr in range(-r, r + 1):
+            for dc in range(-r, r + 1):
+                seen = self.table[:, :, dr + r, dc + r]
+                for orow, ocol in _line_offsets(dr, dc):
+                    seen &= ~padded[r + orow:r + orow + rows, r + ocol:r + ocol + cols]
+
+    def begin_frame(self):
+        """Drop last frame's traced lines."""
+        self._memo.clear()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _tile(self, pos):
+        rows, cols = self.solid.shape
+        return (min(rows - 1, max(0, int(pos[1]) // TILESIZE)),
+                min(cols - 1, max(0, int(pos[0]) // TILESIZE)))
+
+    def _trace(self, a, b):
+        """Visibility between tiles *a* and *b*, from the table or memoised."""
+        dr, dc = b[0] - a[0], b[1] - a[1]
+        r = self.radius
+        if self.table is not None and abs(dr) <= r and abs(dc) <= r:
+            return bool(self.table[a[0], a[1], dr + r, dc + r])
+        key = (a, b) if a <= b else (b, a)
+        seen = self._memo.get(key)
+        if seen is None:
+            rows, cols = self.solid.shape
+            seen = True
+            for orow, ocol in _line_offsets(dr, dc):
+                row, col = a[0] + orow, a[1] + ocol
+                if not (0 <= row < rows and 0 <= col < cols) or self.solid[row, col]:
+                    seen = False
+                    break
+            self._memo[key] = seen
+        return seen
+
+    def visible(self, a, b):
+        """True if nothing blocks the line between the tiles of points *a* and *b*."""
+        return self._trace(self._tile(a), self._tile(b))
+
+    def visible_from(self, points, b):
+        """visible() from each row of (k, 2) *points* to *b*, as a bool array."""
+        rows, cols = self.solid.shape
+        tr = np.clip(points[:, 1] // TILESIZE, 0, rows - 1).astype(np.intp)
+        tc = np.clip(points[:, 0] // TILESIZE, 0, cols - 1).astype(np.intp)
+        br, bc = self._tile(b)
+        dr, dc = br - tr, bc - tc
+        seen = np.zeros(len(points), dtype=bool)
+        r = self.radius
+        near = np.zeros(len(points), dtype=bool)
+        if self.table is not None:
+            near = (np.abs(dr) <= r) & (np.abs(dc) <= r)
+            seen[near] = self.table[tr[near], tc[near], dr[near] + r, dc[near] + r]
+        far = np.flatnonzero(~near)
+        if len(far):
+            tiles, inverse = np.unique(np.stack([tr[far], tc[far]], axis=1),
+                                       axis=0, return_inverse=True)
+            answers = np.array([self._trace((int(row), int(col)), (br, bc))
+                                for row, col in tiles], dtype=bool)
+            seen[far] = answers[inverse.reshape(-1)]
+        return seen
@@ -2,11 +2,21 @@
 
 All sounds are generated at runtime using numpy — no external audio files.
 Uses simple waveforms (square, triangle, noise) reminiscent of 8-bit consoles.
+
+Effect synthesis runs on a background thread started by SoundManager.init().
+The resulting int16 PCM is cached under .cache/sounds/ so later launches only
+memory-map the raw samples instead of regenerating them.  Background music
+is streamed chunk by chunk (music.py) on a reserved mixer channel.
 """
 
 import pygame
 import numpy as np
 import math
+import os
+import inspect
+import hashlib
+import threading
+from music import ChiptuneStream, MusicPlayer, song_for_theme
 
 # Initialize mixer early with specific settings for chiptune
 pygame.mixer.pre_init(frequency=22050, size=-16, channels=1, buffer=512)
@@ -156,67 +166,138 @@ def make_menu_select():
 
 
 # ======================================================================
-# Background music generator (simple looping chiptune)
+# Background music (see music.py for the streaming engine)
 # ======================================================================
 
-def make_bgm():
-    """Generate a short loopable chiptune BGM track.
+def make_bgm(theme='overworld'):
+    """Render one full loop of a theme's song into a single Sound.
 
-    Simple melody + bass + percussion in the style of 8-bit RPG overworld.
+    Gameplay streams music through MusicPlayer instead; this is kept for
+    tools and benchmarks that want the whole track at once.
     """
-    bpm = 120
-    beat = 60.0 / bpm  # seconds per beat
-
-    # Melody (square wave, higher octave)
-    melody_notes = [
-        (392, 1), (440, 1), (494, 1), (523, 1),    # G4 A4 B4 C5
-        (494, 1), (440, 0.5), (392, 0.5), (440, 2), # B4 A4 G4 A4
-        (523, 1), (587, 1), (523, 1), (494, 1),     # C5 D5 C5 B4
-        (440, 1), (392, 0.5), (349, 0.5), (392, 2), # A4 G4 F4 G4
-    ]
-
-    # Bass (triangle wave, lower octave)
-    bass_notes = [
-        (196, 2), (220, 2),   # G3 A3
-        (247, 2), (220, 2),   # B3 A3
-        (262, 2), (294, 2),   # C4 D4
-        (220, 2), (196, 2),   # A3 G3
-    ]
-
-    # Build melody
-    melody = []
-    for freq, beats in melody_notes:
-        dur = beat * beats
-        wave = _square_wave(freq, dur, 0.5, 0.15)
-        melody.append(_envelope(wave, attack=0.01, release=0.03))
-    melody = np.concatenate(melody)
-
-    # Build bass
-    bass = []
-    for freq, beats in bass_notes:
-        dur = beat * beats
-        wave = _triangle_wave(freq, dur, 0.12)
-        bass.append(_envelope(wave, attack=0.02, release=0.05))
-    bass = np.concatenate(bass)
-
-    # Make same length
-    max_len = max(len(melody), len(bass))
-    if len(melody) < max_len:
-        melody = np.pad(melody, (0, max_len - len(melody)))
-    if len(bass) < max_len:
-        bass = np.pad(bass, (0, max_len - len(bass)))
-
-    # Light percussion (noise hits on beats)
-    perc = np.zeros(max_len)
-    samples_per_beat = int(beat * SAMPLE_RATE)
-    for i in range(0, max_len, samples_per_beat):
-        hit_len = min(int(0.04 * SAMPLE_RATE), max_len - i)
-        hit = _noise(0.04, 0.08)[:hit_len]
-        hit = _envelope(hit, attack=0.002, release=0.015)
-        perc[i:i + hit_len] += hit
-
-    mix = melody + bass + perc
-    return _make_sound(mix)
+    song = song_for_theme(theme)
+    stream = ChiptuneStream(song, SAMPLE_RATE)
+    loop_samples = int(song.loop_beats * 60.0 / song.bpm * SAMPLE_RATE)
+    return pygame.mixer.Sound(buffer=stream.render(loop_samples))
+
+
+# Effect name -> generator, in synthesis order (most frequently used first)
+SOUND_GENERATORS = {
+    'sword_hit': make_sword_hit,
+    'enemy_hit': make_enemy_hit,
+    'spell_cast': make_spell_cast,
+    'enemy_death': make_enemy_death,
+    'player_hurt': make_player_hurt,
+    'pickup': make_pickup,
+    'menu_open': make_menu_open,
+    'menu_select': make_menu_select,
+    'portal': make_portal,
+    'level_up': make_level_up,
+}
+
+
+# ======================================================================
+# Voice management rules
+# ======================================================================
+# Priority classes: when every pooled channel is busy a play request may
+# steal a channel from a strictly lower-priority voice.
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+
+# Effect name -> (priority, max concurrent voices)
+VOICE_RULES = {
+    'sword_hit':   (PRIORITY_LOW, 2),
+    'enemy_hit':   (PRIORITY_LOW, 3),
+    'menu_open':   (PRIORITY_LOW, 1),
+    'menu_select': (PRIORITY_LOW, 1),
+    'spell_cast':  (PRIORITY_NORMAL, 2),
+    'enemy_death': (PRIORITY_NORMAL, 3),
+    'pickup':      (PRIORITY_NORMAL, 2),
+    'player_hurt': (PRIORITY_HIGH, 1),
+    'level_up':    (PRIORITY_HIGH, 1),
+    'portal':      (PRIORITY_HIGH, 1),
+}
+_DEFAULT_VOICE_RULE = (PRIORITY_NORMAL, 2)
+
+# Size of the fixed channel pool used for effects (music has its own)
+SFX_CHANNELS = 8
+
+
+# ======================================================================
+# On-disk PCM cache
+# ======================================================================
+# Bump when the cache layout or any waveform helper changes meaning.
+PCM_CACHE_VERSION = 1
+PCM_CACHE_DIR = os.path.join('.cache', 'sounds')
+
+_SYNTH_HELPERS = (_make_sound, _square_wave, _triangle_wave, _noise,
+                  _envelope, _pitch_sweep)
+
+
+def _pcm_cache_key(name, generator):
+    """Hash of everything that determines a generator's output samples."""
+    h = hashlib.sha1()
+    h.update(f"v{PCM_CACHE_VERSION}|{name}|{pygame.mixer.get_init()}".encode())
+    for fn in (generator,) + _SYNTH_HELPERS:
+        try:
+            h.update(inspect.getsource(fn).encode())
+        except (OSError, TypeError):
+            h.update(fn.__qualname__.encode())
+    return h.hexdigest()[:16]
+
+
+def _pcm_cache_path(name, key):
+    return os.path.join(PCM_CACHE_DIR, f"{name}-{key}.pcm")
+
+
+def _load_cached_sound(path):
+    """Build a Sound from a cached raw int16 file via a memory map."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    pcm = np.memmap(path, dtype=np.int16, mode='r')
+    try:
+        return pygame.mixer.Sound(buffer=pcm)
+    finally:
+        del pcm
+
+
+def _store_cached_sound(path, sound):
+    """Persist a Sound's raw samples (written atomically).
+
+    Older entries for the same sound (stale keys) are removed.
+    """
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(sound.get_raw())
+    os.replace(tmp, path)
+    prefix = os.path.basename(path).rsplit('-', 1)[0] + '-'
+    for entry in os.listdir(folder):
+        if entry.startswith(prefix) and entry.endswith('.pcm') and entry != os.path.basename(path):
+            try:
+                os.remove(os.path.join(folder, entry))
+            except OSError:
+                pass
+
+
+def synthesize(name, generator, use_cache=True):
+    """Return the Sound for *generator*, loading or filling the PCM cache."""
+    if not use_cache:
+        return generator()
+    path = _pcm_cache_path(name, _pcm_cache_key(name, generator))
+    try:
+        sound = _load_cached_sound(path)
+    except (OSError, ValueError, pygame.error):
+        sound = None
+    if sound is None:
+        sound = generator()
+        try:
+            _store_cached_sound(path, sound)
+        except OSError as e:
+            print(f"Sound cache write failed: {e}")
+    return sound
 
 
 # ======================================================================
@@ -224,16 +305,43 @@ def make_bgm():
 # ======================================================================
 
 class SoundManager:
-    """Centralized sound playback. Call init() after pygame.init()."""
+    """Centralized sound playback. Call init() after pygame.init().
+
+    init() returns immediately and starts a worker thread that builds every
+    effect (from the PCM cache when possible).  play() silently skips
+    effects that are not ready yet.  Music is streamed on a reserved
+    channel; call update() once per frame to keep it fed.
+
+    Effects play on a fixed pool of reserved channels with voice
+    management (see VOICE_RULES):
+      - repeated requests for the same effect within one frame coalesce
+        into a single voice,
+      - each effect has a cap on concurrent voices,
+      - when the pool is full a higher-priority effect steals the oldest
+        lower-priority voice; otherwise the request is dropped.
+    Counters for all of this live in ``stats``.
+    """
 
     _instance = None
 
+    # Mixer channel reserved for streamed music
+    MUSIC_CHANNEL = 0
+
     def __init__(self):
         self.enabled = True
+        self.use_cache = not os.environ.get('DEMOBLADE_NO_SOUND_CACHE')
         self.sounds = {}
-        self.bgm_sound = None
-        self.bgm_channel = None
+        self.music = None
         self._initialized = False
+        self._worker = None
+
+        # Voice management
+        self._pool = []            # reserved effect channels
+        self._voices = []          # per pool slot: (name, priority, start_frame) or None
+        self._frame = 0
+        self._played_this_frame = set()
+        self.stats = {}
+        self.reset_stats()
 
     @classmethod
     def get(cls):
@@ -242,39 +350,103 @@ class SoundManager:
         return cls._instance
 
     def init(self):
-        """Generate all sounds. Call once after pygame.mixer is ready."""
+        """Start background synthesis. Call once after pygame.mixer is ready."""
         if self._initialized:
             return
+        if not pygame.mixer.get_init():
+            print("Sound init failed: mixer not initialized")
+            self.enabled = False
+            return
+        self._initialized = True
+        total = self.MUSIC_CHANNEL + 1 + SFX_CHANNELS
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        self.music = MusicPlayer(pygame.mixer.Channel(self.MUSIC_CHANNEL), SAMPLE_RATE)
+        self._pool = [pygame.mixer.Channel(i)
+                      for i in range(self.MUSIC_CHANNEL + 1, total)]
+        self._voices = [None] * len(self._pool)
+        self._worker = threading.Thread(target=self._synth_worker,
+                                        name='sound-synth', daemon=True)
+        self._worker.start()
+
+    def _synth_worker(self):
         try:
-            self.sounds['sword_hit'] = make_sword_hit()
-            self.sounds['spell_cast'] = make_spell_cast()
-            self.sounds['pickup'] = make_pickup()
-            self.sounds['enemy_hit'] = make_enemy_hit()
-            self.sounds['enemy_death'] = make_enemy_death()
-            self.sounds['player_hurt'] = make_player_hurt()
-            self.sounds['level_up'] = make_level_up()
-            self.sounds['portal'] = make_portal()
-            self.sounds['menu_open'] = make_menu_open()
-            self.sounds['menu_select'] = make_menu_select()
-            self.bgm_sound = make_bgm()
-            self._initialized = True
+            for name, generator in SOUND_GENERATORS.items():
+                self.sounds[name] = synthesize(name, generator, self.use_cache)
         except Exception as e:
             print(f"Sound init failed: {e}")
             self.enabled = False
 
+    def update(self):
+        """Per-frame housekeeping: keep the music stream queued and start
+        a new coalescing window for effects."""
+        self._frame += 1
+        self._played_this_frame.clear()
+        if self.music and self.enabled:
+            self.music.pump()
+
+    def reset_stats(self):
+        self.stats = {'played': 0, 'coalesced': 0, 'dropped': 0,
+                      'stolen': 0, 'not_ready': 0}
+
     def play(self, name):
-        if not self.enabled or name not in self.sounds:
+        if not self.enabled:
+            return
+        sound = self.sounds.get(name)
+        if sound is None:
+            # not synthesised yet – skip rather than stall the frame
+            self.stats['not_ready'] += 1
+            return
+        if name in self._played_this_frame:
+            self.stats['coalesced'] += 1
+            return
+        self._played_this_frame.add(name)
+
+        priority, max_voices = VOICE_RULES.get(name, _DEFAULT_VOICE_RULE)
+        slot = self._pick_slot(name, priority, max_voices)
+        if slot is None:
+            self.stats['dropped'] += 1
             return
-        self.sounds[name].play()
 
-    def start_bgm(self):
-        if not self.enabled or not self.bgm_sound:
+        self._pool[slot].play(sound)
+        self._voices[slot] = (name, priority, self._frame)
+        self.stats['played'] += 1
+
+    def _pick_slot(self, name, priority, max_voices):
+        """Return a pool index to play on, or None to drop the request."""
+        free = None
+        same = []
+        victim = None
+        for i, channel in enumerate(self._pool):
+            voice = self._voices[i]
+            if voice is None or not channel.get_busy():
+                self._voices[i] = None
+                if free is None:
+                    free = i
+                continue
+            v_name, v_priority, v_frame = voice
+            if v_name == name:
+                same.append(i)
+            if v_priority < priority and (
+                    victim is None or v_frame < self._voices[victim][2]):
+                victim = i
+
+        if len(same) >= max_voices:
+            return None
+        if free is not None:
+            return free
+        if victim is not None:
+            self._pool[victim].stop()
+            self.stats['stolen'] += 1
+            return victim
+        return None
+
+    def start_bgm(self, theme=None):
+        """Stream the song for *theme* (keeps playing if it is already on)."""
+        if not self.enabled or not self._initialized:
             return
-        # Use a dedicated channel for looping BGM
-        if self.bgm_channel is None or not self.bgm_channel.get_busy():
-            self.bgm_channel = self.bgm_sound.play(loops=-1)
+        self.music.play(song_for_theme(theme))
 
     def stop_bgm(self):
-        if self.bgm_channel:
-            self.bgm_channel.stop()
-            self.bgm_channel = None
+        if self.music:
+            self.music.stop()
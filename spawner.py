@@ -2,6 +2,11 @@ import pygame
 import math
 import random
 from enemy import Enemy
+from assets import load_asset
+from events import ENEMY_DIED
+
+# Half size of the room a spawned demon needs (its hitbox is about 52 x 46)
+SPAWN_CLEARANCE = 26
 
 
 # ======================================================================
@@ -18,7 +23,7 @@ class CaveSpawner(pygame.sprite.Sprite):
 
     def __init__(self, pos, groups, obstacle_sprites,
                  enemy_groups, player,
-                 spawn_interval=4000, max_alive=5):
+                 spawn_interval=4000, max_alive=5, world=None):
         """
         pos:             (x, y) world position for the cave base-center.
         groups:          sprite groups this spawner belongs to (e.g. visible).
@@ -28,6 +33,7 @@ class CaveSpawner(pygame.sprite.Sprite):
         player:          Player reference for enemy AI.
         spawn_interval:  ms between spawn attempts.
         max_alive:       max enemies alive from this spawner at once.
+        world:           World the spawned enemies live in (bounds, events).
         """
         super().__init__(groups)
 
@@ -36,15 +42,18 @@ class CaveSpawner(pygame.sprite.Sprite):
         self.player = player
         self.spawn_interval = spawn_interval
         self.max_alive = max_alive
+        self.world = world
 
         # Build the cave image once
-        self.image = _cave_surface()
+        self.image = load_asset('props', _cave_surface, static=True)
         self.rect = self.image.get_rect(midbottom=pos)
         self.hitbox = self.rect.copy()
 
-        # Spawn tracking
-        self.spawned = []           # refs to living enemies
+        # Spawn tracking: living enemies, released on their enemy_died event
+        self.spawned = set()
         self.last_spawn = pygame.time.get_ticks()
+        if world is not None:
+            world.events.subscribe(ENEMY_DIED, self._on_enemy_died)
 
         # Ambient glow animation
         self._glow_phase = random.uniform(0, 6.28)
@@ -56,9 +65,6 @@ class CaveSpawner(pygame.sprite.Sprite):
     def update(self):
         now = pygame.time.get_ticks()
 
-        # Purge dead references
-        self.spawned = [e for e in self.spawned if e.alive()]
-
         # Spawn check
         if (now - self.last_spawn >= self.spawn_interval
                 and len(self.spawned) < self.max_alive):
@@ -80,22 +86,31 @@ class CaveSpawner(pygame.sprite.Sprite):
         # Spawn a little above the cave base so the enemy walks out
         sx = self.rect.centerx + random.randint(-16, 16)
         sy = self.rect.top + 20
+        if self.world is not None:
+            # Step out of any wall the cave mouth backs onto
+            clear = self.world.clearance.nearest_clear((sx, sy), SPAWN_CLEARANCE)
+            if clear is not None:
+                sx, sy = clear
         enemy = Enemy(
             (sx, sy),
             self.enemy_groups,
             self.obstacle_sprites,
             self.player,
+            world=self.world,
         )
-        self.spawned.append(enemy)
+        self.spawned.add(enemy)
         print(f"Cave spawned enemy ({len(self.spawned)}/{self.max_alive})")
 
+    def _on_enemy_died(self, enemy, **_):
+        self.spawned.discard(enemy)
+
 
 # ======================================================================
 # Procedural cave surface
 # ======================================================================
 
-def _cave_surface(glow_phase=0.0):
-    """Draw a dark rocky cave entrance (96 x 80 pixels)."""
+def _cave_surface(glow_phase=0.0, rng=random):
+    """Draw a dark rocky cave entrance (96 x 80 pixels); *rng* places the rubble."""
     W, H = 96, 80
     surf = pygame.Surface((W, H), pygame.SRCALPHA)
     cx = W // 2
@@ -189,10 +204,10 @@ def _cave_surface(glow_phase=0.0):
 
     # ── Ground rubble at cave base ──
     for i in range(8):
-        rx = 18 + i * 8 + random.randint(-2, 2)
-        ry = H - 4 + random.randint(-2, 2)
-        rs = random.randint(2, 4)
-        c = random.choice([rock_dark, rock_mid, rock_edge])
+        rx = 18 + i * 8 + rng.randint(-2, 2)
+        ry = H - 4 + rng.randint(-2, 2)
+        rs = rng.randint(2, 4)
+        c = rng.choice([rock_dark, rock_mid, rock_edge])
         pygame.draw.circle(surf, c, (rx, ry), rs)
 
     return surf
@@ -0,0 +1,281 @@
+"""Flocking bat swarms simulated as NumPy arrays.
+
+Single Bat sprites ignore each other, so a group of them collapses into
+one pile as they swoop.  A BatSwarm runs the Bat state machine (IDLE
+flutter / SWOOP at the player / RETREAT / DYING) for every bat at once
+and adds boids-style flocking on top:
+
+  - separation: push away from bats closer than SEPARATION_RADIUS,
+  - alignment:  steer toward the mean heading of the neighbours,
+  - cohesion:   steer toward the neighbours' centre.
+
+Idle and retreating bats use all three rules (idle ones are also held
+near the spot they flutter around); swooping bats only keep their
+separation so a dive stays a spread-out wave.
+
+Neighbour queries use uniform grids, with no per-bat Python loop:
+alignment and cohesion average over the 3x3 block of NEIGHBOUR_RADIUS
+cells around each bat, from per-cell sums (bincount), so their cost
+does not grow with the swarm's density; separation needs exact
+distances, so bats are sorted by SEPARATION_RADIUS cell and each bat's
+3x3 block of cells is expanded into (bat, other) pairs, whose pushes
+are accumulated with bincount.
+
+Storage, hit checks, kills and drawing come from ArrayHorde, so the
+level treats a swarm like a DemonHorde.  Enable per level with:
+
+    'swarms': [{'count': 150, 'area': (col, row, cols, rows)}],
+
+('area' is optional and defaults to the whole map.)
+"""
+
+import numpy as np
+import pygame
+
+from horde import ArrayHorde, _facings, _normalize, _FACINGS, _DOWN
+from enemy_bat import Bat, _build_bat_animations
+from assets import load_asset
+
+# 3x3 block of neighbouring grid cells
+_CELL_OFFSETS = tuple((dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+
+
+class BatSwarm(ArrayHorde):
+    """Many flocking Bats simulated as NumPy arrays (see module docstring)."""
+
+    FIELDS = dict(ArrayHorde.FIELDS,
+                  target=(np.float64, 2),     # swoop heading
+                  home=(np.float64, 2),       # spot an idle bat flutters around
+                  phase=(np.float64, 1),      # idle flutter phase
+                  idle_ms=(np.int32, 1))      # idle time before the next swoop
+
+    IDLE = Bat.IDLE
+    SWOOP = Bat.SWOOP
+    RETREAT = Bat.RETREAT
+    DYING = Bat.DYING
+
+    ENEMY_TYPE = Bat.ENEMY_TYPE
+    MAX_HP = Bat.MAX_HP
+    CONTACT_DAMAGE = Bat.CONTACT_DAMAGE
+    XP_VALUE = Bat.XP_VALUE
+
+    # Same tuning as Bat
+    SPEED = 3.5
+    SWOOP_SPEED = 9
+    DETECTION_RADIUS = 180
+    SWOOP_DURATION = 800
+    RETREAT_DURATION = 600
+    DEATH_DURATION = 20
+    DEATH_MIN_SCALE = 0.2
+    DEATH_SHRINK = 0.5
+    ANIMATION_SPEED = 0.2
+    HITBOX_SIZE = (28, 18)     # Bat: 36x28 frame inflated by (-8, -10)
+
+    # Flocking
+    NEIGHBOUR_RADIUS = 64
+    SEPARATION_RADIUS = 26
+    SEPARATION_WEIGHT = 1.6
+    ALIGNMENT_WEIGHT = 0.5
+    COHESION_WEIGHT = 0.6
+    HOME_WEIGHT = 0.5          # pull of an idle bat back to its spot, per NEIGHBOUR_RADIUS
+
+    def _load_frames(self):
+        anims = load_asset('creatures', _build_bat_animations)
+        return [anims[d] for d in _FACINGS], None
+
+    def _init_members(self, s, now):
+        k = s.stop - s.start
+        self.dir[s] = 0
+        self.target[s] = 0
+        self.home[s] = self.pos[s]
+        self.state[s] = self.IDLE
+        self.phase[s] = np.random.uniform(0, 6.28, k)
+        self.idle_ms[s] = np.random.randint(1500, 3001, k)
+
+    # ------------------------------------------------------------------
+    # Neighbours
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _grid(points, cell):
+        """Bucket *points* into a padded grid of *cell* px squares.
+
+        Returns (key, width, height): each point's flat cell index in a
+        grid covering their bounding box plus one cell on every side, so
+        the 3x3 block around any point's cell stays inside the grid.
+        """
+        cells = (points // cell).astype(np.intp)
+        cells -= cells.min(axis=0) - 1
+        width, height = cells.max(axis=0) + 2
+        return cells[:, 1] * width + cells[:, 0], int(width), int(height)
+
+    def _close_pairs(self, pos, members, radius):
+        """(i, j, offset, dist) for bats i != j of *members* closer than *radius*.
+
+        offset is pos[j] - pos[i]; indices are into the full arrays.
+        """
+        key, width, height = self._grid(pos[members], radius)
+        per_cell = np.bincount(key, minlength=width * height)
+        cell_start = np.cumsum(per_cell) - per_cell
+        order = np.argsort(key, kind='stable')
+
+        # Each bat's 3x3 block of cells, expanded into (bat, other) pairs
+        probe = key[None, :] + np.array([dy * width + dx for dx, dy in _CELL_OFFSETS])[:, None]
+        counts = per_cell[probe].ravel()
+        total = int(counts.sum())
+        first = np.repeat(np.tile(np.arange(len(members)), len(_CELL_OFFSETS)), counts)
+        run_start = np.repeat(cell_start[probe].ravel() - (np.cumsum(counts) - counts), counts)
+        second = order[np.arange(total) + run_start]
+
+        i = members[first]
+        j = members[second]
+        offset = pos[j] - pos[i]
+        dist = np.hypot(offset[:, 0], offset[:, 1])
+        near = (i != j) & (dist < radius)
+        return i[near], j[near], offset[near], dist[near]
+
+    def _block_sums(self, key, width, height, weights):
+        """Sum of *weights* over the 3x3 block of cells around each bat's cell."""
+        per_cell = np.bincount(key, weights=weights, minlength=width * height)
+        grid = per_cell.reshape(height, width)
+        block = np.zeros_like(grid)
+        block[1:-1, 1:-1] = sum(grid[1 + dy:height - 1 + dy, 1 + dx:width - 1 + dx]
+                                for dx, dy in _CELL_OFFSETS)
+        return block.ravel()[key]
+
+    def _flocking(self, pos, d, flying):
+        """Separation, alignment and cohesion steering of every bat.
+
+        Returns (separation, flock) as (n, 2) arrays; flock holds the
+        alignment and cohesion terms.  Alignment and cohesion average over
+        the 3x3 block of NEIGHBOUR_RADIUS cells around a bat, from per-cell
+        sums; separation is exact, over the pairs closer than
+        SEPARATION_RADIUS.
+        """
+        n = self.n
+        sep = np.zeros((n, 2))
+        flock = np.zeros((n, 2))
+        members = np.flatnonzero(flying)
+        if len(members) < 2:
+            return sep, flock
+
+        # Alignment and cohesion: the block's means without the bat itself
+        mpos, mdir = pos[members], d[members]
+        key, width, height = self._grid(mpos, self.NEIGHBOUR_RADIUS)
+        others = self._block_sums(key, width, height, None) - 1
+        has = others > 0
+        for axis in (0, 1):
+            heading = self._block_sums(key, width, height, mdir[:, axis]) - mdir[:, axis]
+            centre = self._block_sums(key, width, height, mpos[:, axis]) - mpos[:, axis]
+            flock[members[has], axis] = (
+                self.ALIGNMENT_WEIGHT * heading[has] / others[has]
+                + self.COHESION_WEIGHT * (centre[has] / others[has] - mpos[has, axis])
+                / self.NEIGHBOUR_RADIUS)
+
+        # Separation: away from close bats, stronger the closer they are
+        i, j, offset, dist = self._close_pairs(pos, members, self.SEPARATION_RADIUS)
+        if len(i):
+            apart = np.maximum(dist, 1e-6)
+            push = -offset / apart[:, None] * (1 - dist / self.SEPARATION_RADIUS)[:, None]
+            # Bats on the exact same spot are pushed apart along the uid order
+            stacked = dist < 1e-6
+            push[stacked] = np.where((i[stacked] < j[stacked])[:, None], (-1.0, 0.0), (1.0, 0.0))
+            for axis in (0, 1):
+                sep[:, axis] = np.bincount(i, weights=push[:, axis], minlength=n)
+        return sep * self.SEPARATION_WEIGHT, flock
+
+    # ------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------
+
+    def update(self):
+        n = self.n
+        if not n:
+            return
+        now = pygame.time.get_ticks()
+        pos = self.pos[:n]
+        d = self.dir[:n]
+        target = self.target[:n]
+        state = self.state[:n]
+
+        elapsed = now - self.state_start[:n]
+        to_player = np.array(self.player.rect.center, dtype=np.float64) - pos
+        dist = np.hypot(to_player[:, 0], to_player[:, 1])
+
+        # States as of the start of the frame (one transition per frame)
+        idle = state == self.IDLE
+        swoop = state == self.SWOOP
+        retreat = state == self.RETREAT
+        dying = state == self.DYING
+
+        # Flocking is based on last frame's headings
+        sep, flock = self._flocking(pos, d, ~dying)
+
+        # IDLE: flutter around the home spot, swoop once rested and the
+        # player is near and in sight
+        phase = self.phase[:n]
+        phase[idle] += 0.05
+        d[idle, 0] = np.sin(phase[idle] * 1.3) * 0.8
+        d[idle, 1] = np.cos(phase[idle]) * 0.6
+        d[idle] += (self.home[:n][idle] - pos[idle]) * (self.HOME_WEIGHT / self.NEIGHBOUR_RADIUS)
+        go = idle & (dist < self.DETECTION_RADIUS) & (elapsed > self.idle_ms[:n])
+        if go.any():
+            go[go] = self.world.sight.visible_from(pos[go], self.player.rect.center)
+        if go.any():
+            target[go] = _normalize(to_player[go])
+            self._enter(go, self.SWOOP, now)
+
+        # SWOOP: dive along the target heading with a sine wobble
+        if swoop.any():
+            t = elapsed[swoop] / self.SWOOP_DURATION
+            wave = np.sin(t * 12) * 0.3
+            aim = target[swoop]
+            perp = np.stack([-aim[:, 1], aim[:, 0]], axis=1)
+            d[swoop] = aim + perp * wave[:, None]
+            over = swoop & (elapsed > self.SWOOP_DURATION)
+            d[over] = -target[over]
+            self._enter(over, self.RETREAT, now)
+
+        # RETREAT: keep flying away, then rest
+        rested = retreat & (elapsed > self.RETREAT_DURATION)
+        if rested.any():
+            self._enter(rested, self.IDLE, now)
+            self.home[:n][rested] = pos[rested]
+            self.idle_ms[:n][rested] = np.random.randint(1000, 2501, int(rested.sum()))
+
+        # Flock: the full rules when drifting, only spacing when diving
+        drifting = idle | retreat
+        d[drifting] += flock[drifting] + sep[drifting]
+        d[swoop] += sep[swoop]
+
+        # DYING: count down the death animation
+        d[dying] = 0
+        self.death_timer[:n][dying] += 1
+
+        # Bats fly over obstacles; bounce off the world edges
+        speed = np.where(self.state[:n] == self.SWOOP, self.SWOOP_SPEED, self.SPEED)
+        length = np.hypot(d[:, 0], d[:, 1])
+        moving = length > 0
+        d[moving] /= length[moving, None]
+        pos += d * speed[:, None]
+        edge_x, edge_y = self._clamp()
+        d[edge_x, 0] *= -1
+        d[edge_y, 1] *= -1
+
+        self._check_player_collision()
+        self._animate()
+        self._finish_dying()
+
+    def _animate(self):
+        n = self.n
+        d = self.dir[:n]
+        flash = self.hit_flash[:n]
+        flash[flash > 0] -= 1
+
+        # Bat._update_status: face the heading, 'down' when hovering
+        hovering = (d[:, 0] ** 2 + d[:, 1] ** 2) < 0.01
+        self.facing[:n] = np.where(hovering, _DOWN, _facings(d))
+
+        frame = self.frame[:n]
+        frame += self.ANIMATION_SPEED
+        frame[frame >= len(self._frames[0])] = 0
@@ -0,0 +1,116 @@
+"""Swept AABB collision queries.
+
+Testing where a fast mover ends each frame lets it pass straight through
+anything thinner than its step.  These helpers test the whole move of a
+rect displaced by *delta* during the frame instead, and report its time
+of impact: the fraction t in [0, 1] of the move at which it first
+touches a target.  A target already overlapping at the start is hit at
+t = 0.
+
+    sweep_rect(rect, delta, target)     (t, normal) for one rect, or None
+    sweep_rects(rect, delta, targets)   [(t, index, normal)] of a rect list, by t
+    sweep_boxes(rect, delta, boxes)     t for each row of a (k, 4) array
+                                        (left, top, right, bottom), inf on a miss
+    slide(rect, delta, obstacles)       the moved rect, stopped at the first
+                                        impact and sliding along that wall
+
+*normal* is the face that was hit: (-1, 0) for a target's left face and
+so on, (0, 0) when the rects already overlapped.  World.slide() runs
+slide() against the level's obstacle set.
+"""
+
+import math
+
+import numpy as np
+
+
+def swept_bounds(rect, delta):
+    """Rect covering *rect* over its whole move by *delta*."""
+    dx, dy = delta
+    return rect.union(rect.move(int(dx) + (dx > 0) - (dx < 0),
+                                int(dy) + (dy > 0) - (dy < 0)))
+
+
+def _axis_times(lo, hi, d, target_lo, target_hi):
+    """(enter, exit) times of the span lo..hi moving by *d* over target_lo..target_hi."""
+    if d > 0:
+        return (target_lo - hi) / d, (target_hi - lo) / d
+    if d < 0:
+        return (target_hi - lo) / d, (target_lo - hi) / d
+    if hi > target_lo and lo < target_hi:
+        return -math.inf, math.inf
+    return math.inf, -math.inf
+
+
+def sweep_rect(rect, delta, target):
+    """Time of impact of *rect* moving by *delta* into *target*: (t, normal) or None."""
+    dx, dy = delta
+    x_enter, x_exit = _axis_times(rect.left, rect.right, dx, target.left, target.right)
+    y_enter, y_exit = _axis_times(rect.top, rect.bottom, dy, target.top, target.bottom)
+    enter = max(x_enter, y_enter)
+    leave = min(x_exit, y_exit)
+    if enter >= leave or enter > 1 or leave <= 0:
+        return None
+    if enter < 0:
+        return 0.0, (0, 0)
+    if x_enter >= y_enter:
+        return enter, (-1 if dx > 0 else 1, 0)
+    return enter, (0, -1 if dy > 0 else 1)
+
+
+def sweep_rects(rect, delta, targets):
+    """Every rect of *targets* hit during the move, as (t, index, normal) sorted by t."""
+    hits = []
+    for i in swept_bounds(rect, delta).collidelistall(targets):
+        hit = sweep_rect(rect, delta, targets[i])
+        if hit is not None:
+            hits.append((hit[0], i, hit[1]))
+    hits.sort(key=lambda h: (h[0], h[1]))
+    return hits
+
+
+def sweep_boxes(rect, delta, boxes):
+    """Vectorised sweep_rect() times against (k, 4) *boxes*; inf where missed."""
+    dx, dy = delta
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    times = []
+    for lo, hi, d, t_lo, t_hi in ((rect.left, rect.right, dx, boxes[:, 0], boxes[:, 2]),
+                                  (rect.top, rect.bottom, dy, boxes[:, 1], boxes[:, 3])):
+        if d:
+            a, b = (t_lo - hi) / d, (t_hi - lo) / d
+            times.append((np.minimum(a, b), np.maximum(a, b)))
+        else:
+            inside = (hi > t_lo) & (lo < t_hi)
+            times.append((np.where(inside, -np.inf, np.inf), np.where(inside, np.inf, -np.inf)))
+    enter = np.maximum(times[0][0], times[1][0])
+    leave = np.minimum(times[0][1], times[1][1])
+    hit = (enter < leave) & (enter <= 1) & (leave > 0)
+    return np.where(hit, np.maximum(enter, 0.0), np.inf)
+
+
+def slide(rect, delta, obstacles, max_hits=2):
+    """*rect* moved by *delta*, stopping at *obstacles* and sliding along them.
+
+    Each impact drops the blocked component of the remaining move, so a
+    diagonal push along a wall keeps its parallel part.  Returns a new rect.
+    """
+    rect = rect.copy()
+    dx, dy = delta
+    for _ in range(max_hits + 1):
+        if not dx and not dy:
+            break
+        hits = [h for h in sweep_rects(rect, (dx, dy), obstacles) if h[2] != (0, 0)]
+        if not hits:
+            # Same rounding as moving a hitbox by a float offset
+            rect.x += dx
+            rect.y += dy
+            break
+        t, _, normal = hits[0]
+        # Truncate toward the contact so the rect never ends inside the wall
+        rect.move_ip(int(dx * t), int(dy * t))
+        dx, dy = dx * (1 - t), dy * (1 - t)
+        if normal[0]:
+            dx = 0
+        if normal[1]:
+            dy = 0
+    return rect
@@ -0,0 +1,108 @@
+"""Nearest-enemy queries for homing and area spells.
+
+An EnemyIndex buckets every living enemy of a level - sprites and horde
+members alike - into a uniform grid of CELL px squares.  The level marks
+it stale once per frame; the grid is rebuilt on the first query after
+that, so frames without a query cost nothing and any number of spells
+can query in the same frame for the price of one build.
+
+    index.nearest(pos, k=1, radius=None)   up to k living enemies, closest first
+
+Results are enemy sprites or horde.HordeMember handles.  Both have a
+``hitbox``, ``alive()`` and ``state`` / ``DYING``, so callers can treat
+them alike.
+"""
+
+import numpy as np
+
+from data import TILESIZE
+from horde import HordeMember
+
+
+class EnemyIndex:
+    """Per-frame grid over the living enemies of a level (see module docstring)."""
+
+    CELL = 2 * TILESIZE
+
+    def __init__(self, enemy_sprites, hordes):
+        self.enemy_sprites = enemy_sprites
+        self.hordes = hordes            # the level's list; hordes may be added later
+        self._stale = True
+        self._sprites = []
+        self._hordes = []               # hordes with members in the grid ...
+        self._horde_start = []          # ... and the entry each one's members start at
+        self._members = np.empty(0, dtype=np.intp)   # horde array index per horde entry
+        self._pos = np.empty((0, 2))
+
+    def invalidate(self):
+        """Enemies have moved: rebuild before the next query."""
+        self._stale = True
+
+    def _build(self):
+        self._stale = False
+        self._sprites = [enemy for enemy in self.enemy_sprites if enemy.state != enemy.DYING]
+        points = [np.array([enemy.hitbox.center for enemy in self._sprites],
+                           dtype=np.float64).reshape(-1, 2)]
+        self._hordes, self._horde_start, members = [], [], []
+        start = len(self._sprites)
+        for horde in self.hordes:
+            idx = np.flatnonzero(horde.state[:horde.n] != horde.DYING)
+            self._hordes.append(horde)
+            self._horde_start.append(start)
+            members.append(idx)
+            points.append(horde.pos[idx])
+            start += len(idx)
+        self._members = np.concatenate(members) if members else np.empty(0, dtype=np.intp)
+        self._pos = np.concatenate(points)
+        if not len(self._pos):
+            return
+
+        cells = (self._pos // self.CELL).astype(np.intp)
+        self._origin = cells.min(axis=0)
+        cells -= self._origin
+        self._width = int(cells[:, 0].max()) + 1
+        self._height = int(cells[:, 1].max()) + 1
+        key = cells[:, 1] * self._width + cells[:, 0]
+        self._order = np.argsort(key, kind='stable')
+        self._keys = key[self._order]
+
+    def _candidates(self, pos, radius):
+        """Indices of the enemies in the grid cells a circle at *pos* touches."""
+        x0, y0 = (np.array(pos, dtype=np.float64) - radius) // self.CELL - self._origin
+        x1, y1 = (np.array(pos, dtype=np.float64) + radius) // self.CELL - self._origin
+        x0, x1 = max(0, int(x0)), min(self._width - 1, int(x1))
+        y0, y1 = max(0, int(y0)), min(self._height - 1, int(y1))
+        if x0 > x1 or y0 > y1:
+            return np.empty(0, dtype=np.intp)
+        # Each row of cells is one contiguous run of keys
+        rows = np.arange(y0, y1 + 1) * self._width
+        start = np.searchsorted(self._keys, rows + x0, 'left')
+        end = np.searchsorted(self._keys, rows + x1, 'right')
+        return np.concatenate([self._order[s:e] for s, e in zip(start.tolist(), end.tolist())])
+
+    def _target(self, j):
+        if j < len(self._sprites):
+            return self._sprites[j]
+        horde = self._hordes[int(np.searchsorted(self._horde_start, j, 'right')) - 1]
+        i = self._members[j - len(self._sprites)]
+        return HordeMember(horde, int(horde.uid[i]))
+
+    def nearest(self, pos, k=1, radius=None):
+        """Up to *k* living enemies closest to *pos* (within *radius*), closest first."""
+        if self._stale:
+            self._build()
+        if not len(self._pos) or k <= 0:
+            return []
+        if radius is None:
+            cand = np.arange(len(self._pos))
+        else:
+            cand = self._candidates(pos, radius)
+        offset = self._pos[cand] - np.array(pos, dtype=np.float64)
+        dist2 = offset[:, 0] ** 2 + offset[:, 1] ** 2
+        if radius is not None:
+            inside = dist2 < radius * radius
+            cand, dist2 = cand[inside], dist2[inside]
+        if len(cand) > k:
+            pick = np.argpartition(dist2, k - 1)[:k]
+            cand, dist2 = cand[pick], dist2[pick]
+        return [self._target(j) for j in cand[np.argsort(dist2, kind='stable')].tolist()]
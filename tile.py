@@ -7,17 +7,34 @@ class Tile(pygame.sprite.Sprite):
         super().__init__(groups)
         self.sprite_type = sprite_type
         self.image = surface
+        self.rect, self.hitbox = Tile.geometry(pos, sprite_type, self.image.get_size())
+        # Per-pixel alpha images are already transparent; a colorkey on top is
+        # redundant and forces a slower blit path.
+        if not self.image.get_flags() & pygame.SRCALPHA:
+            self.image.set_colorkey(COLORKEY)
+
+    @staticmethod
+    def geometry(pos, sprite_type, size=(TILESIZE, TILESIZE)):
+        """Return (rect, hitbox) for a tile at *pos* without building a sprite."""
+        image_width, image_height = size
         if sprite_type == 'sceneryObject':
-            if(self.image.get_rect().height != TILESIZE): #objects are only single or double height
-                self.rect = self.image.get_rect(topleft= (pos[0],pos[1] - TILESIZE))
-                self.hitbox = self.rect.inflate(0,-(8+TILESIZE)) # allow 8px overlap on vertical
-            else:            
-                self.rect = self.image.get_rect(topleft=pos)
-                self.hitbox = self.rect.inflate(0,-8) # allow 8px overlap on vertical
+            if(image_height != TILESIZE): #objects are only single or double height
+                rect = pygame.Rect(pos[0], pos[1] - TILESIZE, image_width, image_height)
+                hitbox = rect.inflate(0,-(8+TILESIZE)) # allow 8px overlap on vertical
+            else:
+                rect = pygame.Rect(pos[0], pos[1], image_width, image_height)
+                hitbox = rect.inflate(0,-8) # allow 8px overlap on vertical
         else:
-             self.rect = self.image.get_rect(topleft=pos)
-             self.hitbox = self.rect
-        colorkey = (255,0,255)
-        self.image.set_colorkey(colorkey)
-       
-        
\ No newline at end of file
+            rect = pygame.Rect(pos[0], pos[1], image_width, image_height)
+            hitbox = rect
+        return rect, hitbox
+
+
+class Collider(pygame.sprite.Sprite):
+    """Invisible obstacle covering a merged block of solid tiles (see World)."""
+
+    def __init__(self, rect, groups):
+        super().__init__(groups)
+        self.sprite_type = 'invisible'
+        self.rect = rect
+        self.hitbox = rect
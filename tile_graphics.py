@@ -2,7 +2,9 @@
 
 import pygame
 import random
-from data import TILESIZE
+import numpy as np
+from data import TILESIZE, TILE_VARIANTS
+from assets import load_asset
 
 # ---------------------------------------------------------------------------
 # Theme colour palettes
@@ -50,20 +52,184 @@ def _tint(base, offset):
             _clamp(base[2] + offset[2]))
 
 
-def _vary(color, amount=10):
+def _vary(color, amount=10, rng=random):
     """Return a slightly randomised copy of *color*."""
-    return (_clamp(color[0] + random.randint(-amount, amount)),
-            _clamp(color[1] + random.randint(-amount, amount)),
-            _clamp(color[2] + random.randint(-amount, amount)))
+    return (_clamp(color[0] + rng.randint(-amount, amount)),
+            _clamp(color[1] + rng.randint(-amount, amount)),
+            _clamp(color[2] + rng.randint(-amount, amount)))
 
 
 # ---------------------------------------------------------------------------
 # Floor surface
 # ---------------------------------------------------------------------------
 
-def make_floor_surface(theme, width=1280, height=1216):
+def make_floor_surface(theme, width=1280, height=1216, rng=random):
     """Create a large themed floor background surface.
 
+    Vectorised with NumPy: every splotch / flower / moss / ember / ash
+    layer is stamped into a packed-RGB pixel array with a fixed number of
+    whole-array operations (independent of the number of details), then
+    blitted into the surface once.  The NumPy stream is seeded from *rng*
+    (a ``random.Random``; the asset cache passes a seeded one), so the
+    result is reproducible.
+
+    Parameters
+    ----------
+    theme : str
+        One of 'meadow', 'darkwoods', 'swarm', 'demonsgate'.
+    width, height : int
+        Pixel dimensions of the floor surface.
+    rng : random.Random
+        Source of the layout (default: the global ``random`` module).
+
+    Returns
+    -------
+    pygame.Surface
+    """
+    pal = THEMES[theme]
+    rng = np.random.default_rng(rng.getrandbits(32))
+    area = width * height
+    canvas = _Canvas(width, height, pal['grass_base'])
+
+    # -- noise patches (lighter / darker splotches) -------------------------
+    n = area // 120
+    cols = np.where(rng.random(n)[:, None] < 0.5,
+                    np.array(pal['grass_light']), np.array(pal['grass_dark']))
+    canvas.squares(rng.integers(0, width, n), rng.integers(0, height, n),
+                   rng.integers(4, 9, n), _vary_array(rng, cols, 8))
+
+    # -- theme-specific detail layers ----------------------------------------
+    if theme == 'meadow':
+        # tiny flowers scattered across the meadow
+        flower_colors = np.array([(220, 60, 60), (240, 200, 50), (200, 120, 220),
+                                  (255, 255, 255), (255, 160, 60)])
+        n = area // 2000
+        fx = rng.integers(2, width - 2, n)
+        fy = rng.integers(2, height - 2, n)
+        fc = flower_colors[rng.integers(0, len(flower_colors), n)]
+        canvas.squares(fx, fy, np.full(n, 2), fc)
+        # tiny green stem below
+        canvas.points(fx, fy + 2, pal['grass_dark'])
+        canvas.points(fx, fy + 3, pal['grass_dark'])
+
+    elif theme == 'darkwoods':
+        # mossy patches – slightly blue-green blobs
+        n = area // 800
+        canvas.discs(rng.integers(0, width, n), rng.integers(0, height, n),
+                     rng.integers(3, 8, n), _vary_array(rng, _repeat((35, 75, 45), n), 10))
+
+    elif theme == 'swarm':
+        # dried / sandy patches
+        n = area // 600
+        canvas.squares(rng.integers(0, width, n), rng.integers(0, height, n),
+                       rng.integers(4, 11, n), _vary_array(rng, _repeat((140, 130, 80), n), 12))
+
+    elif theme == 'demonsgate':
+        # ember-red glowing spots on charred ground
+        n = area // 1500
+        canvas.discs(rng.integers(0, width, n), rng.integers(0, height, n),
+                     rng.integers(2, 6, n), _vary_array(rng, _repeat((180, 50, 20), n), 20))
+        # ash streaks
+        n = area // 3000
+        canvas.hlines(rng.integers(0, width - 5, n), rng.integers(0, height, n),
+                      rng.integers(6, 19, n) + 1, _vary_array(rng, _repeat((40, 38, 36), n), 5))
+
+    return canvas.to_surface()
+
+
+def _repeat(color, n):
+    return np.broadcast_to(np.array(color), (n, 3))
+
+
+def _vary_array(rng, colors, amount):
+    """Vectorised _vary(): jitter an (n, 3) colour array and clamp to 0..255."""
+    jitter = rng.integers(-amount, amount + 1, colors.shape)
+    return np.clip(colors + jitter, 0, 255)
+
+
+def _pack(colors):
+    """(n, 3) RGB -> (n,) uint32 0xRRGGBB."""
+    c = np.asarray(colors, dtype=np.uint32)
+    return (c[..., 0] << 16) | (c[..., 1] << 8) | c[..., 2]
+
+
+class _Canvas:
+    """Packed-RGB pixel buffer that stamps many shapes per NumPy call.
+
+    The buffer is padded on every side so shapes near the edges need no
+    per-pixel bounds checks; shapes are sorted by size so "all shapes at
+    least this big" is a prefix slice rather than a boolean mask.  Python
+    loops run over the offsets inside the largest shape, never over the
+    shapes themselves.
+    """
+
+    PAD = 16
+
+    def __init__(self, width, height, fill):
+        self.width = width
+        self.height = height
+        self.stride = height + 2 * self.PAD
+        self.buf = np.empty((width + 2 * self.PAD, self.stride), dtype=np.uint32)
+        self.buf[:] = _pack(fill)
+        self.flat = self.buf.reshape(-1)
+
+    def _base(self, xs, ys):
+        return (xs + self.PAD) * self.stride + (ys + self.PAD)
+
+    def points(self, xs, ys, color):
+        self.flat[self._base(xs, ys)] = _pack(color)
+
+    def squares(self, xs, ys, sizes, colors):
+        order = np.argsort(-sizes, kind='stable')
+        sizes = sizes[order]
+        base = self._base(xs[order], ys[order])
+        packed = _pack(colors)[order]
+        neg = -sizes
+        for dx in range(int(sizes[0]) if len(sizes) else 0):
+            for dy in range(int(sizes[0])):
+                k = np.searchsorted(neg, -max(dx, dy), side='left')
+                self.flat[base[:k] + (dx * self.stride + dy)] = packed[:k]
+
+    def hlines(self, xs, ys, lengths, colors):
+        order = np.argsort(-lengths, kind='stable')
+        lengths = lengths[order]
+        base = self._base(xs[order], ys[order])
+        packed = _pack(colors)[order]
+        neg = -lengths
+        for dx in range(int(lengths[0]) if len(lengths) else 0):
+            k = np.searchsorted(neg, -dx, side='left')
+            self.flat[base[:k] + dx * self.stride] = packed[:k]
+
+    def discs(self, xs, ys, radii, colors):
+        order = np.argsort(-radii, kind='stable')
+        r2 = (radii * radii)[order]
+        base = self._base(xs[order], ys[order])
+        packed = _pack(colors)[order]
+        neg = -r2
+        rmax = int(radii.max()) if len(radii) else -1
+        for dx in range(-rmax, rmax + 1):
+            for dy in range(-rmax, rmax + 1):
+                k = np.searchsorted(neg, -(dx * dx + dy * dy), side='right')
+                self.flat[base[:k] + (dx * self.stride + dy)] = packed[:k]
+
+    def to_surface(self):
+        p = self.PAD
+        view = self.buf[p:p + self.width, p:p + self.height]
+        rgb = np.empty((self.width, self.height, 3), dtype=np.uint8)
+        rgb[..., 0] = view >> 16
+        rgb[..., 1] = view >> 8
+        rgb[..., 2] = view
+        surf = pygame.Surface((self.width, self.height))
+        pygame.surfarray.blit_array(surf, rgb)
+        return surf
+
+
+def make_floor_surface_draw(theme, width=1280, height=1216, rng=random):
+    """Reference floor generator using one pygame.draw call per detail.
+
+    Kept for visual comparison and benchmarking against the vectorised
+    make_floor_surface(); not used by the game.
+
     Parameters
     ----------
     theme : str
@@ -81,10 +247,10 @@ def make_floor_surface(theme, width=1280, height=1216):
 
     # -- noise patches (lighter / darker splotches) -------------------------
     for _ in range(width * height // 120):
-        px = random.randint(0, width - 1)
-        py = random.randint(0, height - 1)
-        size = random.randint(4, 8)
-        col = _vary(random.choice([pal['grass_light'], pal['grass_dark']]), 8)
+        px = rng.randint(0, width - 1)
+        py = rng.randint(0, height - 1)
+        size = rng.randint(4, 8)
+        col = _vary(rng.choice([pal['grass_light'], pal['grass_dark']]), 8, rng=rng)
         pygame.draw.rect(surf, col, (px, py, size, size))
 
     # -- theme-specific detail layers ----------------------------------------
@@ -93,9 +259,9 @@ def make_floor_surface(theme, width=1280, height=1216):
         flower_colors = [(220, 60, 60), (240, 200, 50), (200, 120, 220),
                          (255, 255, 255), (255, 160, 60)]
         for _ in range(width * height // 2000):
-            fx = random.randint(2, width - 3)
-            fy = random.randint(2, height - 3)
-            fc = random.choice(flower_colors)
+            fx = rng.randint(2, width - 3)
+            fy = rng.randint(2, height - 3)
+            fc = rng.choice(flower_colors)
             pygame.draw.rect(surf, fc, (fx, fy, 2, 2))
             # tiny green stem below
             pygame.draw.rect(surf, pal['grass_dark'], (fx, fy + 2, 1, 2))
@@ -103,35 +269,35 @@ def make_floor_surface(theme, width=1280, height=1216):
     elif theme == 'darkwoods':
         # mossy patches – slightly blue-green blobs
         for _ in range(width * height // 800):
-            mx = random.randint(0, width - 1)
-            my = random.randint(0, height - 1)
-            mr = random.randint(3, 7)
-            mc = _vary((35, 75, 45), 10)
+            mx = rng.randint(0, width - 1)
+            my = rng.randint(0, height - 1)
+            mr = rng.randint(3, 7)
+            mc = _vary((35, 75, 45), 10, rng=rng)
             pygame.draw.circle(surf, mc, (mx, my), mr)
 
     elif theme == 'swarm':
         # dried / sandy patches
         for _ in range(width * height // 600):
-            dx = random.randint(0, width - 1)
-            dy = random.randint(0, height - 1)
-            ds = random.randint(4, 10)
-            dc = _vary((140, 130, 80), 12)
+            dx = rng.randint(0, width - 1)
+            dy = rng.randint(0, height - 1)
+            ds = rng.randint(4, 10)
+            dc = _vary((140, 130, 80), 12, rng=rng)
             pygame.draw.rect(surf, dc, (dx, dy, ds, ds))
 
     elif theme == 'demonsgate':
         # ember-red glowing spots on charred ground
         for _ in range(width * height // 1500):
-            ex = random.randint(0, width - 1)
-            ey = random.randint(0, height - 1)
-            er = random.randint(2, 5)
-            ec = _vary((180, 50, 20), 20)
+            ex = rng.randint(0, width - 1)
+            ey = rng.randint(0, height - 1)
+            er = rng.randint(2, 5)
+            ec = _vary((180, 50, 20), 20, rng=rng)
             pygame.draw.circle(surf, ec, (ex, ey), er)
         # ash streaks
         for _ in range(width * height // 3000):
-            sx = random.randint(0, width - 6)
-            sy = random.randint(0, height - 1)
-            sl = random.randint(6, 18)
-            sc = _vary((40, 38, 36), 5)
+            sx = rng.randint(0, width - 6)
+            sy = rng.randint(0, height - 1)
+            sl = rng.randint(6, 18)
+            sc = _vary((40, 38, 36), 5, rng=rng)
             pygame.draw.line(surf, sc, (sx, sy), (sx + sl, sy))
 
     return surf
@@ -141,7 +307,7 @@ def make_floor_surface(theme, width=1280, height=1216):
 # Rock obstacle  (64x64)
 # ---------------------------------------------------------------------------
 
-def make_rock(theme='meadow'):
+def make_rock(theme='meadow', rng=random):
     """Generate a 64x64 rock sprite with theme-appropriate tint.
 
     Returns a Surface with per-pixel alpha.
@@ -167,21 +333,21 @@ def make_rock(theme='meadow'):
 
     # surface noise
     for _ in range(90):
-        nx = random.randint(10, size - 12)
-        ny = random.randint(16, size - 12)
+        nx = rng.randint(10, size - 12)
+        ny = rng.randint(16, size - 12)
         # only draw inside the rough ellipse
         dx = (nx - cx) / 24.0
         dy = (ny - cy) / 20.0
         if dx * dx + dy * dy <= 1.0:
-            nc = _vary(base, 15)
+            nc = _vary(base, 15, rng=rng)
             pygame.draw.rect(surf, nc, (nx, ny, 2, 2))
 
     # crack lines
-    for _ in range(random.randint(1, 3)):
-        x1 = random.randint(16, 46)
-        y1 = random.randint(20, 44)
-        x2 = x1 + random.randint(-10, 10)
-        y2 = y1 + random.randint(-6, 6)
+    for _ in range(rng.randint(1, 3)):
+        x1 = rng.randint(16, 46)
+        y1 = rng.randint(20, 44)
+        x2 = x1 + rng.randint(-10, 10)
+        y2 = y1 + rng.randint(-6, 6)
         pygame.draw.line(surf, shadow, (x1, y1), (x2, y2))
 
     return surf
@@ -191,7 +357,7 @@ def make_rock(theme='meadow'):
 # Grass tuft  (64x64)
 # ---------------------------------------------------------------------------
 
-def make_grass_tuft(theme='meadow'):
+def make_grass_tuft(theme='meadow', rng=random):
     """Generate a 64x64 bush obstacle with contrasting flowers/vines.
 
     Returns a Surface with per-pixel alpha.  Designed to stand out
@@ -223,14 +389,14 @@ def make_grass_tuft(theme='meadow'):
 
     # -- leafy texture: small random circles across the bush --
     for _ in range(25):
-        lx = random.randint(12, size - 12)
-        ly = random.randint(14, size - 16)
+        lx = rng.randint(12, size - 12)
+        ly = rng.randint(14, size - 16)
         # Only draw inside the rough ellipse shape
         dx = (lx - cx) / 24.0
         dy = (ly - cy) / 19.0
         if dx * dx + dy * dy <= 1.0:
-            lr = random.randint(2, 4)
-            lc = _vary(random.choice([bush_dark, bush_mid, bush_light]), 12)
+            lr = rng.randint(2, 4)
+            lc = _vary(rng.choice([bush_dark, bush_mid, bush_light]), 12, rng=rng)
             pygame.draw.circle(surf, lc, (lx, ly), lr)
 
     # -- dark outline strokes for definition --
@@ -269,31 +435,31 @@ def make_grass_tuft(theme='meadow'):
         ]
 
     # Scatter 4-7 flowers on the bush surface
-    num_flowers = random.randint(4, 7)
+    num_flowers = rng.randint(4, 7)
     for _ in range(num_flowers):
-        fx = random.randint(14, size - 14)
-        fy = random.randint(14, size - 20)
+        fx = rng.randint(14, size - 14)
+        fy = rng.randint(14, size - 20)
         dx = (fx - cx) / 22.0
         dy = (fy - cy) / 17.0
         if dx * dx + dy * dy <= 0.85:
-            fc = random.choice(flower_colors)
+            fc = rng.choice(flower_colors)
             # Flower = small circle with a bright center dot
             pygame.draw.circle(surf, fc, (fx, fy), 3)
             pygame.draw.circle(surf, (255, 255, 220), (fx, fy), 1)
 
     # -- small vine/leaf tips poking out at edges --
-    for _ in range(random.randint(3, 5)):
-        side = random.choice(['left', 'right', 'top'])
+    for _ in range(rng.randint(3, 5)):
+        side = rng.choice(['left', 'right', 'top'])
         if side == 'left':
-            vx = random.randint(4, 10)
-            vy = random.randint(20, 44)
+            vx = rng.randint(4, 10)
+            vy = rng.randint(20, 44)
         elif side == 'right':
-            vx = random.randint(size - 10, size - 4)
-            vy = random.randint(20, 44)
+            vx = rng.randint(size - 10, size - 4)
+            vy = rng.randint(20, 44)
         else:
-            vx = random.randint(16, size - 16)
-            vy = random.randint(8, 14)
-        vc = _vary(bush_light, 10)
+            vx = rng.randint(16, size - 16)
+            vy = rng.randint(8, 14)
+        vc = _vary(bush_light, 10, rng=rng)
         pygame.draw.circle(surf, vc, (vx, vy), 2)
 
     return surf
@@ -303,7 +469,7 @@ def make_grass_tuft(theme='meadow'):
 # Column / pillar  (64x128)
 # ---------------------------------------------------------------------------
 
-def make_column(theme='meadow'):
+def make_column(theme='meadow', rng=random):
     """Generate a 64x128 stone column with wider top/base, banding, and cracks.
 
     Returns a Surface with per-pixel alpha.
@@ -348,26 +514,26 @@ def make_column(theme='meadow'):
     # -- horizontal banding -------------------------------------------------
     band_y = shaft_top + 8
     while band_y < shaft_bot - 8:
-        bc = _vary(dark_col, 5)
+        bc = _vary(dark_col, 5, rng=rng)
         pygame.draw.line(surf, bc, (shaft_left + 2, band_y),
                          (shaft_right - 3, band_y))
-        band_y += random.randint(10, 18)
+        band_y += rng.randint(10, 18)
 
     # -- cracks -------------------------------------------------------------
-    for _ in range(random.randint(2, 4)):
-        cx = random.randint(shaft_left + 4, shaft_right - 5)
-        cy = random.randint(shaft_top + 6, shaft_bot - 10)
-        for seg in range(random.randint(2, 4)):
-            nx = cx + random.randint(-5, 5)
-            ny = cy + random.randint(2, 8)
+    for _ in range(rng.randint(2, 4)):
+        cx = rng.randint(shaft_left + 4, shaft_right - 5)
+        cy = rng.randint(shaft_top + 6, shaft_bot - 10)
+        for seg in range(rng.randint(2, 4)):
+            nx = cx + rng.randint(-5, 5)
+            ny = cy + rng.randint(2, 8)
             pygame.draw.line(surf, dark_col, (cx, cy), (nx, ny))
             cx, cy = nx, ny
 
     # -- surface noise on shaft --------------------------------------------
     for _ in range(60):
-        nx = random.randint(shaft_left + 1, shaft_right - 2)
-        ny = random.randint(shaft_top + 1, shaft_bot - 2)
-        nc = _vary(base_col, 10)
+        nx = rng.randint(shaft_left + 1, shaft_right - 2)
+        ny = rng.randint(shaft_top + 1, shaft_bot - 2)
+        nc = _vary(base_col, 10, rng=rng)
         surf.set_at((nx, ny), (*nc, 255))
 
     return surf
@@ -377,7 +543,7 @@ def make_column(theme='meadow'):
 # Chainmail stand  (64x64)
 # ---------------------------------------------------------------------------
 
-def make_chainmail_stand():
+def make_chainmail_stand(rng=random):
     """Generate a 64x64 wooden stand displaying silver chainmail.
 
     Returns a Surface with per-pixel alpha.
@@ -427,7 +593,7 @@ def make_chainmail_stand():
         x = mail_left + offset
         while x < mail_right:
             # draw a small ring
-            col = _vary(mail_base, 8)
+            col = _vary(mail_base, 8, rng=rng)
             pygame.draw.circle(surf, col, (x, y), ring_r, 1)
             # tiny highlight at top-left of ring
             pygame.draw.rect(surf, mail_light, (x - 1, y - 2, 1, 1))
@@ -438,3 +604,83 @@ def make_chainmail_stand():
         row += 1
 
     return surf
+
+
+# ---------------------------------------------------------------------------
+# Variant pools
+# ---------------------------------------------------------------------------
+
+_TILE_MAKERS = {
+    'rock':   make_rock,
+    'grass':  make_grass_tuft,
+    'column': make_column,
+    'stand':  lambda theme, rng: make_chainmail_stand(rng),
+}
+
+# Per-kind salt so a rock and a tuft on the same cell don't always pick
+# the same variant index.
+_KIND_SALT = {'rock': 0x9E37, 'grass': 0x85EB, 'column': 0xC2B2, 'stand': 0x27D4}
+
+
+def tile_variant_index(kind, col, row, count):
+    """Deterministically map a tile coordinate to a variant index in [0, count).
+
+    *col* / *row* may be ints or equal-length uint64 arrays (vectorised).
+    """
+    h = (col * 73856093) ^ (row * 19349663) ^ (_KIND_SALT.get(kind, 0) * 83492791)
+    h = (h ^ (h >> 13)) * 0x5BD1E995 & 0xFFFFFFFF
+    return (h ^ (h >> 15)) % count
+
+
+def build_tile_variants(theme, kind, count):
+    """Generate *count* variants of one tile kind, each from its own fixed seed.
+
+    Every variant draws from a private ``random.Random``, so building on
+    the preload thread leaves the game's ``random`` stream alone.
+    """
+    maker = _TILE_MAKERS[kind]
+    return [maker(theme, rng=random.Random(f"{theme}:{kind}:{i}")) for i in range(count)]
+
+
+class VariantPool:
+    """K pre-generated surfaces per tile type for one theme.
+
+    Variants are built lazily the first time a kind is requested, each from
+    its own fixed seed, so a given (theme, kind, index) always looks the
+    same and map generation costs O(K) surfaces instead of O(tiles).
+    Tiles share the returned surfaces - treat them as read-only.
+    """
+
+    def __init__(self, theme, count=None):
+        self.theme = theme
+        self.count = max(1, count or TILE_VARIANTS)
+        self._variants = {}
+
+    def variants(self, kind):
+        if kind not in self._variants:
+            self._variants[kind] = load_asset('tiles', build_tile_variants,
+                                              self.theme, kind, self.count, static=True)
+        return self._variants[kind]
+
+    def get(self, kind, col, row):
+        """Return the variant for the tile at grid position (col, row)."""
+        surfs = self.variants(kind)
+        return surfs[tile_variant_index(kind, col, row, len(surfs))]
+
+    def pick(self, kind, cols, rows):
+        """Vectorised get(): variants for arrays of grid positions."""
+        surfs = self.variants(kind)
+        idx = tile_variant_index(kind, np.asarray(cols, dtype=np.uint64),
+                                 np.asarray(rows, dtype=np.uint64), len(surfs))
+        return [surfs[i] for i in idx.tolist()]
+
+
+_pools = {}
+
+
+def variant_pool(theme, count=None):
+    """Return the shared VariantPool for *theme* (reused across levels)."""
+    key = (theme, count or TILE_VARIANTS)
+    if key not in _pools:
+        _pools[key] = VariantPool(theme, key[1])
+    return _pools[key]
@@ -2,6 +2,7 @@ import pygame
 import math
 from data import *
 from weapon_sprites import make_weapon_sprite
+from assets import load_asset
 
 
 class Weapon(pygame.sprite.Sprite):
@@ -9,13 +10,18 @@ class Weapon(pygame.sprite.Sprite):
 
     Sword: wide arc hitbox in front of the player (good for crowd control).
     Spear: narrow line hitbox extending further out (good for reach).
+
+    ``rect`` is the broadphase; ``hit_mask`` (same size, see hitmask.py)
+    is the exact hit shape: the swing's half-ellipse fan plus the blade
+    for the sword, the spear's own pixels for the spear.
     """
 
     def __init__(self, player, groups):
         super().__init__(groups)
         self.weapon_type = player.weapon
         direction = player.status.split('_')[0]
-        self.image = make_weapon_sprite(self.weapon_type, direction)
+        self.image = load_asset('weapons', make_weapon_sprite,
+                                self.weapon_type, direction, static=True)
 
         if self.weapon_type == 'sword':
             # Sword: wide arc — bigger hitbox, positioned close
@@ -23,6 +29,7 @@ class Weapon(pygame.sprite.Sprite):
         else:
             # Spear: narrow thrust — thin and long hitbox, positioned further out
             self._place_line(player, direction)
+        self.hit_mask = _hit_mask(self.weapon_type, direction, self.image, self.rect.size)
 
     def _place_arc(self, player, direction):
         """Position sword with a wide arc hitbox in front of the player."""
@@ -56,3 +63,37 @@ class Weapon(pygame.sprite.Sprite):
         else:  # right
             self.rect = self.image.get_rect(
                 midleft=player.rect.midright + pygame.math.Vector2(0, 12))
+
+
+# ======================================================================
+# Hit shapes  (one mask per weapon type and direction)
+# ======================================================================
+_HIT_MASKS = {}
+
+# Bounding box of the swing's ellipse, as a function of the hit rect size;
+# the fan is the half of it that lies inside the rect (player side = centre)
+_ARC_ELLIPSE = {
+    'up':    lambda w, h: (0, 0, w, 2 * h),
+    'down':  lambda w, h: (0, -h, w, 2 * h),
+    'left':  lambda w, h: (0, 0, 2 * w, h),
+    'right': lambda w, h: (-w, 0, 2 * w, h),
+}
+
+
+def _hit_mask(weapon_type, direction, image, size):
+    """Mask of the area a swing hits, *size* = the weapon rect's size."""
+    key = (weapon_type, direction)
+    mask = _HIT_MASKS.get(key)
+    if mask is None:
+        w, h = size
+        if weapon_type == 'sword':
+            shape = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.ellipse(shape, (255, 255, 255), _ARC_ELLIPSE[direction](w, h))
+            mask = pygame.mask.from_surface(shape)
+        else:
+            mask = pygame.mask.Mask(size)
+        # The blade itself, centred in the (possibly inflated) rect
+        offset = ((w - image.get_width()) // 2, (h - image.get_height()) // 2)
+        mask.draw(pygame.mask.from_surface(image), offset)
+        _HIT_MASKS[key] = mask
+    return mask
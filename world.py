@@ -0,0 +1,333 @@
+"""Chunked level worlds for DemoBlade.
+
+A World covers the whole map, sized from the compiled level layers, and
+splits it into square chunks of CHUNK_TILES tiles.  Each chunk owns its
+slice of the floor texture, its static tile sprites and their collision
+hitboxes.  Every frame World.update() receives the camera rectangle:
+
+  - chunks within CHUNK_LOAD_MARGIN chunks of the screen are loaded
+    (Tile sprites and their collision created), anything further out is
+    unloaded; floor textures (the bulk of the memory) are only kept for
+    the inner ring that can scroll into view next frame,
+  - entities (enemies, spawners) standing in a chunk more than
+    CHUNK_LOAD_MARGIN - 1 chunks off-screen are suspended: they leave the
+    visible group, so they are neither updated nor drawn, but stay in
+    their gameplay groups so kill objectives and spawner limits still
+    count them.  The extra loaded ring keeps the collision layer present
+    around every active entity.  Active entities are further banded by
+    the AILodScheduler (ai_lod.py) in ``World.ai_lod``.
+
+Blocking tiles that fill their whole cell (boundary and bushes) are
+compiled per chunk into maximal rectangles when the World is built
+(greedy meshing): a chunk's wall run becomes a few Collider sprites
+instead of one obstacle per tile, so every collision scan, the
+resident records and the swept queries test far fewer rects.  Objects
+with inset hitboxes (columns) keep their own.
+
+Floor textures are written to the surface pack as soon as they are
+built (see chunk_floor()), so neither the asset registry nor the surface
+cache keeps the pixels of chunks that have scrolled away: memory
+therefore depends on the screen size, not on the map size.  The light
+per-chunk records (tile specs, obstacle rects) stay resident so
+World.slide() works anywhere on the map, as does ``World.solid``, a
+tile-resolution boolean grid of blocked cells for vectorised queries,
+``World.flow``, the pursuit flow field built on it, and
+``World.clearance``, its distance-to-obstacle field used to place
+pickups, spawned enemies and the exit portal, and ``World.sight``, the
+line-of-sight queries enemies notice the player through.
+"""
+
+import zlib
+
+import numpy as np
+import pygame
+
+from data import TILESIZE, CHUNK_TILES, CHUNK_LOAD_MARGIN, WIDTH, HEIGHT
+from tile import Tile, Collider
+from tile_graphics import make_floor_surface
+from assets import load_asset
+from ai_lod import AILodScheduler
+from events import EventBus
+from flowfield import FlowField
+from clearance import ClearanceField
+from sight import LineOfSight
+from sweep import swept_bounds, slide
+
+# World size assumed by entities created without a World (tools, tests)
+DEFAULT_WORLD_SIZE = (20 * TILESIZE, 20 * TILESIZE)
+
+
+def world_bounds(world, margin, bottom_inset=0):
+    """Playable rect inset by *margin* (and *bottom_inset* at the bottom)."""
+    width, height = world.size if world is not None else DEFAULT_WORLD_SIZE
+    return pygame.Rect(margin, margin, width - 2 * margin,
+                       height - 2 * margin - bottom_inset)
+
+
+def merge_cells(mask):
+    """Cover the True cells of a 2D bool array with maximal rectangles.
+
+    Greedy meshing: scanning row by row, each uncovered cell starts a
+    rectangle that grows right as far as the row allows, then down while
+    every cell below that span is still uncovered.  Returns a list of
+    (row, col, rows, cols).
+    """
+    todo = np.array(mask, dtype=bool)
+    rows, cols = todo.shape
+    rects = []
+    for r, c in zip(*np.nonzero(todo)):
+        if not todo[r, c]:
+            continue
+        w = 1
+        while c + w < cols and todo[r, c + w]:
+            w += 1
+        h = 1
+        while r + h < rows and todo[r + h, c:c + w].all():
+            h += 1
+        todo[r:r + h, c:c + w] = False
+        rects.append((int(r), int(c), h, w))
+    return rects
+
+
+def chunk_floor(theme, key, size):
+    """Floor texture for one chunk; seeded per chunk so it is stable.
+
+    keep=False: only the chunk holds it, and the cache persists it at once.
+    """
+    seed = zlib.crc32(f"{theme}:{key[0]}:{key[1]}".encode())
+    return load_asset('floor', make_floor_surface, theme, size[0], size[1],
+                      seed=seed, keep=False)
+
+
+class Chunk:
+    """Static content of one CHUNK_TILES x CHUNK_TILES square of the map."""
+
+    __slots__ = ('key', 'rect', 'tiles', 'colliders', 'obstacle_rects', 'sprites', 'floor')
+
+    def __init__(self, key, rect):
+        self.key = key
+        self.rect = rect
+        self.tiles = []            # tile specs whose anchor lies in this chunk
+        self.colliders = []        # merged rects of the chunk's full-cell blocking tiles
+        self.obstacle_rects = []   # every blocking hitbox, merged (always resident)
+        self.sprites = []          # Tile sprites while loaded
+        self.floor = None          # floor surface while in the on-screen ring
+
+
+class World:
+    """Chunk manager for one level (see module docstring)."""
+
+    def __init__(self, assets, tile_specs, visible_sprites, obstacle_sprites,
+                 entity_groups=(), chunk_tiles=CHUNK_TILES, load_margin=CHUNK_LOAD_MARGIN,
+                 events=None):
+        rows, cols = assets.compiled.shape
+        self.theme = assets.theme
+        self.size = (cols * TILESIZE, rows * TILESIZE)
+        self.rect = pygame.Rect((0, 0), self.size)
+        self.chunk_px = chunk_tiles * TILESIZE
+        self.chunks_x = -(-cols // chunk_tiles)
+        self.chunks_y = -(-rows // chunk_tiles)
+        self.load_margin = load_margin
+
+        self.visible_sprites = visible_sprites
+        self.obstacle_sprites = obstacle_sprites
+        self.entity_groups = list(entity_groups)
+        self._floor_image = assets.floor            # authored floor image, if any
+        self._prefetched = dict(assets.floor_chunks)
+
+        self.chunks = {}
+        for cy in range(self.chunks_y):
+            for cx in range(self.chunks_x):
+                rect = pygame.Rect(cx * self.chunk_px, cy * self.chunk_px,
+                                   self.chunk_px, self.chunk_px).clip(self.rect)
+                self.chunks[(cx, cy)] = Chunk((cx, cy), rect)
+        self.solid = np.zeros((rows, cols), dtype=bool)
+        full_cells = np.zeros((rows, cols), dtype=bool)
+        for pos, sprite_type, image, visible, obstacle in tile_specs:
+            chunk = self.chunks[self.chunk_key(pos)]
+            if obstacle:
+                size = image.get_size() if image is not None else (TILESIZE, TILESIZE)
+                hitbox = Tile.geometry(pos, sprite_type, size)[1]
+                self.solid[max(0, hitbox.top // TILESIZE):(hitbox.bottom - 1) // TILESIZE + 1,
+                           max(0, hitbox.left // TILESIZE):(hitbox.right - 1) // TILESIZE + 1] = True
+                if hitbox.size == (TILESIZE, TILESIZE) and not (pos[0] % TILESIZE or pos[1] % TILESIZE):
+                    # Collision comes from the chunk's merged colliders
+                    full_cells[pos[1] // TILESIZE, pos[0] // TILESIZE] = True
+                    obstacle = False
+                else:
+                    chunk.obstacle_rects.append(hitbox)
+            chunk.tiles.append((pos, sprite_type, image, visible, obstacle))
+        self._merge_colliders(full_cells, chunk_tiles)
+
+        self.flow = FlowField(self.solid)
+        self.clearance = ClearanceField(self.solid)
+        self.sight = LineOfSight(self.solid)
+
+        self.loaded = set()
+        self.active = set()
+        self.floored = set()
+        self._suspended = set()
+        self.ai_lod = AILodScheduler()
+        self.events = events if events is not None else EventBus()
+
+    def _merge_colliders(self, full_cells, chunk_tiles):
+        """Greedy-merge each chunk's full-cell obstacles into Collider rects."""
+        for (cx, cy), chunk in self.chunks.items():
+            r0, c0 = cy * chunk_tiles, cx * chunk_tiles
+            window = full_cells[r0:r0 + chunk_tiles, c0:c0 + chunk_tiles]
+            for r, c, h, w in merge_cells(window):
+                rect = pygame.Rect((c0 + c) * TILESIZE, (r0 + r) * TILESIZE,
+                                   w * TILESIZE, h * TILESIZE)
+                chunk.colliders.append(rect)
+                chunk.obstacle_rects.append(rect)
+
+    # ------------------------------------------------------------------
+    # Geometry
+    # ------------------------------------------------------------------
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+    def chunk_key(self, pos):
+        cx = min(self.chunks_x - 1, max(0, int(pos[0]) // self.chunk_px))
+        cy = min(self.chunks_y - 1, max(0, int(pos[1]) // self.chunk_px))
+        return (cx, cy)
+
+    def chunks_in(self, rect):
+        """Keys of every chunk overlapping *rect* (clipped to the map)."""
+        area = rect.clip(self.rect)
+        if area.width <= 0 or area.height <= 0:
+            return set()
+        x0, y0 = self.chunk_key(area.topleft)
+        x1, y1 = self.chunk_key((area.right - 1, area.bottom - 1))
+        return {(cx, cy) for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)}
+
+    def _obstacles_along(self, rect, delta):
+        """Obstacle hitboxes near the area *rect* sweeps while moving by *delta*."""
+        area = swept_bounds(rect, delta)
+        rects = []
+        for key in self.chunks_in(area.inflate(2 * TILESIZE, 2 * TILESIZE)):
+            rects += self.chunks[key].obstacle_rects
+        return rects
+
+    def slide(self, rect, delta):
+        """*rect* moved by *delta*, stopped by obstacles and sliding along them."""
+        return slide(rect, delta, self._obstacles_along(rect, delta))
+
+    @staticmethod
+    def view_rect_at(center, size=(WIDTH, HEIGHT)):
+        """Screen rect the camera shows when centred on *center*."""
+        rect = pygame.Rect((0, 0), size)
+        rect.center = center
+        rect.topleft = (max(0, rect.left), max(0, rect.top))
+        return rect
+
+    # ------------------------------------------------------------------
+    # Streaming
+    # ------------------------------------------------------------------
+
+    def update(self, view_rect):
+        """Stream chunks and suspend / resume entities around *view_rect*."""
+        px = self.chunk_px
+        wanted = self.chunks_in(view_rect.inflate(2 * self.load_margin * px,
+                                                  2 * self.load_margin * px))
+        active_margin = max(0, self.load_margin - 1)
+        self.active = self.chunks_in(view_rect.inflate(2 * active_margin * px,
+                                                       2 * active_margin * px))
+
+        for key in self.loaded - wanted:
+            self._unload(self.chunks[key])
+        for key in wanted - self.loaded:
+            self._load(self.chunks[key])
+        self.loaded = wanted
+
+        if self._floor_image is None:
+            for key in self.floored - self.active:
+                self.chunks[key].floor = None
+            for key in self.active - self.floored:
+                chunk = self.chunks[key]
+                chunk.floor = self._prefetched.pop(key, None)
+                if chunk.floor is None:
+                    chunk.floor = chunk_floor(self.theme, key, chunk.rect.size)
+            self.floored = set(self.active)
+
+        self._update_entities()
+        self.ai_lod.begin_frame(view_rect)
+        self.sight.begin_frame()
+
+    def _load(self, chunk):
+        for rect in chunk.colliders:
+            chunk.sprites.append(Collider(rect, [self.obstacle_sprites]))
+        for pos, sprite_type, image, visible, obstacle in chunk.tiles:
+            groups = []
+            if visible:
+                groups.append(self.visible_sprites)
+            if obstacle:
+                groups.append(self.obstacle_sprites)
+            if not groups:
+                continue
+            if image is None:
+                chunk.sprites.append(Tile(pos, groups, sprite_type))
+            else:
+                chunk.sprites.append(Tile(pos, groups, sprite_type, image))
+
+    def _unload(self, chunk):
+        for sprite in chunk.sprites:
+            sprite.kill()
+        chunk.sprites = []
+
+    def _update_entities(self):
+        self._suspended = {s for s in self._suspended if s.alive()}
+        for group in self.entity_groups:
+            for sprite in group.sprites():
+                active = self.chunk_key(sprite.rect.center) in self.active
+                if sprite in self._suspended:
+                    if active:
+                        self._suspended.discard(sprite)
+                        sprite.add(self.visible_sprites)
+                elif not active:
+                    self._suspended.add(sprite)
+                    sprite.remove(self.visible_sprites)
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+
+    def draw_floor(self, surface, offset):
+        """Blit the floor of every loaded chunk that is on screen."""
+        if self._floor_image is not None:
+            surface.blit(self._floor_image, -offset)
+            return
+        screen = pygame.Rect((int(offset.x), int(offset.y)), surface.get_size())
+        for key in self.chunks_in(screen):
+            chunk = self.chunks[key]
+            if chunk.floor is not None:
+                surface.blit(chunk.floor, (chunk.rect.x - offset.x, chunk.rect.y - offset.y))
+
+
+def prefetch_floor_chunks(compiled, theme, center, chunk_tiles=CHUNK_TILES,
+                          load_margin=CHUNK_LOAD_MARGIN):
+    """Build the floor chunks a World will show first around *center*.
+
+    Used by LevelAssets so the initial floor is ready before the level is
+    assembled (and can be built on the preload thread).
+    """
+    rows, cols = compiled.shape
+    world_rect = pygame.Rect(0, 0, cols * TILESIZE, rows * TILESIZE)
+    px = chunk_tiles * TILESIZE
+    margin = max(0, load_margin - 1) * px
+    view = World.view_rect_at(center).inflate(2 * margin, 2 * margin)
+    area = view.clip(world_rect)
+    chunks = {}
+    if area.width <= 0 or area.height <= 0:
+        return chunks
+    for cy in range(area.top // px, (area.bottom - 1) // px + 1):
+        for cx in range(area.left // px, (area.right - 1) // px + 1):
+            rect = pygame.Rect(cx * px, cy * px, px, px).clip(world_rect)
+            chunks[(cx, cy)] = chunk_floor(theme, (cx, cy), rect.size)
+    return chunks